@@ -7,6 +7,7 @@ AI用例生成模块 - 支持DeepSeek和OpenAI
 import os
 from typing import List, Dict
 import json
+from case_templates import CASE_TEMPLATES, render_cases
 
 class AIGenerator:
     """AI用例生成器"""
@@ -80,7 +81,7 @@ class AIGenerator:
             content: 需求文档内容
             
         Returns:
-            分析结果字典
+            分析结果字典；AI不可用或调用失败时返回基础分析结果，并带有 fallback=True
         """
         # 如果没有客户端，使用基础分析
         if not self.client:
@@ -489,8 +490,10 @@ class AIGenerator:
                     })
         
         return {
-            'modules': modules[:10],  # 最多10个
-            'total_modules': len(modules)
+            'modules': modules,
+            'total_modules': len(modules),
+            # 标记为降级结果，调用方据此区分AI识别结果（如不写入识别缓存）
+            'fallback': True
         }
     
     def _template_cases(self, module_name: str, categories: List[str] = None) -> List[Dict]:
@@ -518,161 +521,12 @@ class AIGenerator:
         return base_cases
     
     def _get_standard_template_cases(self, module_name: str) -> List[Dict]:
-        """标准UI走查模板用例"""
-        return [
-            # 高优先级用例（40-50%）- 核心功能和交互
-            {
-                '页面/模块': module_name,
-                '检查点': '按钮状态',
-                '设计原则': '组件状态完整性原则',
-                '检查项': f'检查{module_name}中主要按钮的各种状态',
-                '优先级': '高',
-                '预期结果/设计标准': '按钮有默认、悬停、点击、禁用状态，核心按钮可正常点击'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '输入框状态',
-                '设计原则': '组件状态完整性原则',
-                '检查项': f'检查{module_name}中输入框的各种状态',
-                '优先级': '高',
-                '预期结果/设计标准': '输入框有占位符、聚焦、已输入、错误、禁用状态，必填项可正常输入'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '错误提示',
-                '设计原则': '异常与负向流程验证原则',
-                '检查项': f'检查{module_name}中输入验证的错误提示',
-                '优先级': '高',
-                '预期结果/设计标准': '输入错误时显示清晰的错误提示信息，用户能理解如何修正'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '操作反馈',
-                '设计原则': '交互与反馈原则',
-                '检查项': f'检查{module_name}中关键操作是否有反馈',
-                '优先级': '高',
-                '预期结果/设计标准': '提交、保存、删除等关键操作有成功/失败提示'
-            },
-            # 中优先级用例（40-50%）- 体验优化
-            {
-                '页面/模块': module_name,
-                '检查点': '加载状态',
-                '设计原则': '交互与反馈原则',
-                '检查项': f'检查{module_name}中数据加载时的状态',
-                '优先级': '中',
-                '预期结果/设计标准': '数据加载时显示Loading提示或骨架屏'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '页面布局',
-                '设计原则': '组织有序原则',
-                '检查项': f'检查{module_name}的页面布局和对齐',
-                '优先级': '中',
-                '预期结果/设计标准': '元素按网格系统对齐，布局清晰合理'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '文案准确性',
-                '设计原则': '内容与文案准确性原则',
-                '检查项': f'检查{module_name}中所有文案是否准确无误',
-                '优先级': '中',
-                '预期结果/设计标准': '无错别字，专业术语准确，语句通顺'
-            },
-            # 低优先级用例（10-20%）- 视觉细节
-            {
-                '页面/模块': module_name,
-                '检查点': '页面标题样式',
-                '设计原则': '视觉一致性原则',
-                '检查项': f'检查{module_name}页面标题的字体、字号、颜色',
-                '优先级': '低',
-                '预期结果/设计标准': '标题字号、字重、颜色符合设计规范'
-            }
-        ]
+        """标准UI走查模板用例（模板内容见 case_templates.json）"""
+        return render_cases(CASE_TEMPLATES.standard, module_name)
     
     def _get_competitive_template_cases(self, module_name: str) -> List[Dict]:
-        """竞品对标走查模板用例"""
-        return [
-            {
-                '页面/模块': module_name,
-                '检查点': '异常处理',
-                '设计原则': '异常处理完备性',
-                '检查项': f'检查{module_name}中所有异常情况是否有友好提示',
-                '优先级': '高',
-                '预期结果/设计标准': '显示明确的失败原因和解决方案，避免技术性错误代码'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '费用信息',
-                '设计原则': '信息提示完整性',
-                '检查项': f'检查{module_name}中费用、价格信息是否明确说明',
-                '优先级': '高',
-                '预期结果/设计标准': '明确显示费用金额、计费周期、到期时间'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '功能可用性',
-                '设计原则': '功能可用性保障',
-                '检查项': f'检查{module_name}中所有功能是否稳定可用',
-                '优先级': '高',
-                '预期结果/设计标准': '核心功能稳定可用，不可用功能置灰并说明原因'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '帮助文档',
-                '设计原则': '文档同步一致性',
-                '检查项': f'检查{module_name}的帮助文档是否与实际功能一致',
-                '优先级': '中',
-                '预期结果/设计标准': '文档与产品同步更新，截图为最新版本，链接有效'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '页面加载速度',
-                '设计原则': '响应速度优化',
-                '检查项': f'检查{module_name}的页面加载和响应速度',
-                '优先级': '高',
-                '预期结果/设计标准': '页面首次加载<3秒，操作响应及时'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '跳转准确性',
-                '设计原则': '跳转准确性',
-                '检查项': f'检查{module_name}中所有跳转是否准确到达目标页面',
-                '优先级': '高',
-                '预期结果/设计标准': '跳转目标准确，无需二次操作，链接有效'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '信息一致性',
-                '设计原则': '信息一致性',
-                '检查项': f'检查{module_name}中同类信息的展示方式是否一致',
-                '优先级': '中',
-                '预期结果/设计标准': '费用显示格式统一，单位显示规则统一'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '输入校验',
-                '设计原则': '输入校验完整性',
-                '检查项': f'检查{module_name}中所有用户输入是否进行完整校验',
-                '优先级': '高',
-                '预期结果/设计标准': '特殊字符过滤，输入长度限制，校验失败友好提示'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '语言统一性',
-                '设计原则': '语言统一性',
-                '检查项': f'检查{module_name}中界面文案是否使用统一语言',
-                '优先级': '中',
-                '预期结果/设计标准': '所有界面文案使用中文，避免中英文混合'
-            },
-            {
-                '页面/模块': module_name,
-                '检查点': '批量操作',
-                '设计原则': '操作高效性',
-                '检查项': f'检查{module_name}是否支持批量操作',
-                '优先级': '中',
-                '预期结果/设计标准': '支持批量上传、删除、修改，减少重复操作'
-            }
-        ]
+        """竞品对标走查模板用例（模板内容见 case_templates.json）"""
+        return render_cases(CASE_TEMPLATES.competitive, module_name)
     
     def _get_category_template_cases(self, module_name: str, categories: List[str]) -> List[Dict]:
         """
@@ -683,134 +537,12 @@ class AIGenerator:
             categories: 建议选项列表
             
         Returns:
-            额外的用例列表
+            额外的用例列表（按模板文件中建议选项的顺序排列）
         """
         additional_cases = []
-        
-        # 全局页面用例
-        if '全局页面' in categories:
-            additional_cases.extend([
-                {
-                    '页面/模块': module_name,
-                    '检查点': '页面头部',
-                    '设计原则': '视觉一致性原则',
-                    '检查项': f'检查{module_name}的页面头部Logo、导航菜单、用户信息等全局元素',
-                    '优先级': '高',
-                    '预期结果/设计标准': '头部高度64px，Logo尺寸120x32px，导航菜单字号14px'
-                },
-                {
-                    '页面/模块': module_name,
-                    '检查点': '页面底部',
-                    '设计原则': '视觉一致性原则',
-                    '检查项': f'检查{module_name}的页面底部版权信息、链接等全局元素',
-                    '优先级': '中',
-                    '预期结果/设计标准': '底部高度48px，文字颜色#999999，字号12px'
-                },
-                {
-                    '页面/模块': module_name,
-                    '检查点': '全局提示组件',
-                    '设计原则': '交互与反馈原则',
-                    '检查项': f'检查{module_name}中Toast、Message等全局提示组件的样式和行为',
-                    '优先级': '高',
-                    '预期结果/设计标准': 'Toast自动消失时间3秒，位置居中顶部，有淡入淡出动画'
-                }
-            ])
-        
-        # 场景流程用例
-        if '场景流程' in categories:
-            additional_cases.extend([
-                {
-                    '页面/模块': module_name,
-                    '检查点': '完整操作流程',
-                    '设计原则': '简化交互原则',
-                    '检查项': f'检查{module_name}的完整用户操作路径，从进入到完成目标',
-                    '优先级': '高',
-                    '预期结果/设计标准': '流程步骤清晰，每步有明确的操作指引和反馈'
-                },
-                {
-                    '页面/模块': module_name,
-                    '检查点': '多步骤表单',
-                    '设计原则': '简化交互原则',
-                    '检查项': f'检查{module_name}中多步骤表单的步骤指示器、上一步/下一步按钮',
-                    '优先级': '高',
-                    '预期结果/设计标准': '步骤指示器显示当前步骤，已完成步骤可点击返回，数据自动保存'
-                },
-                {
-                    '页面/模块': module_name,
-                    '检查点': '状态流转',
-                    '设计原则': '简化交互原则',
-                    '检查项': f'检查{module_name}中数据状态的流转过程（如草稿→待审核→已发布）',
-                    '优先级': '中',
-                    '预期结果/设计标准': '状态变化有明确的视觉标识，状态流转符合业务逻辑'
-                }
-            ])
-        
-        # 异常场景用例
-        if '异常场景' in categories:
-            additional_cases.extend([
-                {
-                    '页面/模块': module_name,
-                    '检查点': '输入验证',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': f'检查{module_name}中表单的输入验证（必填项、格式、长度、特殊字符）',
-                    '优先级': '高',
-                    '预期结果/设计标准': '必填项未填提示"该字段不能为空"，格式错误提示具体要求'
-                },
-                {
-                    '页面/模块': module_name,
-                    '检查点': '网络异常处理',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': f'检查{module_name}在网络异常时的处理（超时、断网、服务器错误）',
-                    '优先级': '高',
-                    '预期结果/设计标准': '网络异常时显示友好的错误提示，提供重试按钮'
-                },
-                {
-                    '页面/模块': module_name,
-                    '检查点': '权限异常处理',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': f'检查{module_name}在无权限或登录过期时的处理',
-                    '优先级': '高',
-                    '预期结果/设计标准': '无权限时跳转到403页面，登录过期时跳转到登录页'
-                },
-                {
-                    '页面/模块': module_name,
-                    '检查点': '边界条件',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': f'检查{module_name}在极限数据量、空数据等边界条件下的表现',
-                    '优先级': '中',
-                    '预期结果/设计标准': '空数据时显示空状态提示，大数据量时有分页或虚拟滚动'
-                }
-            ])
-        
-        # 上下游验证用例
-        if '上下游验证' in categories:
-            additional_cases.extend([
-                {
-                    '页面/模块': module_name,
-                    '检查点': '数据传递',
-                    '设计原则': '简化交互原则',
-                    '检查项': f'检查{module_name}与其他页面之间的数据传递和回显',
-                    '优先级': '高',
-                    '预期结果/设计标准': '页面间参数正确传递，数据准确回显，无数据丢失'
-                },
-                {
-                    '页面/模块': module_name,
-                    '检查点': '状态同步',
-                    '设计原则': '数据与文案一致性原则',
-                    '检查项': f'检查{module_name}操作后相关页面/组件的状态更新',
-                    '优先级': '高',
-                    '预期结果/设计标准': '操作后相关数据实时更新，列表页和详情页数据一致'
-                },
-                {
-                    '页面/模块': module_name,
-                    '检查点': '接口调用',
-                    '设计原则': '异常与负向流程验证原则',
-                    '检查项': f'检查{module_name}的接口调用参数和响应数据处理',
-                    '优先级': '中',
-                    '预期结果/设计标准': '请求参数正确，响应数据正确解析，接口错误有友好提示'
-                }
-            ])
-        
+        for category, templates in CASE_TEMPLATES.category_cases.items():
+            if category in categories:
+                additional_cases.extend(render_cases(templates, module_name))
         return additional_cases
 
 
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel导出性能对比
+对比原有的逐单元格设置样式的导出方式与 ExcelExporter（write_only + 命名样式 + 条件格式）
+
+用法:
+    python benchmark_excel_export.py                 # 默认 10000 和 100000 个用例
+    python benchmark_excel_export.py 10000 --modules 50
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+import openpyxl
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.worksheet.datavalidation import DataValidation
+
+from excel_exporter import ExcelExporter, clean_sheet_name
+
+
+def make_cases(count: int, module_count: int) -> List[Dict]:
+    """
+    构造测试用例数据
+
+    Args:
+        count: 用例数量
+        module_count: 模块数量
+
+    Returns:
+        用例列表
+    """
+    priorities = ['高', '中', '低']
+    return [
+        {
+            '用例编号': f'UI-TC{i + 1:03d}',
+            '页面/模块': f'模块{i % module_count + 1}',
+            '检查点': '布局结构',
+            '设计原则': '一致性',
+            '检查项': f'检查第{i + 1}项：页面元素对齐、间距与设计稿一致',
+            '优先级': priorities[i % 3],
+            '预期结果/设计标准': '元素间距符合8px栅格，字体字号与设计规范一致，无错位或重叠',
+            '是否通过': '待测试',
+            '截图/备注': ''
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_export(cases: List[Dict], path: str) -> int:
+    """原有的导出实现（普通工作簿，逐单元格设置样式，每行一个数据验证）"""
+    cases_by_module = {}
+    for case in cases:
+        cases_by_module.setdefault(case.get('页面/模块', '未分类'), []).append(case)
+
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+
+    header_font = Font(name='微软雅黑', size=11, bold=True, color='FFFFFF')
+    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+    header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    data_font = Font(name='微软雅黑', size=10)
+    data_alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
+    center_alignment = Alignment(horizontal='center', vertical='center')
+    side = Side(style='thin', color='D0D0D0')
+    border = Border(left=side, right=side, top=side, bottom=side)
+    priority_styles = {
+        '高': (PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid'), Font(name='微软雅黑', size=10, color='9C0006')),
+        '中': (PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid'), Font(name='微软雅黑', size=10, color='9C6500')),
+        '低': (PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid'), Font(name='微软雅黑', size=10, color='006100'))
+    }
+
+    summary_ws = wb.create_sheet('用例汇总', 0)
+    summary_ws.append(['序号', '模块名称', '用例数量', '高优先级', '中优先级', '低优先级', '完成数量', '完成率', '备注'])
+    for row_num, (module_name, module_cases) in enumerate(cases_by_module.items(), 2):
+        sheet_name = clean_sheet_name(module_name)
+        summary_ws.append([
+            row_num - 1, module_name, len(module_cases),
+            sum(1 for c in module_cases if c.get('优先级') == '高'),
+            sum(1 for c in module_cases if c.get('优先级') == '中'),
+            sum(1 for c in module_cases if c.get('优先级') == '低'),
+            f"=COUNTIF('{sheet_name}'!H:H,\"是\")+COUNTIF('{sheet_name}'!H:H,\"否\")",
+            f"=IF(C{row_num}=0,\"0%\",TEXT(G{row_num}/C{row_num},\"0%\"))",
+            ''
+        ])
+
+    headers = ['用例编号', '页面/模块', '检查点', '设计原则', '检查项', '优先级', '预期结果/设计标准', '是否通过', '截图/备注']
+    for module_name, module_cases in cases_by_module.items():
+        ws = wb.create_sheet(clean_sheet_name(module_name))
+        ws.append(headers)
+        for col_num in range(1, 10):
+            cell = ws.cell(1, col_num)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+            cell.border = border
+
+        for row_num, case in enumerate(module_cases, 2):
+            ws.append([
+                case.get('用例编号', ''), case.get('页面/模块', ''), case.get('检查点', ''),
+                case.get('设计原则', ''), case.get('检查项', ''), case.get('优先级', ''),
+                case.get('预期结果/设计标准', ''), '待测试', case.get('截图/备注', '')
+            ])
+            for col_num in range(1, 10):
+                cell = ws.cell(row_num, col_num)
+                cell.font = data_font
+                cell.alignment = center_alignment if col_num in [6, 8] else data_alignment
+                cell.border = border
+                if row_num % 2 == 0:
+                    cell.fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
+                if col_num == 6 and case.get('优先级', '') in priority_styles:
+                    cell.fill, cell.font = priority_styles[case['优先级']]
+
+            dv = DataValidation(type="list", formula1='"待测试,是,否"', allow_blank=False)
+            dv.add(f'H{row_num}')
+            ws.add_data_validation(dv)
+
+        ws.freeze_panes = 'B2'
+
+    wb.save(path)
+    return len(cases_by_module)
+
+
+def measure(label: str, func, cases: List[Dict], path: str):
+    """运行一次导出并打印耗时、峰值内存和文件大小"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(cases, path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = os.path.getsize(path)
+    print(f"  {label:<14} 耗时 {elapsed:7.2f} 秒  峰值内存 {peak / 1024 / 1024:8.1f} MB  文件 {size / 1024 / 1024:6.2f} MB")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Excel导出性能对比')
+    parser.add_argument('counts', nargs='*', type=int, default=[10000, 100000], help='用例数量')
+    parser.add_argument('--modules', type=int, default=20, help='模块数量')
+    args = parser.parse_args()
+
+    exporter = ExcelExporter()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for count in args.counts:
+            cases = make_cases(count, args.modules)
+            print(f"📊 {count} 个用例，{args.modules} 个模块")
+            legacy = measure('原有实现', legacy_export, cases, os.path.join(tmp_dir, f'legacy-{count}.xlsx'))
+            current = measure('ExcelExporter', exporter.export, cases, os.path.join(tmp_dir, f'exporter-{count}.xlsx'))
+            print(f"  加速 {legacy / current:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+用例历史归档
+把生成记录写入按月份和用例类型分区的Parquet文件（默认 output/archive），
+用于分析长期的优先级分布、设计原则使用情况、模块用例数和通过率；
+列式存储下统计只读取需要的列，分区过滤只读取相关月份的文件
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from case_store import CaseStore, CASE_COLUMNS, get_case_store
+
+
+# 归档的用例列（分区列 month、case_type 由目录名表示）
+ARCHIVE_SCHEMA = pa.schema([
+    ('run_id', pa.string()),
+    ('document_name', pa.string()),
+    ('created_at', pa.timestamp('s')),
+    ('module_name', pa.string()),
+    ('case_no', pa.string()),
+    ('checkpoint', pa.string()),
+    ('principle', pa.string()),
+    ('check_item', pa.string()),
+    ('priority', pa.string()),
+    ('expected', pa.string()),
+    ('verification_status', pa.string()),
+])
+
+
+class CaseArchive:
+    """用例历史归档 - 分区Parquet"""
+
+    def __init__(self, root_dir: Optional[str] = None):
+        """
+        初始化归档
+
+        Args:
+            root_dir: 归档目录，默认使用环境变量 CASE_ARCHIVE_DIR 或 output/archive
+        """
+        self.root_dir = Path(root_dir or os.getenv('CASE_ARCHIVE_DIR') or os.path.join('output', 'archive'))
+
+    def archive_run(self, run_id: str, store: Optional[CaseStore] = None) -> Optional[Path]:
+        """
+        归档一次生成记录（包含当前检验状态），重复归档时覆盖
+
+        Args:
+            run_id: 生成记录ID
+            store: 用例存储，默认使用进程级共享存储
+
+        Returns:
+            写入的Parquet文件路径，生成记录不存在时返回None
+        """
+        store = store or get_case_store()
+        run = store.get_run(run_id)
+        if not run:
+            return None
+
+        created_at = datetime.fromtimestamp(run['created_at'])
+        status = store.get_verification_status(run_id)
+        columns = {field.name: [] for field in ARCHIVE_SCHEMA}
+
+        for case in store.iter_cases(run_id):
+            for field, column in CASE_COLUMNS:
+                if column in columns:
+                    columns[column].append(case[field])
+            columns['verification_status'].append(status.get(case['用例编号'], '待检验'))
+
+        row_count = len(columns['case_no'])
+        columns['run_id'] = [run_id] * row_count
+        columns['document_name'] = [run['document_name']] * row_count
+        columns['created_at'] = [created_at.replace(microsecond=0)] * row_count
+
+        partition_dir = self.root_dir / f"month={created_at:%Y-%m}" / f"case_type={run['case_type']}"
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        path = partition_dir / f"{run_id}.parquet"
+
+        # 先写临时文件再替换，查询时不会读到写了一半的文件
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        pq.write_table(pa.table(columns, schema=ARCHIVE_SCHEMA), tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+        return path
+
+    def query(self, columns: Optional[List[str]] = None, filters: Optional[List] = None) -> pd.DataFrame:
+        """
+        查询归档数据
+
+        Args:
+            columns: 需要读取的列（可包含分区列 month、case_type），为None时读取全部列
+            filters: pyarrow过滤条件，如 [('month', '>=', '2025-01'), ('priority', '==', '高')]，
+                     分区列上的条件会跳过不相关的目录
+
+        Returns:
+            DataFrame，没有归档数据时返回空DataFrame
+        """
+        if not self.root_dir.exists() or not any(self.root_dir.rglob('*.parquet')):
+            return pd.DataFrame(columns=columns or [field.name for field in ARCHIVE_SCHEMA] + ['month', 'case_type'])
+
+        # 分区值按字符串读取（如月份 2025-01）
+        partitioning = ds.partitioning(
+            pa.schema([('month', pa.string()), ('case_type', pa.string())]), flavor='hive'
+        )
+        return pd.read_parquet(self.root_dir, engine='pyarrow', columns=columns, filters=filters,
+                               partitioning=partitioning)
+
+    def priority_distribution(self, filters: Optional[List] = None) -> pd.DataFrame:
+        """
+        按月统计各优先级的用例数
+
+        Returns:
+            行为月份、列为优先级的用例数表
+        """
+        df = self.query(columns=['month', 'priority'], filters=filters)
+        return pd.crosstab(df['month'], df['priority']) if not df.empty else df
+
+    def principle_usage(self, filters: Optional[List] = None) -> pd.Series:
+        """
+        统计各设计原则的使用次数
+
+        Returns:
+            设计原则 -> 用例数（从多到少）
+        """
+        return self.query(columns=['principle'], filters=filters)['principle'].value_counts()
+
+    def pass_rates(self, by: str = 'module_name', filters: Optional[List] = None) -> pd.DataFrame:
+        """
+        按指定列统计检验通过率
+
+        Args:
+            by: 分组列，如 module_name、document_name、month
+            filters: pyarrow过滤条件
+
+        Returns:
+            每组的用例数、通过数、不通过数和通过率（已检验用例中通过的比例）
+        """
+        df = self.query(columns=[by, 'verification_status'], filters=filters)
+        if df.empty:
+            return pd.DataFrame(columns=['用例数', '通过', '不通过', '通过率'])
+
+        counts = pd.crosstab(df[by], df['verification_status'])
+        result = pd.DataFrame({
+            '用例数': counts.sum(axis=1),
+            '通过': counts['通过'] if '通过' in counts else 0,
+            '不通过': counts['不通过'] if '不通过' in counts else 0,
+        })
+        verified = result['通过'] + result['不通过']
+        result['通过率'] = (result['通过'] / verified.where(verified > 0)).fillna(0.0)
+        return result
+
+
+# 进程级共享归档
+_case_archive = None
+
+
+def get_case_archive() -> CaseArchive:
+    """获取进程级共享的用例归档"""
+    global _case_archive
+    if _case_archive is None:
+        _case_archive = CaseArchive()
+    return _case_archive
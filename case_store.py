@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+用例存储
+生成记录、模块、用例和检验状态保存在SQLite数据库中（默认 output/cases.db），
+按生成记录、模块、优先级和检验状态建立索引，历史查询和恢复都是索引查找；
+CSV/Excel文件作为从数据库导出的结果
+"""
+
+import csv
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from io import StringIO
+from typing import Dict, Iterator, List, Optional, Set
+
+
+# 用例字段 -> 数据库列
+CASE_COLUMNS = [
+    ('用例编号', 'case_no'),
+    ('页面/模块', 'module_name'),
+    ('检查点', 'checkpoint'),
+    ('设计原则', 'principle'),
+    ('检查项', 'check_item'),
+    ('优先级', 'priority'),
+    ('预期结果/设计标准', 'expected'),
+    ('是否通过', 'passed'),
+    ('截图/备注', 'remark'),
+]
+CASE_HEADERS = [field for field, _ in CASE_COLUMNS]
+
+RUN_RUNNING = 'running'
+RUN_COMPLETED = 'completed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    document_name TEXT NOT NULL,
+    case_type TEXT NOT NULL,
+    fingerprint TEXT NOT NULL DEFAULT '',
+    csv_path TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    case_count INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS modules (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    module_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    case_count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, module_key)
+);
+CREATE TABLE IF NOT EXISTS cases (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    case_no TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    module_key TEXT NOT NULL,
+    module_name TEXT NOT NULL,
+    checkpoint TEXT,
+    principle TEXT,
+    check_item TEXT,
+    priority TEXT,
+    expected TEXT,
+    passed TEXT,
+    remark TEXT,
+    PRIMARY KEY (run_id, case_no)
+);
+CREATE TABLE IF NOT EXISTS verification (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    case_no TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, case_no)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_document ON runs(document_name, created_at);
+CREATE INDEX IF NOT EXISTS idx_cases_position ON cases(run_id, position);
+CREATE INDEX IF NOT EXISTS idx_cases_module ON cases(run_id, module_name, position);
+CREATE INDEX IF NOT EXISTS idx_cases_priority ON cases(run_id, priority);
+CREATE INDEX IF NOT EXISTS idx_verification_status ON verification(run_id, status);
+"""
+
+
+class CaseStore:
+    """用例存储 - SQLite"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        初始化存储，数据库不存在时自动创建
+
+        Args:
+            db_path: 数据库文件路径，默认使用环境变量 CASE_STORE_DB 或 output/cases.db
+        """
+        self.db_path = db_path or os.getenv('CASE_STORE_DB') or os.path.join('output', 'cases.db')
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        with self._connect() as conn:
+            # WAL模式下读写互不阻塞，多个会话可以同时读取
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        打开一个连接并在一个事务中执行
+
+        Streamlit的多个会话运行在不同线程中，每次操作使用独立的连接
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA foreign_keys=ON')
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def start_run(self, run_id: str, document_name: str, case_type: str,
+                  fingerprint: str = '', csv_path: str = ''):
+        """
+        创建生成记录（续写同一记录时保留已有数据）
+
+        Args:
+            run_id: 生成记录ID
+            document_name: 文档名称
+            case_type: 用例类型
+            fingerprint: 生成指纹
+            csv_path: 对应的CSV文件路径
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT INTO runs (run_id, document_name, case_type, fingerprint, csv_path, status, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(run_id) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at""",
+                (run_id, document_name, case_type, fingerprint, csv_path, RUN_RUNNING, now, now)
+            )
+
+    def add_module_cases(self, run_id: str, module_key: str, cases: List[Dict]):
+        """
+        写入一个模块的用例（同一模块重复写入时覆盖）
+
+        Args:
+            run_id: 生成记录ID
+            module_key: 模块标识（建议选项用例使用 CATEGORIES_KEY）
+            cases: 已编号的用例列表
+        """
+        with self._connect() as conn:
+            self._insert_module(conn, run_id, module_key, cases)
+
+    def replace_cases(self, run_id: str, cases_by_module: Dict[str, List[Dict]]):
+        """
+        替换生成记录的全部用例
+
+        Args:
+            run_id: 生成记录ID
+            cases_by_module: 模块标识 -> 用例列表（按生成顺序）
+        """
+        with self._connect() as conn:
+            conn.execute('DELETE FROM cases WHERE run_id = ?', (run_id,))
+            conn.execute('DELETE FROM modules WHERE run_id = ?', (run_id,))
+            for module_key, cases in cases_by_module.items():
+                self._insert_module(conn, run_id, module_key, cases)
+
+    def _insert_module(self, conn: sqlite3.Connection, run_id: str, module_key: str, cases: List[Dict]):
+        """在当前事务中写入一个模块的用例"""
+        conn.execute('DELETE FROM cases WHERE run_id = ? AND module_key = ?', (run_id, module_key))
+        position = conn.execute(
+            'SELECT COALESCE(MAX(position), -1) + 1 FROM cases WHERE run_id = ?', (run_id,)
+        ).fetchone()[0]
+        module_position = conn.execute(
+            'SELECT COUNT(*) FROM modules WHERE run_id = ? AND module_key != ?', (run_id, module_key)
+        ).fetchone()[0]
+
+        conn.execute(
+            'INSERT OR REPLACE INTO modules (run_id, module_key, position, case_count) VALUES (?, ?, ?, ?)',
+            (run_id, module_key, module_position, len(cases))
+        )
+        conn.executemany(
+            """INSERT OR REPLACE INTO cases (run_id, case_no, position, module_key, module_name, checkpoint, principle,
+                                             check_item, priority, expected, passed, remark)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (run_id, case.get('用例编号', ''), position + offset, module_key,
+                 *(case.get(field, '') or '' for field, _ in CASE_COLUMNS[1:]))
+                for offset, case in enumerate(cases)
+            ]
+        )
+
+    def finish_run(self, run_id: str):
+        """
+        标记生成记录完成并更新用例数
+
+        Args:
+            run_id: 生成记录ID
+        """
+        with self._connect() as conn:
+            conn.execute(
+                """UPDATE runs SET status = ?, updated_at = ?,
+                          case_count = (SELECT COUNT(*) FROM cases WHERE cases.run_id = runs.run_id)
+                   WHERE run_id = ?""",
+                (RUN_COMPLETED, time.time(), run_id)
+            )
+
+    def delete_run(self, run_id: str):
+        """删除生成记录及其用例和检验状态"""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM runs WHERE run_id = ?', (run_id,))
+
+    def get_run(self, run_id: str) -> Optional[Dict]:
+        """
+        获取生成记录
+
+        Args:
+            run_id: 生成记录ID
+
+        Returns:
+            生成记录字典，不存在时返回None
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM runs WHERE run_id = ?', (run_id,)).fetchone()
+        return dict(row) if row else None
+
+    def latest_run(self, max_age_seconds: Optional[float] = None,
+                   document_name: Optional[str] = None) -> Optional[Dict]:
+        """
+        获取最近完成的生成记录
+
+        Args:
+            max_age_seconds: 只返回这段时间内完成的记录，为None时不限制
+            document_name: 只返回指定文档的记录
+
+        Returns:
+            生成记录字典，没有时返回None
+        """
+        runs = self.list_runs(limit=1, document_name=document_name,
+                              since=time.time() - max_age_seconds if max_age_seconds else None)
+        return runs[0] if runs else None
+
+    def list_runs(self, limit: int = 20, document_name: Optional[str] = None,
+                  since: Optional[float] = None) -> List[Dict]:
+        """
+        按时间倒序列出已完成的生成记录
+
+        Args:
+            limit: 最多返回的记录数
+            document_name: 只返回指定文档的记录
+            since: 只返回该时间戳之后完成的记录
+
+        Returns:
+            生成记录列表
+        """
+        sql = 'SELECT * FROM runs WHERE status = ?'
+        params = [RUN_COMPLETED]
+        if document_name is not None:
+            sql += ' AND document_name = ?'
+            params.append(document_name)
+        if since is not None:
+            sql += ' AND updated_at >= ?'
+            params.append(since)
+        sql += ' ORDER BY created_at DESC LIMIT ?'
+        params.append(limit)
+
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def iter_cases(self, run_id: str, module_name: Optional[str] = None,
+                   priority: Optional[str] = None) -> Iterator[Dict]:
+        """
+        按生成顺序逐条读取用例
+
+        Args:
+            run_id: 生成记录ID
+            module_name: 只读取指定 页面/模块 的用例
+            priority: 只读取指定优先级的用例
+
+        Yields:
+            用例字典
+        """
+        sql = f"SELECT {', '.join(column for _, column in CASE_COLUMNS)} FROM cases WHERE run_id = ?"
+        params = [run_id]
+        if module_name is not None:
+            sql += ' AND module_name = ?'
+            params.append(module_name)
+        if priority is not None:
+            sql += ' AND priority = ?'
+            params.append(priority)
+        sql += ' ORDER BY position'
+
+        with self._connect() as conn:
+            for row in conn.execute(sql, params):
+                yield dict(zip(CASE_HEADERS, row))
+
+    def load_cases(self, run_id: str, module_name: Optional[str] = None,
+                   priority: Optional[str] = None) -> List[Dict]:
+        """
+        读取用例列表
+
+        Args:
+            run_id: 生成记录ID
+            module_name: 只读取指定 页面/模块 的用例
+            priority: 只读取指定优先级的用例
+
+        Returns:
+            用例列表
+        """
+        return list(self.iter_cases(run_id, module_name=module_name, priority=priority))
+
+    def case_numbers(self, run_id: str) -> Set[str]:
+        """
+        获取生成记录的全部用例编号
+
+        Args:
+            run_id: 生成记录ID
+
+        Returns:
+            用例编号集合
+        """
+        with self._connect() as conn:
+            return {row[0] for row in conn.execute('SELECT case_no FROM cases WHERE run_id = ?', (run_id,))}
+
+    def module_counts(self, run_id: str) -> Dict[str, int]:
+        """
+        统计每个 页面/模块 的用例数（按首次出现的顺序）
+
+        Args:
+            run_id: 生成记录ID
+
+        Returns:
+            页面/模块 -> 用例数
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                """SELECT module_name, COUNT(*) FROM cases WHERE run_id = ?
+                   GROUP BY module_name ORDER BY MIN(position)""",
+                (run_id,)
+            ).fetchall()
+        return {name: count for name, count in rows}
+
+    def get_verification_status(self, run_id: str) -> Dict[str, str]:
+        """
+        读取检验状态
+
+        Args:
+            run_id: 生成记录ID
+
+        Returns:
+            用例编号 -> 检验状态（只包含已记录的用例）
+        """
+        with self._connect() as conn:
+            rows = conn.execute('SELECT case_no, status FROM verification WHERE run_id = ?', (run_id,)).fetchall()
+        return {case_no: status for case_no, status in rows}
+
+    def set_verification_status(self, run_id: str, updates: Dict[str, str]):
+        """
+        批量写入检验状态
+
+        Args:
+            run_id: 生成记录ID
+            updates: 用例编号 -> 检验状态
+        """
+        if not updates:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                """INSERT INTO verification (run_id, case_no, status, updated_at) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(run_id, case_no) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at""",
+                [(run_id, case_no, status, now) for case_no, status in updates.items()]
+            )
+
+    def status_counts(self, run_id: str) -> Dict[str, int]:
+        """
+        统计各检验状态的用例数
+
+        Args:
+            run_id: 生成记录ID
+
+        Returns:
+            检验状态 -> 用例数（只统计已记录的用例）
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT status, COUNT(*) FROM verification WHERE run_id = ? GROUP BY status', (run_id,)
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def export_csv(self, run_id: str) -> str:
+        """
+        导出生成记录的用例为CSV文本
+
+        Args:
+            run_id: 生成记录ID
+
+        Returns:
+            CSV文本
+        """
+        output = StringIO()
+        writer = csv.DictWriter(output, fieldnames=CASE_HEADERS)
+        writer.writeheader()
+        writer.writerows(self.iter_cases(run_id))
+        return output.getvalue()
+
+
+# 进程级共享存储
+_case_store = None
+
+
+def get_case_store() -> CaseStore:
+    """获取进程级共享的用例存储"""
+    global _case_store
+    if _case_store is None:
+        _case_store = CaseStore()
+    return _case_store
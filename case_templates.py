@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+用例模板库
+模板内容保存在 case_templates.json 中，导入时编译为不可变的模板记录：
+每个字段预先按模块名占位符切分，实例化时只需一次 str.join，无需格式化解析
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+# 模板文件，可通过环境变量 CASE_TEMPLATES_FILE 指定其他文件
+DEFAULT_TEMPLATES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'case_templates.json')
+
+# 模板中的模块名占位符（模板文件可通过 slot 字段修改）
+DEFAULT_SLOT = '{module}'
+
+
+@dataclass(frozen=True)
+class CaseTemplate:
+    """用例模板 - 字段值按占位符预先切分"""
+    fields: Tuple[Tuple[str, Tuple[str, ...]], ...]   # ((字段名, 切分后的片段), ...)
+
+    def render(self, module_name: str) -> Dict:
+        """
+        用模块名实例化用例
+
+        Args:
+            module_name: 模块名称
+
+        Returns:
+            用例字典（每次返回新字典，调用方可以修改）
+        """
+        return {name: module_name.join(parts) for name, parts in self.fields}
+
+
+@dataclass(frozen=True)
+class TemplateLibrary:
+    """模板库 - 编译后的全部模板"""
+    version: int
+    standard: Tuple[CaseTemplate, ...]                        # 标准UI走查基础用例
+    competitive: Tuple[CaseTemplate, ...]                     # 竞品对标走查基础用例
+    category_cases: Mapping[str, Tuple[CaseTemplate, ...]]    # 建议选项追加到每个模块的用例
+    category_modules: Mapping[str, Tuple[CaseTemplate, ...]]  # 建议选项作为独立模块时的用例
+
+
+def render_cases(templates: Tuple[CaseTemplate, ...], module_name: str) -> List[Dict]:
+    """
+    批量实例化模板
+
+    Args:
+        templates: 模板序列
+        module_name: 模块名称
+
+    Returns:
+        用例列表
+    """
+    return [template.render(module_name) for template in templates]
+
+
+def _compile_group(items: List[Dict], slot: str) -> Tuple[CaseTemplate, ...]:
+    """把一组模板字典编译为模板记录"""
+    return tuple(
+        CaseTemplate(fields=tuple((name, tuple(str(value).split(slot))) for name, value in item.items()))
+        for item in items
+    )
+
+
+def _compile_mapping(groups: Dict[str, List[Dict]], slot: str) -> Mapping[str, Tuple[CaseTemplate, ...]]:
+    """编译按建议选项分组的模板"""
+    return MappingProxyType({name: _compile_group(items, slot) for name, items in groups.items()})
+
+
+def compile_templates(data: Dict) -> TemplateLibrary:
+    """
+    编译模板数据
+
+    Args:
+        data: 模板文件内容
+
+    Returns:
+        TemplateLibrary
+    """
+    slot = data.get('slot', DEFAULT_SLOT)
+    return TemplateLibrary(
+        version=data.get('version', 0),
+        standard=_compile_group(data.get('standard', []), slot),
+        competitive=_compile_group(data.get('competitive', []), slot),
+        category_cases=_compile_mapping(data.get('category_cases', {}), slot),
+        category_modules=_compile_mapping(data.get('category_modules', {}), slot)
+    )
+
+
+def load_templates(path: Optional[str] = None) -> TemplateLibrary:
+    """
+    读取并编译模板文件
+
+    Args:
+        path: 模板文件路径，默认使用环境变量 CASE_TEMPLATES_FILE 或内置文件
+
+    Returns:
+        TemplateLibrary，读取失败时返回空模板库
+    """
+    path = path or os.getenv('CASE_TEMPLATES_FILE') or DEFAULT_TEMPLATES_FILE
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return compile_templates(json.load(f))
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ 错误: 无法加载用例模板 {path}: {e}")
+        return compile_templates({})
+
+
+# 启动时编译一次，所有生成器共享
+CASE_TEMPLATES = load_templates()
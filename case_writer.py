@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+用例CSV流式写入
+每个模块生成完成后立即追加到 .partial 文件，并在日志文件中记录已完成的模块；
+全部完成后原子重命名为最终文件。中途崩溃或断开连接时，下次生成可从 .partial 文件继续
+"""
+
+import csv
+import glob
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+
+PARTIAL_SUFFIX = '.partial'
+JOURNAL_SUFFIX = '.journal'
+
+# 建议选项用例在日志中的模块标识
+CATEGORIES_KEY = '__categories__'
+
+
+class StreamingCaseWriter:
+    """用例CSV流式写入器"""
+
+    def __init__(self, final_path: str, headers: List[str], number_prefix: str,
+                 fingerprint: str = '', fsync_every: int = 5):
+        """
+        初始化写入器
+
+        Args:
+            final_path: 最终CSV文件路径
+            headers: CSV列名
+            number_prefix: 用例编号前缀（如 UI-TC），编号按写入顺序连续分配
+            fingerprint: 本次生成的指纹（文档、模块选择、建议选项等），只有指纹相同时才续写
+            fsync_every: 每写入多少个模块执行一次fsync
+        """
+        self.final_path = Path(final_path)
+        self.partial_path = Path(str(final_path) + PARTIAL_SUFFIX)
+        self.journal_path = Path(str(final_path) + JOURNAL_SUFFIX)
+        self.headers = headers
+        self.number_prefix = number_prefix
+        self.fingerprint = fingerprint
+        self.fsync_every = max(1, fsync_every)
+
+        self.completed_ids: Set[str] = set()   # 已写入的模块标识
+        self.module_rows: List[Tuple[str, int]] = []  # 按写入顺序的 (模块标识, 写入后的累计用例数)
+        self.row_count = 0                     # 已写入的用例数
+        self.resumed = False                   # 是否从已有的 .partial 文件续写
+
+        self._csv_file = None
+        self._journal_file = None
+        self._writer = None
+        self._pending_sync = 0
+
+    @staticmethod
+    def find_resumable(output_dir: str, name_prefix: str, fingerprint: str) -> Optional[str]:
+        """
+        查找可以续写的未完成文件
+
+        Args:
+            output_dir: 输出目录
+            name_prefix: 文件名前缀（文档名和用例类型）
+            fingerprint: 本次生成的指纹
+
+        Returns:
+            最近一次未完成生成的最终文件路径，没有时返回None
+        """
+        candidates = sorted(
+            Path(output_dir).glob(f"{glob.escape(name_prefix)}*.csv{PARTIAL_SUFFIX}"),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True
+        )
+
+        for partial_path in candidates:
+            final_path = str(partial_path)[:-len(PARTIAL_SUFFIX)]
+            header = StreamingCaseWriter._read_journal_header(Path(final_path + JOURNAL_SUFFIX))
+            if header and header.get('fingerprint') == fingerprint:
+                return final_path
+
+        return None
+
+    def open(self, resume: bool = True):
+        """
+        打开写入器
+
+        续写时把 .partial 文件截断到最后一个已记录的模块，丢弃写了一半的模块
+
+        Args:
+            resume: 是否尝试从已有的 .partial 文件续写
+        """
+        self.final_path.parent.mkdir(parents=True, exist_ok=True)
+
+        entries = self._read_journal() if resume and self.partial_path.exists() else None
+        if entries:
+            last = entries[-1]
+            with open(self.partial_path, 'r+b') as f:
+                f.truncate(last['offset'])
+            self.completed_ids = {entry['module_id'] for entry in entries}
+            self.module_rows = [(entry['module_id'], entry['rows']) for entry in entries if entry['module_id']]
+            self.row_count = last['rows']
+            self.resumed = True
+
+            self._csv_file = open(self.partial_path, 'a', encoding='utf-8', newline='')
+            self._writer = csv.DictWriter(self._csv_file, fieldnames=self.headers, extrasaction='ignore')
+            self._journal_file = open(self.journal_path, 'a', encoding='utf-8')
+            print(f"续写未完成的用例文件: 已有 {len(self.completed_ids)} 个模块，{self.row_count} 个用例")
+            return
+
+        self._csv_file = open(self.partial_path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._csv_file, fieldnames=self.headers, extrasaction='ignore')
+        self._writer.writeheader()
+        self._csv_file.flush()
+
+        self._journal_file = open(self.journal_path, 'w', encoding='utf-8')
+        self._journal_file.write(json.dumps({'fingerprint': self.fingerprint}, ensure_ascii=False) + '\n')
+        # 表头写入后记录一个起点，之后的模块都从这里开始
+        self._write_journal_entry('', os.fstat(self._csv_file.fileno()).st_size)
+        self._sync()
+
+    def is_completed(self, module_id: str) -> bool:
+        """检查模块是否已写入（续写时跳过）"""
+        return module_id in self.completed_ids
+
+    def write_module(self, module_id: str, cases: List[Dict]):
+        """
+        追加一个模块的用例，并分配用例编号
+
+        Args:
+            module_id: 模块标识（建议选项用例使用 CATEGORIES_KEY）
+            cases: 用例列表（原地写入 用例编号）
+        """
+        for case in cases:
+            self.row_count += 1
+            case['用例编号'] = f'{self.number_prefix}{self.row_count:03d}'
+
+        self._writer.writerows(cases)
+        self._csv_file.flush()
+        self.completed_ids.add(module_id)
+        self.module_rows.append((module_id, self.row_count))
+        self._write_journal_entry(module_id, os.fstat(self._csv_file.fileno()).st_size)
+
+        self._pending_sync += 1
+        if self._pending_sync >= self.fsync_every:
+            self._sync()
+
+    def group_cases(self, cases: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        按模块标识划分文件中的用例（续写时包含之前已写入的模块）
+
+        Args:
+            cases: 从文件中按顺序读取的全部用例
+
+        Returns:
+            模块标识 -> 用例列表（按写入顺序）
+        """
+        groups = {}
+        start = 0
+        for module_id, end in self.module_rows:
+            groups[module_id] = cases[start:end]
+            start = end
+        return groups
+
+    def finalize(self) -> Path:
+        """
+        完成写入：同步到磁盘并原子重命名为最终文件
+
+        Returns:
+            最终文件路径
+        """
+        self._sync()
+        self._close()
+        os.replace(self.partial_path, self.final_path)
+        try:
+            os.remove(self.journal_path)
+        except OSError:
+            pass
+        return self.final_path
+
+    def discard(self):
+        """放弃本次写入，删除 .partial 文件和日志"""
+        self._close()
+        for path in (self.partial_path, self.journal_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def close(self):
+        """关闭文件但保留 .partial 文件和日志，以便下次续写"""
+        if self._csv_file:
+            self._sync()
+        self._close()
+
+    def _write_journal_entry(self, module_id: str, offset: int):
+        """记录一个模块写入完成后的文件长度和用例数"""
+        entry = {'module_id': module_id, 'offset': offset, 'rows': self.row_count}
+        self._journal_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._journal_file.flush()
+
+    def _sync(self):
+        """先同步CSV再同步日志，保证日志记录的偏移量对应的数据已经落盘"""
+        os.fsync(self._csv_file.fileno())
+        os.fsync(self._journal_file.fileno())
+        self._pending_sync = 0
+
+    def _close(self):
+        """关闭文件句柄"""
+        for f in (self._csv_file, self._journal_file):
+            if f and not f.closed:
+                f.close()
+        self._csv_file = None
+        self._journal_file = None
+
+    def _read_journal(self) -> List[Dict]:
+        """
+        读取日志中的模块记录
+
+        Returns:
+            模块记录列表；指纹不匹配、日志缺失或损坏时返回空列表
+        """
+        header = self._read_journal_header(self.journal_path)
+        if not header or header.get('fingerprint') != self.fingerprint:
+            return []
+
+        entries = []
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            next(f)
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 最后一行可能只写了一半
+                    break
+
+        partial_size = self.partial_path.stat().st_size
+        return [entry for entry in entries if entry['offset'] <= partial_size]
+
+    @staticmethod
+    def _read_journal_header(journal_path: Path) -> Optional[Dict]:
+        """读取日志第一行（生成指纹）"""
+        try:
+            with open(journal_path, 'r', encoding='utf-8') as f:
+                return json.loads(f.readline())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+
+def read_cases(csv_path: str) -> List[Dict]:
+    """
+    读取CSV中的全部用例
+
+    Args:
+        csv_path: CSV文件路径
+
+    Returns:
+        用例列表
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析结果缓存
+按文件内容的SHA-256缓存解析后的文本，避免重复解析同一个文件
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+
+class ParsedDocumentCache:
+    """解析结果缓存 - 进程内LRU + 可选的磁盘缓存"""
+
+    def __init__(self, max_entries: int = 32, cache_dir: Optional[str] = None):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 内存中最多保留的文档数
+            cache_dir: 磁盘缓存目录，为None时只使用内存缓存
+        """
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries = OrderedDict()
+        # Streamlit的多个会话运行在同一进程的不同线程中
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def compute_hash(data: bytes) -> str:
+        """
+        计算文件内容的哈希
+
+        Args:
+            data: 文件二进制内容
+
+        Returns:
+            SHA-256十六进制字符串
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def compute_file_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+        """
+        分块计算磁盘文件的哈希，不把整个文件读入内存
+
+        Args:
+            path: 文件路径
+            chunk_size: 每次读取的字节数
+
+        Returns:
+            SHA-256十六进制字符串
+        """
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            解析后的文本，未命中时返回None
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        content = self._read_from_disk(key)
+        if content is not None:
+            # 磁盘命中后提升到内存
+            self._put_in_memory(key, content)
+        return content
+
+    def put(self, key: str, content: str):
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            content: 解析后的文本
+        """
+        self._put_in_memory(key, content)
+        self._write_to_disk(key, content)
+
+    def clear(self):
+        """清空内存缓存（磁盘缓存保留）"""
+        with self._lock:
+            self._entries.clear()
+
+    def _put_in_memory(self, key: str, content: str):
+        """写入内存LRU，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        """获取缓存键对应的磁盘文件路径"""
+        if not self.cache_dir:
+            return None
+        return self.cache_dir / f"{key}.txt"
+
+    def _read_from_disk(self, key: str) -> Optional[str]:
+        """从磁盘缓存读取"""
+        path = self._disk_path(key)
+        if not path or not path.exists():
+            return None
+
+        try:
+            return path.read_text(encoding='utf-8')
+        except OSError as e:
+            print(f"警告：读取磁盘缓存失败 {path}: {e}")
+            return None
+
+    def _write_to_disk(self, key: str, content: str):
+        """写入磁盘缓存（先写临时文件再重命名，避免读到半个文件）"""
+        path = self._disk_path(key)
+        if not path:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(content, encoding='utf-8')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"警告：写入磁盘缓存失败 {path}: {e}")
+
+
+# 进程级共享缓存，磁盘缓存目录通过环境变量 DOCUMENT_CACHE_DIR 开启
+_document_cache = None
+
+
+def get_document_cache() -> ParsedDocumentCache:
+    """获取进程级共享的解析结果缓存"""
+    global _document_cache
+    if _document_cache is None:
+        _document_cache = ParsedDocumentCache(cache_dir=os.getenv('DOCUMENT_CACHE_DIR'))
+    return _document_cache
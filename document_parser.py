@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文档解析器
+在进程池中并行解析上传的需求文档（md、txt、docx、pdf）
+"""
+
+import mmap
+import multiprocessing
+import queue
+import time
+from typing import List, Optional, Tuple, Union
+from document_cache import ParsedDocumentCache
+from pdf_extractor import PDFExtractor
+from docx_extractor import DocxExtractor
+
+
+# 支持的文件格式
+SUPPORTED_EXTENSIONS = ['md', 'txt', 'docx', 'pdf']
+
+# 解析逻辑版本，解析输出格式变化时递增，使旧缓存失效
+PARSER_VERSION = 3
+
+# 工作进程使用spawn方式启动：Streamlit服务是多线程进程，fork会复制其他线程持有的锁而可能死锁，
+# 并且fork出的子进程映射了父进程的整个地址空间，设置RLIMIT_AS后容易误报内存不足
+_POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+
+def get_file_extension(filename: str) -> str:
+    """获取小写的文件扩展名"""
+    return filename.split('.')[-1].lower()
+
+
+def _read_text_file(source: Union[str, bytes]) -> str:
+    """
+    读取UTF-8文本文件，文件路径通过内存映射解码
+
+    Args:
+        source: 文件路径或二进制内容
+
+    Returns:
+        文本内容
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return source.decode('utf-8')
+
+    with open(source, 'rb') as f:
+        # 空文件无法建立内存映射
+        if f.seek(0, 2) == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return str(mm, 'utf-8')
+
+
+def parse_document(filename: str, data: Union[str, bytes]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    解析单个文档
+
+    该函数运行在工作进程中，因此只接收可序列化的参数
+
+    Args:
+        filename: 文件名（用于判断格式）
+        data: 文件路径（推荐，工作进程直接从磁盘读取）或文件的二进制内容
+
+    Returns:
+        (文档内容, 错误信息)，成功时错误信息为None
+    """
+    file_extension = get_file_extension(filename)
+
+    try:
+        if file_extension == 'docx':
+            # 读取Word文档（标题样式转换为Markdown标题，保留表格）
+            content = DocxExtractor().extract(data)
+        elif file_extension == 'pdf':
+            # 读取PDF文档（只提取文本，忽略图片）
+            # 工作进程不能再创建子进程，这里逐页顺序提取
+            content = PDFExtractor(in_process=True).extract(data).text
+
+            if not content.strip():
+                return None, "PDF文件中未找到可提取的文本内容"
+        elif file_extension in ['md', 'txt']:
+            # 读取文本文件
+            content = _read_text_file(data)
+        else:
+            return None, f"不支持的文件格式: {file_extension}"
+
+        return content, None
+    except MemoryError:
+        return None, "文件解析超出内存限制"
+    except Exception as e:
+        return None, f"文件读取失败: {str(e)}"
+
+
+def _limit_worker_memory(memory_limit_mb: int):
+    """
+    工作进程初始化：限制进程可用的内存上限
+
+    Args:
+        memory_limit_mb: 内存上限（MB），为0或None时不限制
+    """
+    if not memory_limit_mb:
+        return
+
+    try:
+        import resource
+    except ImportError:
+        # Windows没有resource模块，无法限制内存
+        return
+
+    limit = memory_limit_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as e:
+        print(f"警告：无法设置工作进程内存上限: {e}")
+
+
+# 工作进程中的任务开始通知队列，由进程池初始化时设置
+_started_queue = None
+
+
+def _init_worker(memory_limit_mb: int, started_queue):
+    """
+    工作进程初始化：限制内存上限，并保存任务开始通知队列
+
+    Args:
+        memory_limit_mb: 内存上限（MB）
+        started_queue: 任务开始执行时写入任务序号的队列
+    """
+    global _started_queue
+    _limit_worker_memory(memory_limit_mb)
+    _started_queue = started_queue
+
+
+def _run_task(task_index: int, func, args: tuple):
+    """在工作进程中执行任务，开始执行时通知主进程（超时从此刻开始计算）"""
+    _started_queue.put(task_index)
+    return func(*args)
+
+
+class WorkerPool:
+    """
+    单次调用专用的工作进程池
+
+    每次解析/提取使用自己的进程池，超时后结束进程池只影响本次调用的任务；
+    任务的超时从工作进程开始执行该任务时计算，排队等待的时间不计入
+    """
+
+    # 等待任务结果时检查开始通知的间隔（秒）
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, processes: int, memory_limit_mb: int):
+        """
+        创建进程池
+
+        Args:
+            processes: 工作进程数
+            memory_limit_mb: 单个工作进程的内存上限（MB）
+
+        Raises:
+            OSError: 无法创建进程（如受限环境）
+        """
+        self._started_queue = _POOL_CONTEXT.Queue()
+        self._pool = _POOL_CONTEXT.Pool(
+            processes=processes,
+            initializer=_init_worker,
+            initargs=(memory_limit_mb, self._started_queue)
+        )
+        self._async_results = []
+        self._submitted_at = []
+        self._started_at = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def submit(self, func, args: tuple) -> int:
+        """
+        提交任务
+
+        Args:
+            func: 模块级函数（工作进程按名称导入）
+            args: 参数（需可序列化）
+
+        Returns:
+            任务序号
+        """
+        task_index = len(self._async_results)
+        self._async_results.append(self._pool.apply_async(_run_task, (task_index, func, args)))
+        self._submitted_at.append(time.monotonic())
+        return task_index
+
+    def get(self, task_index: int, timeout: float, start_index: Optional[int] = None):
+        """
+        等待任务结果
+
+        Args:
+            task_index: 任务序号
+            timeout: 超时时间（秒），从任务开始执行时计算
+            start_index: 从另一个任务开始执行时计算超时（如整个文档共用一个超时），默认为任务本身
+
+        Returns:
+            任务返回值
+
+        Raises:
+            multiprocessing.TimeoutError: 任务超时；工作进程异常退出、任务一直没有开始时也会超时
+            Exception: 任务中抛出的异常
+        """
+        async_result = self._async_results[task_index]
+        start_index = task_index if start_index is None else start_index
+        # 工作进程异常退出时任务不会再开始，排在前面的任务都超时也应该已经开始
+        latest_start = self._submitted_at[start_index] + timeout * start_index
+
+        while not async_result.ready():
+            self._drain_started()
+            started_at = self._started_at.get(start_index)
+            deadline = started_at + timeout if started_at is not None else latest_start + timeout
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise multiprocessing.TimeoutError()
+            async_result.wait(min(remaining, self.POLL_INTERVAL))
+
+        return async_result.get()
+
+    def close(self):
+        """结束进程池（包括仍在运行的任务）"""
+        self._pool.terminate()
+        self._pool.join()
+        self._started_queue.close()
+
+    def _drain_started(self):
+        """读取任务开始通知，记录开始时间"""
+        while True:
+            try:
+                task_index = self._started_queue.get_nowait()
+            except queue.Empty:
+                return
+            self._started_at.setdefault(task_index, time.monotonic())
+
+
+class DocumentParser:
+    """文档解析器 - 并行解析多个上传文件"""
+
+    def __init__(
+        self,
+        max_workers: int = 3,
+        timeout: float = 60,
+        memory_limit_mb: int = 2048,
+        cache: Optional[ParsedDocumentCache] = None
+    ):
+        """
+        初始化解析器
+
+        Args:
+            max_workers: 最大工作进程数
+            timeout: 单个文件的解析超时时间（秒）
+            memory_limit_mb: 单个工作进程的内存上限（MB）
+            cache: 可选的解析结果缓存，命中的文件不再解析
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.cache = cache
+
+    def parse_files(self, files: List[Tuple[str, Union[str, bytes]]]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        并行解析多个文件
+
+        Args:
+            files: (文件名, 文件路径或二进制内容) 列表
+
+        Returns:
+            与输入顺序一致的 (文档内容, 错误信息) 列表
+        """
+        if not files:
+            return []
+
+        results = [None] * len(files)
+        cache_keys = [None] * len(files)
+        pending = []
+
+        # 先查缓存，只解析未命中的文件
+        for idx, (filename, data) in enumerate(files):
+            if self.cache:
+                cache_keys[idx] = self._cache_key(filename, data)
+                content = self.cache.get(cache_keys[idx])
+                if content is not None:
+                    results[idx] = (content, None)
+                    continue
+            pending.append(idx)
+
+        if pending:
+            parsed = self._parse_uncached([files[idx] for idx in pending])
+            for idx, (content, error) in zip(pending, parsed):
+                results[idx] = (content, error)
+                # 只缓存成功的结果，失败的文件下次重新解析
+                if self.cache and error is None:
+                    self.cache.put(cache_keys[idx], content)
+
+        return results
+
+    def _cache_key(self, filename: str, data: Union[str, bytes]) -> str:
+        """
+        生成缓存键：解析版本 + 格式 + 内容哈希
+
+        Args:
+            filename: 文件名
+            data: 文件路径或二进制内容
+
+        Returns:
+            缓存键
+        """
+        if isinstance(data, (bytes, bytearray)):
+            file_hash = ParsedDocumentCache.compute_hash(data)
+        else:
+            file_hash = ParsedDocumentCache.compute_file_hash(data)
+        return f"v{PARSER_VERSION}_{get_file_extension(filename)}_{file_hash}"
+
+    def _parse_uncached(self, files: List[Tuple[str, Union[str, bytes]]]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        解析未命中缓存的文件
+
+        Args:
+            files: (文件名, 文件路径或二进制内容) 列表
+
+        Returns:
+            与输入顺序一致的 (文档内容, 错误信息) 列表
+        """
+        # 只有一个PDF时，文件级并行没有意义，改为按页并行提取
+        if len(files) == 1 and get_file_extension(files[0][0]) == 'pdf':
+            return [self._parse_pdf_by_pages(files[0][1])]
+
+        try:
+            return self._parse_in_pool(files)
+        except OSError as e:
+            # 无法创建进程（如受限环境），降级为顺序解析
+            print(f"进程池不可用，降级到顺序解析: {e}")
+            return [parse_document(filename, data) for filename, data in files]
+
+    def _parse_pdf_by_pages(self, data: Union[str, bytes]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        在工作进程中提取单个PDF（页数多时按页并行）
+
+        Args:
+            data: PDF文件路径或二进制内容
+
+        Returns:
+            (文档内容, 错误信息)
+        """
+        extractor = PDFExtractor(
+            timeout=self.timeout,
+            memory_limit_mb=self.memory_limit_mb
+        )
+
+        try:
+            content = extractor.extract(data).text
+        except TimeoutError as e:
+            return None, str(e)
+        except OSError as e:
+            print(f"进程池不可用，降级到顺序解析: {e}")
+            return parse_document('document.pdf', data)
+        except Exception as e:
+            return None, f"文件读取失败: {str(e)}"
+
+        if not content.strip():
+            return None, "PDF文件中未找到可提取的文本内容"
+        return content, None
+
+    def _parse_in_pool(self, files: List[Tuple[str, Union[str, bytes]]]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        在进程池中解析文件，每个文件单独计算超时
+
+        Args:
+            files: (文件名, 文件路径或二进制内容) 列表
+
+        Returns:
+            与输入顺序一致的 (文档内容, 错误信息) 列表
+        """
+        results = []
+
+        with WorkerPool(min(self.max_workers, len(files)), self.memory_limit_mb) as pool:
+            # 所有文件同时提交，每个文件的超时从开始解析时计算
+            task_indexes = [pool.submit(parse_document, (filename, data)) for filename, data in files]
+
+            for task_index in task_indexes:
+                try:
+                    results.append(pool.get(task_index, self.timeout))
+                except multiprocessing.TimeoutError:
+                    results.append((None, f"文件解析超时（超过{self.timeout:g}秒）"))
+                except MemoryError:
+                    results.append((None, "文件解析超出内存限制"))
+                except Exception as e:
+                    # 工作进程异常退出等情况
+                    results.append((None, f"文件读取失败: {str(e)}"))
+
+        return results
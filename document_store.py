@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文档存储
+上传文件先落盘再解析，合并后的文档保存在磁盘上，
+Session State中只保存文档句柄，避免大文档占用会话内存
+"""
+
+import bisect
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+from outline_parser import parse_outline
+
+
+# 保存合并文档时每隔多少个字符记录一次 (字符偏移, 字节偏移) 检查点，
+# 按字符偏移读取片段时只需从最近的检查点开始解码
+CHECKPOINT_CHARS = 64 * 1024
+
+
+@dataclass
+class DocumentHandle:
+    """文档句柄 - 指向磁盘上合并后的文档"""
+    doc_id: str                # 文档唯一标识（合并内容的SHA-256前16位）
+    path: str                  # 合并文本的文件路径（UTF-8）
+    filenames: List[str] = field(default_factory=list)  # 原始文件名列表
+    byte_size: int = 0         # 合并文本的字节数
+    checkpoints: List[List[int]] = field(default_factory=list)  # [字符偏移, 字节偏移] 检查点，按偏移升序
+
+    def to_dict(self) -> Dict:
+        """
+        转换为字典
+
+        Returns:
+            包含所有字段的字典
+        """
+        return {
+            'doc_id': self.doc_id,
+            'path': self.path,
+            'filenames': list(self.filenames),
+            'byte_size': self.byte_size,
+            'checkpoints': [list(point) for point in self.checkpoints]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DocumentHandle':
+        """
+        从字典创建DocumentHandle实例
+
+        Args:
+            data: 包含句柄数据的字典
+
+        Returns:
+            DocumentHandle实例
+        """
+        return cls(
+            doc_id=data['doc_id'],
+            path=data['path'],
+            filenames=data.get('filenames', []),
+            byte_size=data.get('byte_size', 0),
+            checkpoints=data.get('checkpoints', [])
+        )
+
+
+class DocumentStore:
+    """文档存储 - 管理上传文件的临时落盘和合并文档的读取"""
+
+    def __init__(self, root_dir: Optional[str] = None, max_age_hours: float = 24):
+        """
+        初始化存储
+
+        Args:
+            root_dir: 存储目录，默认使用环境变量 DOCUMENT_STORE_DIR 或系统临时目录
+            max_age_hours: 合并文档的保留时间（小时），从最后一次读取算起，过期文件在保存新文档时清理
+        """
+        default_dir = os.getenv('DOCUMENT_STORE_DIR') or os.path.join(tempfile.gettempdir(), 'ui-test-gen-documents')
+        self.root_dir = Path(root_dir or default_dir)
+        self.max_age_hours = max_age_hours
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+
+    def spool_upload(self, file_obj: BinaryIO, filename: str, chunk_size: int = 1024 * 1024) -> str:
+        """
+        将上传文件分块写入临时文件
+
+        Args:
+            file_obj: 可读的二进制文件对象（如Streamlit的UploadedFile）
+            filename: 原始文件名（只用于保留扩展名，不参与路径拼接）
+            chunk_size: 每次复制的字节数
+
+        Returns:
+            临时文件路径
+        """
+        suffix = '.' + filename.split('.')[-1].lower() if '.' in filename else ''
+        fd, path = tempfile.mkstemp(prefix='upload_', suffix=suffix, dir=self.root_dir)
+
+        file_obj.seek(0)
+        with os.fdopen(fd, 'wb') as f:
+            shutil.copyfileobj(file_obj, f, chunk_size)
+        file_obj.seek(0)
+
+        return path
+
+    def remove_spooled(self, paths: List[str]):
+        """删除临时上传文件"""
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def save_merged(self, parts: List[str], filenames: List[str]) -> DocumentHandle:
+        """
+        逐段写入合并后的文档
+
+        Args:
+            parts: 按顺序排列的文本片段
+            filenames: 原始文件名列表
+
+        Returns:
+            文档句柄
+        """
+        self._cleanup_expired()
+
+        hasher = hashlib.sha256()
+        byte_size = 0
+        char_size = 0
+        checkpoints = []
+        fd, tmp_path = tempfile.mkstemp(prefix='merged_', suffix='.tmp', dir=self.root_dir)
+
+        with os.fdopen(fd, 'wb') as f:
+            for part in parts:
+                # 按检查点间隔分段编码，检查点总是落在字符边界上
+                for offset in range(0, len(part), CHECKPOINT_CHARS):
+                    chunk = part[offset:offset + CHECKPOINT_CHARS]
+                    if not checkpoints or char_size - checkpoints[-1][0] >= CHECKPOINT_CHARS:
+                        checkpoints.append([char_size, byte_size])
+                    data = chunk.encode('utf-8')
+                    hasher.update(data)
+                    char_size += len(chunk)
+                    byte_size += len(data)
+                    f.write(data)
+
+        doc_id = hasher.hexdigest()[:16]
+        path = self.root_dir / f"{doc_id}.txt"
+        os.replace(tmp_path, path)
+
+        return DocumentHandle(
+            doc_id=doc_id,
+            path=str(path),
+            filenames=list(filenames),
+            byte_size=byte_size,
+            checkpoints=checkpoints
+        )
+
+    def exists(self, handle: DocumentHandle) -> bool:
+        """检查文档文件是否仍然存在（可能已被过期清理），存在时刷新访问时间"""
+        return self._touch(handle)
+
+    def read_text(self, handle: DocumentHandle) -> str:
+        """
+        读取完整文档
+
+        Args:
+            handle: 文档句柄
+
+        Returns:
+            文档文本
+        """
+        self._touch(handle)
+        if handle.byte_size == 0:
+            return ''
+
+        with open(handle.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 直接从内存映射解码，不额外复制一份bytes
+            return str(mm, 'utf-8')
+
+    def read_preview(self, handle: DocumentHandle, max_chars: int = 1000) -> str:
+        """
+        读取文档开头部分，用于预览
+
+        Args:
+            handle: 文档句柄
+            max_chars: 最多返回的字符数
+
+        Returns:
+            文档开头的文本
+        """
+        self._touch(handle)
+        with open(handle.path, 'rb') as f:
+            # UTF-8每个字符最多4个字节
+            data = f.read(max_chars * 4)
+        return data.decode('utf-8', errors='ignore')[:max_chars]
+
+    def read_section(self, handle: DocumentHandle, start: int, end: int) -> str:
+        """
+        按字符偏移读取文档片段
+
+        偏移与Module.start/end、outline_parser对字符串解析的结果一致；
+        只解码片段前后最近两个检查点之间的内容，不需要加载整个文档
+
+        Args:
+            handle: 文档句柄
+            start: 起始字符偏移
+            end: 结束字符偏移（不含）
+
+        Returns:
+            片段文本
+        """
+        if end <= start:
+            return ''
+
+        self._touch(handle)
+        char_offsets = [point[0] for point in handle.checkpoints]
+        # 旧句柄没有检查点时从文档开头解码
+        index = bisect.bisect_right(char_offsets, start) - 1
+        char_from, byte_from = handle.checkpoints[index] if index >= 0 else (0, 0)
+        index = bisect.bisect_left(char_offsets, end)
+        byte_to = handle.checkpoints[index][1] if index < len(char_offsets) else handle.byte_size
+
+        with open(handle.path, 'rb') as f:
+            f.seek(byte_from)
+            text = f.read(byte_to - byte_from).decode('utf-8')
+        return text[start - char_from:end - char_from]
+
+    def count_sections(self, handle: DocumentHandle) -> int:
+        """
+        统计文档中的章节标题数
+
+        直接在内存映射上解析大纲，不需要把整个文档加载为字符串
+
+        Args:
+            handle: 文档句柄
+
+        Returns:
+            章节标题数
+        """
+        if handle.byte_size == 0:
+            return 0
+
+        with open(handle.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return len(parse_outline(mm).nodes)
+
+    def _touch(self, handle: DocumentHandle) -> bool:
+        """
+        刷新文档的修改时间，会话仍在使用的文档不会被过期清理
+
+        Args:
+            handle: 文档句柄
+
+        Returns:
+            文档文件是否存在
+        """
+        try:
+            os.utime(handle.path)
+            return True
+        except OSError:
+            return False
+
+    def _cleanup_expired(self):
+        """清理过期的合并文档和遗留的临时文件（读取文档时会刷新修改时间，见_touch）"""
+        if not self.max_age_hours:
+            return
+
+        expire_before = time.time() - self.max_age_hours * 3600
+        for path in self.root_dir.iterdir():
+            try:
+                if path.is_file() and path.stat().st_mtime < expire_before:
+                    path.unlink()
+            except OSError:
+                pass
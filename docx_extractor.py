@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Word文档提取器
+按文档顺序提取段落和表格，并把标题样式转换为Markdown标题
+"""
+
+import io
+import re
+from typing import List, Optional, Union
+
+
+# 标题样式名称，兼容英文版和中文版Word（如 Heading 1、标题 1）
+HEADING_STYLE_PATTERN = re.compile(r'^(?:heading|标题)\s*(\d)$', re.IGNORECASE)
+
+# 文档标题样式
+TITLE_STYLE_NAMES = {'title', '标题'}
+
+# 大纲级别9表示正文
+BODY_TEXT_OUTLINE_LEVEL = 9
+
+# Markdown最多支持六级标题
+MAX_MARKDOWN_HEADING_LEVEL = 6
+
+
+class DocxExtractor:
+    """Word文档提取器 - 输出带Markdown标题和表格的文本"""
+
+    def extract(self, source: Union[str, bytes]) -> str:
+        """
+        提取Word文档内容
+
+        Heading 1 对应 ##，Heading 2 对应 ###，依此类推，直到 Heading 5 对应 ######；
+        文档标题（Title样式）对应 #，这样 Heading 1 与Markdown文档中的模块标题层级一致。
+        Heading 6 及更深的标题超出Markdown的六级标题，转换为加粗段落，保留在 Heading 5 章节内，
+        不会与 Heading 5 成为同级标题而打乱层级关系
+
+        Args:
+            source: 文件路径或二进制内容
+
+        Returns:
+            Markdown格式的文本
+        """
+        from docx import Document
+        from docx.table import Table
+        from docx.text.paragraph import Paragraph
+
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        doc = Document(source)
+
+        lines = []
+        # 按body中元素的原始顺序遍历，保证表格出现在正确的位置
+        for element in doc.element.body.iterchildren():
+            tag = element.tag.rsplit('}', 1)[-1]
+            if tag == 'p':
+                lines.append(self._paragraph_to_markdown(Paragraph(element, doc)))
+            elif tag == 'tbl':
+                lines.extend(self._table_to_markdown(Table(element, doc)))
+
+        return '\n'.join(lines)
+
+    def _paragraph_to_markdown(self, paragraph) -> str:
+        """
+        转换单个段落，标题段落加上Markdown标题标记
+
+        Args:
+            paragraph: python-docx段落对象
+
+        Returns:
+            转换后的文本行
+        """
+        text = paragraph.text.strip()
+        if not text:
+            return ''
+
+        level = self._heading_level(paragraph)
+        if level is None:
+            return paragraph.text
+        if level > MAX_MARKDOWN_HEADING_LEVEL:
+            return f"**{text}**"
+
+        return f"{'#' * level} {text}"
+
+    def _heading_level(self, paragraph) -> Optional[int]:
+        """
+        推断段落的Markdown标题层级
+
+        优先使用样式名称，其次使用段落或样式上的大纲级别
+
+        Args:
+            paragraph: python-docx段落对象
+
+        Returns:
+            Markdown标题层级（从1开始，可能超过6），不是标题时返回None
+        """
+        style = paragraph.style
+        style_name = (style.name or '').strip() if style is not None else ''
+
+        if style_name.lower() in TITLE_STYLE_NAMES:
+            return 1
+
+        match = HEADING_STYLE_PATTERN.match(style_name)
+        if match:
+            return self._outline_to_markdown_level(int(match.group(1)) - 1)
+
+        outline_level = self._outline_level(paragraph)
+        if outline_level is not None:
+            return self._outline_to_markdown_level(outline_level)
+
+        return None
+
+    def _outline_level(self, paragraph) -> Optional[int]:
+        """
+        读取大纲级别（0表示1级标题），依次查找段落属性和样式继承链
+
+        Args:
+            paragraph: python-docx段落对象
+
+        Returns:
+            大纲级别，正文或未设置时返回None
+        """
+        from docx.oxml.ns import qn
+
+        candidates = [paragraph._p.pPr]
+        style = paragraph.style
+        while style is not None:
+            candidates.append(style.element.pPr)
+            style = style.base_style
+
+        for pPr in candidates:
+            if pPr is None:
+                continue
+            outline = pPr.find(qn('w:outlineLvl'))
+            if outline is not None:
+                level = int(outline.get(qn('w:val'), BODY_TEXT_OUTLINE_LEVEL))
+                return None if level >= BODY_TEXT_OUTLINE_LEVEL else level
+
+        return None
+
+    def _outline_to_markdown_level(self, outline_level: int) -> int:
+        """大纲级别转换为Markdown标题层级（1级标题对应 ##），不截断，由调用方处理超过六级的标题"""
+        return outline_level + 2
+
+    def _table_to_markdown(self, table) -> List[str]:
+        """
+        转换表格为Markdown表格，第一行作为表头
+
+        Args:
+            table: python-docx表格对象
+
+        Returns:
+            Markdown表格行列表（前后各留一个空行）
+        """
+        rows = []
+        for row in table.rows:
+            cells = [
+                cell.text.strip().replace('\n', ' ').replace('|', '\\|')
+                for cell in row.cells
+            ]
+            rows.append(f"| {' | '.join(cells)} |")
+
+        if not rows:
+            return []
+
+        column_count = len(table.rows[0].cells)
+        separator = f"|{'---|' * column_count}"
+        return [''] + rows[:1] + [separator] + rows[1:] + ['']
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel导出器
+把用例导出为多Sheet的Excel文件（用例汇总 + 每个模块一个Sheet）
+
+使用openpyxl的write_only模式逐行写出，不在内存中保留整个工作簿；
+单元格样式使用预先注册的NamedStyle，优先级颜色和斑马纹通过条件格式实现，
+不需要为每个单元格单独创建样式对象
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.datavalidation import DataValidation
+
+
+# 模块Sheet的列及列宽
+CASE_HEADERS = ['用例编号', '页面/模块', '检查点', '设计原则', '检查项', '优先级', '预期结果/设计标准', '是否通过', '截图/备注']
+CASE_COLUMN_WIDTHS = [12, 18, 20, 20, 35, 8, 40, 12, 25]
+# 居中显示的列（优先级、是否通过）
+CASE_CENTER_COLUMNS = {6, 8}
+
+# 汇总Sheet的列及列宽
+SUMMARY_HEADERS = ['序号', '模块名称', '用例数量', '高优先级', '中优先级', '低优先级', '完成数量', '完成率', '备注']
+SUMMARY_COLUMN_WIDTHS = [8, 25, 12, 12, 12, 12, 12, 12, 30]
+
+# 优先级颜色：(背景色, 文字颜色)
+PRIORITY_COLORS = {
+    '高': ('FFC7CE', '9C0006'),
+    '中': ('FFEB9C', '9C6500'),
+    '低': ('C6EFCE', '006100'),
+}
+
+# 斑马纹背景色（偶数行）
+STRIPE_COLOR = 'F2F2F2'
+
+# 是否通过 列的下拉选项
+PASS_OPTIONS = '"待测试,是,否"'
+
+STYLE_HEADER = 'case_header'
+STYLE_TEXT = 'case_text'
+STYLE_CENTER = 'case_center'
+
+
+def clean_sheet_name(name: str) -> str:
+    """
+    清理Excel Sheet名称，移除非法字符并限制长度
+
+    Args:
+        name: 原始名称
+
+    Returns:
+        合法的Sheet名称
+    """
+    # Excel不允许的字符: / \ ? * [ ] :
+    # 将 / 和 \ 替换为 -，其他非法字符删除
+    cleaned = name.replace('/', '-').replace('\\', '-').replace('?', '').replace('*', '').replace('[', '').replace(']', '').replace(':', '-')
+    cleaned = cleaned.strip()
+    if not cleaned:
+        cleaned = 'Sheet'
+    # 限制长度为31字符
+    return cleaned[:31]
+
+
+def group_cases_by_module(cases: Iterable[Dict]) -> Dict[str, List[Dict]]:
+    """
+    按 页面/模块 分组用例（保持首次出现的顺序）
+
+    Args:
+        cases: 用例列表
+
+    Returns:
+        模块名称 -> 用例列表
+    """
+    cases_by_module = {}
+    for case in cases:
+        cases_by_module.setdefault(case.get('页面/模块', '未分类'), []).append(case)
+    return cases_by_module
+
+
+class ExcelExporter:
+    """Excel导出器"""
+
+    def export(self, cases: Iterable[Dict], path: str) -> int:
+        """
+        导出用例到Excel文件
+
+        Args:
+            cases: 用例列表
+            path: 输出文件路径
+
+        Returns:
+            模块Sheet数量
+        """
+        cases_by_module = group_cases_by_module(cases)
+
+        wb = Workbook(write_only=True)
+        self._register_styles(wb)
+
+        # Sheet名称需要去重，汇总表中的公式要引用实际的Sheet名称
+        sheet_names = self._unique_sheet_names(cases_by_module.keys())
+
+        self._write_summary_sheet(wb, cases_by_module, sheet_names)
+        for module_name, module_cases in cases_by_module.items():
+            self._write_module_sheet(wb, sheet_names[module_name], module_cases)
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        wb.save(path)
+        return len(cases_by_module)
+
+    def _register_styles(self, wb: Workbook):
+        """注册共享的命名样式"""
+        border_side = Side(style='thin', color='D0D0D0')
+        border = Border(left=border_side, right=border_side, top=border_side, bottom=border_side)
+
+        wb.add_named_style(NamedStyle(
+            name=STYLE_HEADER,
+            font=Font(name='微软雅黑', size=11, bold=True, color='FFFFFF'),
+            fill=PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid'),
+            alignment=Alignment(horizontal='center', vertical='center', wrap_text=True),
+            border=border
+        ))
+        wb.add_named_style(NamedStyle(
+            name=STYLE_TEXT,
+            font=Font(name='微软雅黑', size=10),
+            alignment=Alignment(horizontal='left', vertical='center', wrap_text=True),
+            border=border
+        ))
+        wb.add_named_style(NamedStyle(
+            name=STYLE_CENTER,
+            font=Font(name='微软雅黑', size=10),
+            alignment=Alignment(horizontal='center', vertical='center'),
+            border=border
+        ))
+
+    def _unique_sheet_names(self, module_names: Iterable[str]) -> Dict[str, str]:
+        """
+        为每个模块分配唯一的Sheet名称
+
+        Args:
+            module_names: 模块名称
+
+        Returns:
+            模块名称 -> Sheet名称
+        """
+        used = {'用例汇总'}
+        sheet_names = {}
+
+        for module_name in module_names:
+            base = clean_sheet_name(module_name)
+            name = base
+            suffix = 1
+            while name in used:
+                suffix += 1
+                tail = f"_{suffix}"
+                name = base[:31 - len(tail)] + tail
+            used.add(name)
+            sheet_names[module_name] = name
+
+        return sheet_names
+
+    def _row_cells(self, ws, styles: List[str]) -> List[WriteOnlyCell]:
+        """
+        按列样式创建一行单元格
+
+        write_only模式下append会立即写出该行，同一组单元格可以在后续行中重复使用，
+        每列只需设置一次样式
+
+        Args:
+            ws: 工作表
+            styles: 每列的命名样式
+
+        Returns:
+            单元格列表
+        """
+        cells = []
+        for style in styles:
+            cell = WriteOnlyCell(ws)
+            cell.style = style
+            cells.append(cell)
+        return cells
+
+    def _append_row(self, ws, cells: List[WriteOnlyCell], values: List):
+        """把一行数据写入复用的单元格并追加到工作表"""
+        for cell, value in zip(cells, values):
+            cell.value = value
+        ws.append(cells)
+
+    def _setup_sheet(self, ws, widths: List[int], row_count: int, freeze: str):
+        """
+        设置列宽、冻结窗格和斑马纹（write_only模式下必须在写入数据前设置）
+
+        Args:
+            ws: 工作表
+            widths: 列宽
+            row_count: 数据行数（不含表头）
+            freeze: 冻结位置
+        """
+        for col_num, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(col_num)].width = width
+        ws.freeze_panes = freeze
+
+        if row_count:
+            last_col = get_column_letter(len(widths))
+            ws.conditional_formatting.add(
+                f"A2:{last_col}{row_count + 1}",
+                FormulaRule(
+                    formula=['MOD(ROW(),2)=0'],
+                    fill=PatternFill(start_color=STRIPE_COLOR, end_color=STRIPE_COLOR, fill_type='solid')
+                )
+            )
+
+    def _write_summary_sheet(self, wb: Workbook, cases_by_module: Dict[str, List[Dict]], sheet_names: Dict[str, str]):
+        """写入用例汇总Sheet"""
+        ws = wb.create_sheet('用例汇总')
+        self._setup_sheet(ws, SUMMARY_COLUMN_WIDTHS, len(cases_by_module), 'A2')
+
+        self._append_row(ws, self._row_cells(ws, [STYLE_HEADER] * len(SUMMARY_HEADERS)), SUMMARY_HEADERS)
+
+        cells = self._row_cells(ws, [STYLE_CENTER] * 8 + [STYLE_TEXT])
+        for row_num, (module_name, cases) in enumerate(cases_by_module.items(), 2):
+            high = sum(1 for c in cases if c.get('优先级') == '高')
+            medium = sum(1 for c in cases if c.get('优先级') == '中')
+            low = sum(1 for c in cases if c.get('优先级') == '低')
+
+            # 添加公式计算完成数量和完成率
+            sheet_name = sheet_names[module_name]
+            complete_formula = f"=COUNTIF('{sheet_name}'!H:H,\"是\")+COUNTIF('{sheet_name}'!H:H,\"否\")"
+            rate_formula = f"=IF(C{row_num}=0,\"0%\",TEXT(G{row_num}/C{row_num},\"0%\"))"
+
+            values = [row_num - 1, module_name, len(cases), high, medium, low, complete_formula, rate_formula, '']
+            self._append_row(ws, cells, values)
+
+    def _write_module_sheet(self, wb: Workbook, sheet_name: str, cases: List[Dict]):
+        """写入单个模块的用例Sheet"""
+        ws = wb.create_sheet(sheet_name)
+        row_count = len(cases)
+        last_row = row_count + 1
+
+        # 优先级颜色规则先添加，优先于斑马纹
+        if row_count:
+            for priority, (fill_color, font_color) in PRIORITY_COLORS.items():
+                ws.conditional_formatting.add(
+                    f"F2:F{last_row}",
+                    FormulaRule(
+                        formula=[f'$F2="{priority}"'],
+                        fill=PatternFill(start_color=fill_color, end_color=fill_color, fill_type='solid'),
+                        font=Font(color=font_color)
+                    )
+                )
+        self._setup_sheet(ws, CASE_COLUMN_WIDTHS, row_count, 'B2')
+
+        # 是否通过 列的下拉选择，整列共用一个数据验证
+        if row_count:
+            dv = DataValidation(type="list", formula1=PASS_OPTIONS, allow_blank=False)
+            dv.add(f"H2:H{last_row}")
+            ws.data_validations.append(dv)
+
+        self._append_row(ws, self._row_cells(ws, [STYLE_HEADER] * len(CASE_HEADERS)), CASE_HEADERS)
+
+        cells = self._row_cells(ws, [STYLE_CENTER if col_num in CASE_CENTER_COLUMNS else STYLE_TEXT
+                                     for col_num in range(1, len(CASE_HEADERS) + 1)])
+        for case in cases:
+            values = [
+                case.get('用例编号', ''),
+                case.get('页面/模块', ''),
+                case.get('检查点', ''),
+                case.get('设计原则', ''),
+                case.get('检查项', ''),
+                case.get('优先级', ''),
+                case.get('预期结果/设计标准', ''),
+                '待测试',  # 默认值
+                case.get('截图/备注', '')
+            ]
+            self._append_row(ws, cells, values)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+导出文件缓存
+按（导出类型、用例及检验状态的指纹）缓存生成好的CSV/Excel内容，
+用例和检验状态不变时，重复点击导出或页面重新运行都直接返回已生成的内容
+"""
+
+import csv
+import hashlib
+import threading
+from collections import OrderedDict
+from io import StringIO
+from typing import Any, Callable, Dict, List, Optional
+
+
+# 检验结果导出的列
+VERIFICATION_HEADERS = ['用例编号', '页面/模块', '检查点', '设计原则', '检查项',
+                        '优先级', '预期结果/设计标准', '检验状态']
+
+
+class ExportCache:
+    """导出文件缓存 - 进程内LRU"""
+
+    def __init__(self, max_entries: int = 32):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最多保留的导出文件数
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Streamlit的多个会话运行在同一进程的不同线程中
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_fingerprint(cases: List[Dict], verification_status: Optional[Dict[str, str]] = None) -> str:
+        """
+        计算用例（及检验状态）的指纹
+
+        Args:
+            cases: 用例列表
+            verification_status: 检验状态（用例编号 -> 状态），只计入cases中用例的状态
+
+        Returns:
+            SHA-256十六进制字符串
+        """
+        hasher = hashlib.sha256()
+        for case in cases:
+            row = '\x1f'.join(f"{key}={case[key]}" for key in sorted(case))
+            hasher.update(row.encode('utf-8'))
+            hasher.update(b'\x1e')
+
+        if verification_status is not None:
+            hasher.update(b'\x1d')
+            for case in cases:
+                status = verification_status.get(case.get('用例编号', ''), '')
+                hasher.update(status.encode('utf-8'))
+                hasher.update(b'\x1e')
+
+        return hasher.hexdigest()
+
+    def get(self, kind: str, fingerprint: str) -> Optional[Any]:
+        """
+        读取缓存
+
+        Args:
+            kind: 导出类型（如 csv、xlsx、module_csv:模块名）
+            fingerprint: 用例指纹
+
+        Returns:
+            导出内容，未命中时返回None
+        """
+        key = (kind, fingerprint)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, kind: str, fingerprint: str, artifact: Any):
+        """
+        写入缓存，超出容量时淘汰最久未使用的条目
+
+        Args:
+            kind: 导出类型
+            fingerprint: 用例指纹
+            artifact: 导出内容
+        """
+        key = (kind, fingerprint)
+        with self._lock:
+            self._entries[key] = artifact
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_build(self, kind: str, fingerprint: str, builder: Callable[[], Any]) -> Any:
+        """
+        读取缓存，未命中时生成并写入缓存
+
+        Args:
+            kind: 导出类型
+            fingerprint: 用例指纹
+            builder: 生成导出内容的函数
+
+        Returns:
+            导出内容
+        """
+        artifact = self.get(kind, fingerprint)
+        if artifact is None:
+            artifact = builder()
+            self.put(kind, fingerprint, artifact)
+        return artifact
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """获取缓存状态"""
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries}
+
+
+def build_verification_csv(cases: List[Dict], verification_status: Dict[str, str]) -> str:
+    """
+    生成包含检验状态的CSV内容
+
+    Args:
+        cases: 用例列表
+        verification_status: 检验状态（用例编号 -> 状态）
+
+    Returns:
+        CSV文本
+    """
+    output = StringIO()
+    writer = csv.DictWriter(output, fieldnames=VERIFICATION_HEADERS, extrasaction='ignore')
+    writer.writeheader()
+
+    for case in cases:
+        case_copy = case.copy()
+        case_copy['检验状态'] = verification_status.get(case.get('用例编号', ''), '待检验')
+        writer.writerow(case_copy)
+
+    return output.getvalue()
+
+
+# 进程级共享缓存
+_export_cache = None
+
+
+def get_export_cache() -> ExportCache:
+    """获取进程级共享的导出文件缓存"""
+    global _export_cache
+    if _export_cache is None:
+        _export_cache = ExportCache()
+    return _export_cache
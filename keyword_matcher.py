@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键词匹配器
+基于Aho-Corasick自动机的多模式匹配，一次扫描即可找出文本命中的最优类别
+"""
+
+import json
+import os
+from collections import deque
+from typing import Dict, List, Optional
+
+
+# 模块类型关键词表，可通过环境变量 MODULE_TYPE_KEYWORDS_FILE 指定其他文件
+DEFAULT_KEYWORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'module_type_keywords.json')
+
+# 节点未命中任何关键词时的优先级
+_NO_MATCH = float('inf')
+
+
+class KeywordMatcher:
+    """关键词匹配器 - 把 {类别: [关键词]} 编译为Aho-Corasick自动机"""
+
+    def __init__(self, keyword_table: Dict[str, List[str]]):
+        """
+        编译关键词表
+
+        Args:
+            keyword_table: 类别到关键词列表的映射，类别的先后顺序即优先级（越靠前越优先），
+                匹配时忽略大小写
+        """
+        self.labels = list(keyword_table.keys())
+
+        # 状态转移表、失败指针、每个状态可命中的最高优先级
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [_NO_MATCH]
+
+        for priority, keywords in enumerate(keyword_table.values()):
+            for keyword in keywords:
+                if keyword:
+                    self._insert(keyword.lower(), priority)
+
+        self._build_fail_links()
+
+    def _insert(self, keyword: str, priority: int):
+        """把关键词插入字典树"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(_NO_MATCH)
+            state = next_state
+        self._best[state] = min(self._best[state], priority)
+
+    def _build_fail_links(self):
+        """按层序构建失败指针，并沿失败链合并命中优先级"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                # 后缀命中的关键词也算当前状态的命中
+                self._best[next_state] = min(self._best[next_state], self._best[self._fail[next_state]])
+                queue.append(next_state)
+
+    def best_label(self, text: str) -> Optional[str]:
+        """
+        扫描一遍文本，返回命中的优先级最高的类别
+
+        Args:
+            text: 待匹配文本
+
+        Returns:
+            类别名称，未命中时返回None
+        """
+        best = _NO_MATCH
+        state = 0
+
+        for char in text.lower():
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            if self._best[state] < best:
+                best = self._best[state]
+                # 已命中最高优先级，无需继续扫描
+                if best == 0:
+                    break
+
+        return None if best == _NO_MATCH else self.labels[best]
+
+    def contains_any(self, text: str) -> bool:
+        """检查文本是否包含任意关键词"""
+        return self.best_label(text) is not None
+
+
+def load_keyword_config(path: Optional[str] = None) -> Dict:
+    """
+    读取关键词配置文件
+
+    Args:
+        path: 配置文件路径，默认使用环境变量 MODULE_TYPE_KEYWORDS_FILE 或内置文件
+
+    Returns:
+        配置字典，读取失败时返回空配置
+    """
+    path = path or os.getenv('MODULE_TYPE_KEYWORDS_FILE') or DEFAULT_KEYWORDS_FILE
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ 错误: 无法加载关键词配置 {path}: {e}")
+        return {}
@@ -5,8 +5,9 @@
 用于表示从需求文档中识别出的模块/页面
 """
 
-from dataclasses import dataclass
-from typing import Dict
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -18,6 +19,11 @@ class Module:
     type: str                  # 模块类型（列表页、详情页等）
     level: int                 # 标题层级（1-6）
     selected: bool = True      # 是否选中（默认选中）
+    start: int = 0             # 章节在文档中的起始偏移（字符）
+    end: int = 0               # 章节在文档中的结束偏移（不含），与start相等表示没有章节范围
+    section_hash: str = ''     # 章节内容哈希，用于校验偏移是否仍然对应同一份文档
+    parent_id: Optional[str] = None  # 父模块ID，顶级模块为None
+    child_ids: List[str] = field(default_factory=list)  # 子模块ID（按文档顺序）
     
     def to_dict(self) -> Dict:
         """
@@ -32,7 +38,12 @@ class Module:
             'description': self.description,
             'type': self.type,
             'level': self.level,
-            'selected': self.selected
+            'selected': self.selected,
+            'start': self.start,
+            'end': self.end,
+            'section_hash': self.section_hash,
+            'parent_id': self.parent_id,
+            'child_ids': list(self.child_ids)
         }
     
     @classmethod
@@ -52,5 +63,73 @@ class Module:
             description=data.get('description', ''),
             type=data.get('type', ''),
             level=data.get('level', 1),
-            selected=data.get('selected', True)
+            selected=data.get('selected', True),
+            start=data.get('start', 0),
+            end=data.get('end', 0),
+            section_hash=data.get('section_hash', ''),
+            parent_id=data.get('parent_id'),
+            child_ids=list(data.get('child_ids', []))
         )
+
+
+def make_module_id(document_key: str, path: List[str]) -> str:
+    """
+    由文档标识和标题路径生成确定性的模块ID
+
+    Args:
+        document_key: 文档标识（如源文件名），单文档时可为空字符串
+        path: 标题路径（从顶级标题到模块标题）
+
+    Returns:
+        16位十六进制ID
+    """
+    # 使用不会出现在标题中的分隔符，避免 ["a/b"] 与 ["a", "b"] 冲突
+    key = '\x1f'.join([document_key] + list(path))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+
+def link_module_tree(modules: List[Module]) -> None:
+    """
+    根据parent_id重建模块的child_ids
+
+    父模块不在列表中（如被去重过滤）时，该模块提升为顶级模块
+
+    Args:
+        modules: 模块列表（原地修改）
+    """
+    module_map = {module.id: module for module in modules}
+
+    for module in modules:
+        module.child_ids = []
+        if module.parent_id not in module_map or module.parent_id == module.id:
+            module.parent_id = None
+
+    for module in modules:
+        if module.parent_id is not None:
+            module_map[module.parent_id].child_ids.append(module.id)
+
+
+def collect_subtree_ids(module_id: str, module_map: Dict[str, Module]) -> List[str]:
+    """
+    获取模块及其所有后代模块的ID
+
+    Args:
+        module_id: 模块ID
+        module_map: 模块ID到Module的映射
+
+    Returns:
+        ID列表（先序遍历顺序，包含module_id本身）
+    """
+    subtree_ids = []
+    stack = [module_id]
+    visited = set()
+
+    while stack:
+        current_id = stack.pop()
+        if current_id in visited or current_id not in module_map:
+            continue
+        visited.add(current_id)
+        subtree_ids.append(current_id)
+        stack.extend(reversed(module_map[current_id].child_ids))
+
+    return subtree_ids
@@ -5,29 +5,128 @@
 从需求文档中识别功能模块/页面
 """
 
+import bisect
 import re
 import hashlib
-from typing import List, Optional
-from module import Module
+from typing import Dict, List, Optional, Tuple
+from module import Module, link_module_tree, make_module_id
 from ai_generator import AIGenerator
+from outline_parser import Outline, parse_outline
+from keyword_matcher import KeywordMatcher, load_keyword_config
+from recognition_cache import RecognitionCache
+
+
+# 关键词表在导入时编译一次，所有识别器实例共享（见 module_type_keywords.json）
+_KEYWORD_CONFIG = load_keyword_config()
+DEFAULT_MODULE_TYPE = _KEYWORD_CONFIG.get('default_type', '页面')
+TYPE_MATCHER = KeywordMatcher(_KEYWORD_CONFIG.get('type_keywords', {}))
+HEADING_MATCHER = KeywordMatcher({'heading': _KEYWORD_CONFIG.get('heading_keywords', [])})
 
 
 class ModuleRecognizer:
     """模块识别器 - 从需求文档中识别功能模块"""
     
-    def __init__(self, ai_generator: Optional[AIGenerator] = None):
+    # 模块级Markdown标题 (##, ###, ####等)
+    MARKDOWN_HEADING_PATTERN = re.compile(r'^#{2,6}\s+\S', re.MULTILINE)
+    
+    # 多文档合并时每个源文档的一级标题（见上传处理中的合并格式），用于确定文档标识
+    DOCUMENT_HEADER_PATTERN = re.compile(r'^文档 \d+: (.+)$')
+    
+    # 标题编号（如 1. / 2.1 / 3、），生成名称和ID时去掉，编号调整不影响模块ID
+    NUMBERING_PATTERN = re.compile(r'^\d+(\.\d+)*[\.\、]?\s*')
+    
+    # 识别逻辑版本号，修改识别规则后递增，使旧的缓存结果失效
+    RECOGNIZER_VERSION = 5
+    
+    # 混合识别时，章节标题覆盖率低于该阈值的区域才交给AI识别
+    HYBRID_CONFIDENCE_THRESHOLD = 0.5
+    
+    def __init__(self, ai_generator: Optional[AIGenerator] = None, cache: Optional[RecognitionCache] = None,
+                 mode: str = 'full'):
         """
         初始化识别器
         
         Args:
             ai_generator: 可选的AIGenerator实例，用于AI识别
+            cache: 可选的识别结果缓存
+            mode: AI识别方式，'full' 整篇文档交给AI；'hybrid' 先按规则识别，只把结构不清晰的区域交给AI
         """
         self.ai_generator = ai_generator
+        self.cache = cache
+        self.mode = mode
+        # 最近一次识别结果的来源：'cache'、'ai'、'hybrid' 或 'rule'
+        self.last_source = None
+        # 最近一次识别是否发生了AI失败降级（降级结果不写入缓存）
+        self._degraded = False
+        self._outline = None
+        self._outline_content = None
+    
+    def parse_outline(self, content: str) -> Outline:
+        """
+        解析文档大纲（标题树及每个章节的起止偏移）
+        
+        同一份内容只扫描一次，之后的章节查找都是O(1)
+        
+        Args:
+            content: 文档内容
+            
+        Returns:
+            文档大纲
+        """
+        if self._outline is None or content is not self._outline_content:
+            self._outline = parse_outline(content)
+            self._outline_content = content
+        return self._outline
     
     def recognize_modules(self, content: str, file_type: str) -> List[Module]:
         """
         识别文档中的模块
         
+        配置了缓存时，同一份内容在相同模式/提供商/模型下只识别一次
+        
+        Args:
+            content: 文档内容
+            file_type: 文件类型 (md, txt, docx)
+            
+        Returns:
+            模块列表
+        """
+        use_ai = bool(self.ai_generator and self.ai_generator.client)
+        if not use_ai:
+            mode = 'rule'
+        else:
+            mode = 'hybrid' if self.mode == 'hybrid' else 'ai'
+        
+        cache_key = None
+        if self.cache is not None:
+            cache_key = RecognitionCache.make_key(
+                content, file_type, mode,
+                provider=self.ai_generator.provider if use_ai else None,
+                model=self.ai_generator.model if use_ai else None,
+                version=self.RECOGNIZER_VERSION
+            )
+            cached_modules = self.cache.get(cache_key)
+            if cached_modules is not None:
+                self.last_source = 'cache'
+                print(f"命中识别缓存，共 {len(cached_modules)} 个模块")
+                return cached_modules
+        
+        self._degraded = False
+        if mode == 'hybrid':
+            modules = self._recognize_hybrid(content, file_type)
+        else:
+            modules = self._recognize_uncached(content, file_type)
+        
+        # AI识别失败降级到规则时不缓存，下次仍会尝试AI识别
+        if cache_key is not None and modules and self.last_source == mode and not self._degraded:
+            self.cache.put(cache_key, modules)
+        
+        return modules
+    
+    def _recognize_uncached(self, content: str, file_type: str) -> List[Module]:
+        """
+        执行识别（AI优先，失败时降级到规则识别）
+        
         Args:
             content: 文档内容
             file_type: 文件类型 (md, txt, docx)
@@ -40,12 +139,18 @@ class ModuleRecognizer:
         # 优先使用AI识别（如果配置了AI生成器）
         if self.ai_generator and self.ai_generator.client:
             try:
-                modules = self._recognize_with_ai(content)
+                # 合并文档按源文档分别识别，模块ID带上各自的文档标识，不同文档中的同名模块不会互相覆盖
+                modules = []
+                for start, end, _ in self._split_documents(content):
+                    if content[start:end].strip():
+                        modules.extend(self._recognize_region_with_ai(content, start, end))
                 if modules:
                     print(f"AI识别成功，识别到 {len(modules)} 个模块")
+                    self.last_source = 'ai'
                     return self._validate_and_filter(modules)
             except Exception as e:
                 print(f"AI识别失败，降级到规则识别: {e}")
+                self._degraded = True
         
         # 降级到规则识别
         if file_type in ['md', 'txt']:
@@ -57,8 +162,167 @@ class ModuleRecognizer:
             modules = self._recognize_from_markdown(content)
         
         print(f"规则识别完成，识别到 {len(modules)} 个模块")
+        self.last_source = 'rule'
         return self._validate_and_filter(modules)
 
+    def _recognize_hybrid(self, content: str, file_type: str) -> List[Module]:
+        """
+        混合识别：先按规则识别整篇文档，再只把低置信度区域交给AI
+        
+        每个一级标题（合并文档中即每个源文档）为一个区域，置信度为模块章节覆盖的文本比例。
+        标题结构清晰的区域直接使用规则结果，不消耗任何AI调用
+        
+        Args:
+            content: 文档内容
+            file_type: 文件类型
+            
+        Returns:
+            模块列表
+        """
+        rule_modules = self._recognize_from_markdown(content)
+        modules = []
+        ai_region_count = 0
+        regions = self._split_regions(content)
+        
+        for start, end in regions:
+            if not content[start:end].strip():
+                continue
+            
+            region_modules = [module for module in rule_modules if start <= module.start < end]
+            confidence = self._score_region(start, end, region_modules)
+            
+            if confidence >= self.HYBRID_CONFIDENCE_THRESHOLD:
+                modules.extend(region_modules)
+                continue
+            
+            print(f"区域 [{start}, {end}) 置信度 {confidence:.2f}，交给AI识别")
+            ai_region_count += 1
+            try:
+                ai_modules = self._recognize_region_with_ai(content, start, end)
+            except Exception as e:
+                print(f"区域AI识别失败，使用规则识别结果: {e}")
+                ai_modules = []
+            
+            if ai_modules:
+                modules.extend(ai_modules)
+            else:
+                self._degraded = True
+                modules.extend(region_modules)
+        
+        print(f"混合识别完成：{len(regions)} 个区域，其中 {ai_region_count} 个调用AI，识别到 {len(modules)} 个模块")
+        self.last_source = 'hybrid'
+        return self._validate_and_filter(modules)
+    
+    def _split_regions(self, content: str) -> List[Tuple[int, int]]:
+        """
+        按一级标题把文档划分为区域
+        
+        Args:
+            content: 文档内容
+            
+        Returns:
+            区域起止偏移列表；没有一级标题时整篇文档为一个区域
+        """
+        roots = [node for node in self.parse_outline(content) if node.level == 1]
+        if not roots:
+            return [(0, len(content))]
+        
+        regions = []
+        if roots[0].start > 0:
+            regions.append((0, roots[0].start))
+        regions.extend((node.start, node.end) for node in roots)
+        return regions
+    
+    def _split_documents(self, content: str) -> List[Tuple[int, int, str]]:
+        """
+        按合并文档的文档标题（# 文档 N: 文件名）把内容划分为源文档
+        
+        源文档自己的一级标题（如 # 需求文档、Word的Title样式）不影响划分
+        
+        Args:
+            content: 文档内容
+            
+        Returns:
+            各源文档的 (起始偏移, 结束偏移, 文档标识) 列表；不是合并文档时整篇内容为一个区域，文档标识为空
+        """
+        headers = []
+        for node in self.parse_outline(content):
+            if node.level != 1:
+                continue
+            header_match = self.DOCUMENT_HEADER_PATTERN.match(node.title)
+            if header_match:
+                headers.append((node.start, header_match.group(1).strip()))
+        
+        if not headers:
+            return [(0, len(content), '')]
+        
+        documents = [(0, headers[0][0], '')] if headers[0][0] > 0 else []
+        ends = [start for start, _ in headers[1:]] + [len(content)]
+        documents.extend((start, end, key) for (start, key), end in zip(headers, ends))
+        return documents
+    
+    def _document_key_at(self, documents: List[Tuple[int, int, str]], offset: int) -> str:
+        """
+        获取偏移所在源文档的文档标识
+        
+        Args:
+            documents: _split_documents 的结果
+            offset: 内容中的字符偏移
+            
+        Returns:
+            文档标识，不在任何合并文档区域内时为空字符串
+        """
+        index = bisect.bisect_right([start for start, _, _ in documents], offset) - 1
+        return documents[index][2] if index >= 0 else ''
+    
+    def _score_region(self, start: int, end: int, region_modules: List[Module]) -> float:
+        """
+        计算区域的规则识别置信度
+        
+        Args:
+            start: 区域起始偏移
+            end: 区域结束偏移
+            region_modules: 规则识别出的、位于该区域内的模块
+            
+        Returns:
+            0-1之间的置信度：顶层模块章节覆盖的文本比例，没有模块标题时为0
+        """
+        if not region_modules or end <= start:
+            return 0.0
+        
+        region_ids = {module.id for module in region_modules}
+        covered = sum(
+            module.end - module.start
+            for module in region_modules
+            if module.parent_id not in region_ids
+        )
+        return min(1.0, covered / (end - start))
+    
+    def _recognize_region_with_ai(self, content: str, start: int, end: int) -> List[Module]:
+        """
+        使用AI识别单个区域，识别出的模块以整个区域作为章节范围
+        
+        Args:
+            content: 文档内容
+            start: 区域起始偏移
+            end: 区域结束偏移
+            
+        Returns:
+            模块列表
+        """
+        region_text = content[start:end]
+        section_hash = hashlib.sha256(region_text.encode('utf-8')).hexdigest()[:16]
+        
+        # 文档标识取自区域所在的源文档，区域可能从源文档自己的一级标题开始
+        document_key = self._document_key_at(self._split_documents(content), start)
+        
+        modules = self._recognize_with_ai(region_text, document_key)
+        for module in modules:
+            module.start = start
+            module.end = end
+            module.section_hash = section_hash
+        return modules
+    
     def _recognize_from_markdown(self, content: str) -> List[Module]:
         """
         从Markdown标题识别模块
@@ -70,40 +334,53 @@ class ModuleRecognizer:
             模块列表
         """
         modules = []
-        lines = content.split('\n')
-        
-        # 正则匹配Markdown标题 (##, ###, ####等)
-        heading_pattern = re.compile(r'^(#{2,6})\s+(.+)$')
+        outline = self.parse_outline(content)
+        documents = self._split_documents(content)
+        # 大纲节点序号 -> 模块ID，用于把标题树映射为模块树
+        node_module_ids = {}
+        # 同一文档中标题路径完全相同的章节按出现顺序区分
+        seen_ids = {}
         
-        for line in lines:
-            match = heading_pattern.match(line.strip())
-            if match:
-                level_marks = match.group(1)
-                title = match.group(2).strip()
+        # 一次扫描得到所有标题及其章节范围，只取 ##-###### 级别
+        for node in outline:
+            if node.level < 2:
+                continue
+            
+            # 过滤掉数字开头的标题（如：## 1. 概述 或 ## 2.1 基本信息）
+            # 提取实际的模块名称
+            title_clean = self.NUMBERING_PATTERN.sub('', node.title)
+            
+            if title_clean:
+                # 由文档标识和标题路径生成稳定ID
+                document_key, heading_path = self._heading_path(outline, node, documents)
+                module_id = self._generate_module_id(heading_path, document_key, seen_ids)
                 
-                # 计算层级 (## = 2, ### = 3, etc.)
-                level = len(level_marks)
+                # 推断模块类型
+                module_type = self._infer_module_type(title_clean)
                 
-                # 过滤掉数字开头的标题（如：## 1. 概述 或 ## 2.1 基本信息）
-                # 提取实际的模块名称
-                title_clean = re.sub(r'^\d+(\.\d+)*[\.\、]?\s*', '', title)
+                # 父模块为最近的、已识别为模块的祖先标题
+                parent_id = None
+                ancestor_id = node.parent
+                while ancestor_id is not None:
+                    if ancestor_id in node_module_ids:
+                        parent_id = node_module_ids[ancestor_id]
+                        break
+                    ancestor_id = outline.get(ancestor_id).parent
                 
-                if title_clean:
-                    # 生成唯一ID
-                    module_id = self._generate_module_id(title_clean)
-                    
-                    # 推断模块类型
-                    module_type = self._infer_module_type(title_clean)
-                    
-                    module = Module(
-                        id=module_id,
-                        name=title_clean,
-                        description='',  # 规则识别暂不提供描述
-                        type=module_type,
-                        level=level,
-                        selected=True
-                    )
-                    modules.append(module)
+                module = Module(
+                    id=module_id,
+                    name=title_clean,
+                    description='',  # 规则识别暂不提供描述
+                    type=module_type,
+                    level=node.level,
+                    selected=True,
+                    start=node.start,
+                    end=node.end,
+                    section_hash=node.section_hash,
+                    parent_id=parent_id
+                )
+                modules.append(module)
+                node_module_ids[node.node_id] = module_id
         
         return modules
     
@@ -111,23 +388,28 @@ class ModuleRecognizer:
         """
         从Word文档标题样式识别模块
         
-        注意：由于content已经是提取后的纯文本，
-        这里使用与Markdown相同的策略
+        文档解析时已将标题样式转换为Markdown标题（见DocxExtractor），
+        此时直接按Markdown标题识别；旧的纯文本内容才使用启发式规则
         
         Args:
-            content: Word文档内容（纯文本）
+            content: Word文档内容
             
         Returns:
             模块列表
         """
-        # Word文档转换为纯文本后，通常标题会保留
-        # 这里使用简单的启发式规则：
+        if self.MARKDOWN_HEADING_PATTERN.search(content):
+            return self._recognize_from_markdown(content)
+        
+        # 纯文本内容没有标题信息，使用简单的启发式规则：
         # 1. 短行（< 50字符）
         # 2. 不以标点结尾
         # 3. 可能包含数字编号
         
         modules = []
         lines = content.split('\n')
+        # 合并文档中当前所在的源文档，及同一文档中同名标题的出现次数
+        document_key = ''
+        seen_ids = {}
         
         for line in lines:
             line = line.strip()
@@ -136,14 +418,21 @@ class ModuleRecognizer:
             if not line or len(line) > 100:
                 continue
             
+            # 合并文档的文档标题（# 文档 N: 文件名）只用于确定文档标识
+            if line.startswith('# '):
+                header_match = self.DOCUMENT_HEADER_PATTERN.match(line[2:].strip())
+                if header_match:
+                    document_key = header_match.group(1).strip()
+                    continue
+            
             # 检查是否像标题（短、不以句号结尾）
             if len(line) < 50 and not line.endswith(('。', '.', '，', ',')):
                 # 移除数字编号（支持多级编号如 1.1, 2.3.1）
-                title_clean = re.sub(r'^\d+(\.\d+)*[\.\、]?\s*', '', line)
+                title_clean = self.NUMBERING_PATTERN.sub('', line)
                 
                 # 检查是否包含关键词（页面、模块、功能等）
-                if any(keyword in title_clean for keyword in ['页面', '模块', '功能', '管理', '列表', '详情', '创建', '编辑']):
-                    module_id = self._generate_module_id(title_clean)
+                if HEADING_MATCHER.contains_any(title_clean):
+                    module_id = self._generate_module_id([title_clean], document_key, seen_ids)
                     module_type = self._infer_module_type(title_clean)
                     
                     module = Module(
@@ -158,19 +447,62 @@ class ModuleRecognizer:
         
         return modules
     
-    def _generate_module_id(self, name: str) -> str:
+    def _heading_path(self, outline: Outline, node,
+                      documents: List[Tuple[int, int, str]]) -> Tuple[str, List[str]]:
         """
-        为模块生成唯一ID
+        获取节点的文档标识和标题路径
+        
+        文档标识按偏移取自节点所在的 # 文档 N: 区域，源文档自己有一级标题时也不会丢失
         
         Args:
-            name: 模块名称
+            outline: 文档大纲
+            node: 大纲节点
+            documents: _split_documents 的结果
             
         Returns:
-            唯一ID（使用MD5哈希）
+            (文档标识, 去掉编号的标题路径)；合并文档中文档标识为源文件名，否则为空字符串
         """
-        # 使用MD5哈希生成唯一ID
-        hash_obj = hashlib.md5(name.encode('utf-8'))
-        return hash_obj.hexdigest()[:12]  # 取前12位
+        titles = outline.path(node)
+        # 用文件名而不是"文档 N"，上传顺序变化不影响ID
+        document_key = self._document_key_at(documents, node.start)
+        
+        # 文档标题本身不计入标题路径
+        root = outline.get(self._root_id(outline, node))
+        if root.level == 1 and self.DOCUMENT_HEADER_PATTERN.match(root.title):
+            titles = titles[1:]
+        
+        return document_key, [self.NUMBERING_PATTERN.sub('', title) for title in titles]
+    
+    def _root_id(self, outline: Outline, node) -> int:
+        """获取节点所在的顶级节点序号"""
+        while node.parent is not None:
+            node = outline.get(node.parent)
+        return node.node_id
+    
+    def _generate_module_id(self, path: List[str], document_key: str = '',
+                            seen_ids: Optional[Dict[str, int]] = None) -> str:
+        """
+        为模块生成稳定ID
+        
+        ID只由文档标识和标题路径决定，重新上传同一文档得到相同的ID，可作为缓存和检验状态的键
+        
+        Args:
+            path: 标题路径（从顶级标题到模块标题）
+            document_key: 文档标识（源文件名）
+            seen_ids: 已生成的ID计数，传入时路径重复的章节追加出现序号以区分
+            
+        Returns:
+            唯一ID
+        """
+        module_id = make_module_id(document_key, path)
+        
+        if seen_ids is not None:
+            occurrence = seen_ids.get(module_id, 0)
+            seen_ids[module_id] = occurrence + 1
+            if occurrence:
+                module_id = make_module_id(document_key, path + [f'#{occurrence + 1}'])
+        
+        return module_id
     
     def _infer_module_type(self, name: str) -> str:
         """
@@ -182,31 +514,16 @@ class ModuleRecognizer:
         Returns:
             模块类型
         """
-        name_lower = name.lower()
-        
-        # 类型关键词映射
-        type_keywords = {
-            '列表页': ['列表', 'list', '管理'],
-            '详情页': ['详情', 'detail', '查看'],
-            '创建页': ['创建', '新建', 'create', 'add', '添加'],
-            '编辑页': ['编辑', 'edit', '修改', '更新'],
-            '弹窗': ['弹窗', 'dialog', 'modal', '对话框'],
-            '首页': ['首页', 'home', 'index', '主页'],
-            '登录页': ['登录', 'login', '注册', 'register'],
-        }
-        
-        for module_type, keywords in type_keywords.items():
-            if any(keyword in name_lower for keyword in keywords):
-                return module_type
-        
-        return '页面'  # 默认类型
+        # 一次扫描命中多个类型时，取关键词表中靠前的类型
+        return TYPE_MATCHER.best_label(name) or DEFAULT_MODULE_TYPE
 
-    def _recognize_with_ai(self, content: str) -> List[Module]:
+    def _recognize_with_ai(self, content: str, document_key: str = '') -> List[Module]:
         """
         使用AI识别模块
         
         Args:
             content: 文档内容
+            document_key: 文档标识，用于生成模块ID
             
         Returns:
             模块列表
@@ -219,10 +536,14 @@ class ModuleRecognizer:
                 print("AI返回结果格式错误")
                 return []
             
+            # analyze_requirement 在AI调用失败时返回基础分析结果，不能当作AI识别结果
+            if result.get('fallback'):
+                raise RuntimeError("AI分析失败，返回的是基础分析结果")
+            
             modules = []
             for idx, module_data in enumerate(result['modules']):
-                # 生成唯一ID
-                module_id = self._generate_module_id(module_data['name'])
+                # AI结果没有标题路径，同名模块视为重复
+                module_id = self._generate_module_id([module_data['name']], document_key)
                 
                 # 推断模块类型（如果AI没有提供）
                 module_type = module_data.get('type', '')
@@ -260,27 +581,26 @@ class ModuleRecognizer:
             print("警告：未识别到任何模块")
             return []
         
-        # 1. 过滤重复模块（基于name去重）
-        seen_names = set()
+        # 1. 过滤重复模块（基于ID去重，ID由文档和标题路径决定）
+        seen_ids = set()
         unique_modules = []
         
         for module in modules:
-            if module.name not in seen_names:
-                seen_names.add(module.name)
+            if module.id not in seen_ids:
+                seen_ids.add(module.id)
                 unique_modules.append(module)
             else:
                 print(f"过滤重复模块: {module.name}")
         
-        # 2. 验证模块数量（至少1个，最多50个）
+        # 2. 验证模块数量（至少1个；不设上限，大量模块由选择器分页显示）
         if len(unique_modules) < 1:
             print("警告：过滤后没有有效模块")
             return []
         
-        if len(unique_modules) > 50:
-            print(f"警告：识别到 {len(unique_modules)} 个模块，超过最大限制50个，将截取前50个")
-            unique_modules = unique_modules[:50]
+        # 3. 重建父子关系（父模块被过滤时子模块提升为顶级）
+        link_module_tree(unique_modules)
         
-        # 3. 为模块添加默认描述（如果没有描述）
+        # 4. 为模块添加默认描述（如果没有描述）
         for module in unique_modules:
             if not module.description:
                 module.description = f"{module.type} - {module.name}"
@@ -319,4 +639,19 @@ if __name__ == '__main__':
     
     print(f"\n识别到 {len(modules)} 个模块:")
     for module in modules:
-        print(f"- [{module.type}] {module.name} (Level {module.level}, ID: {module.id})")
+        indent = '  ' * (module.level - 2)
+        print(f"{indent}- [{module.type}] {module.name} (Level {module.level}, ID: {module.id}, 子模块: {len(module.child_ids)})")
+    
+    # 回归检查：两个源文档有相同的一级标题和模块标题时，模块ID仍按源文档区分，
+    # 且与单独上传该文档时的ID一致
+    merged_content = (
+        "# 文档 1: a.md\n\n# 需求文档\n## 首页\n首页内容\n"
+        "\n\n" + "=" * 80 + "\n\n"
+        "# 文档 2: b.md\n\n# 需求文档\n## 首页\n首页内容\n"
+    )
+    single_content = "# 文档 1: b.md\n\n# 需求文档\n## 首页\n首页内容\n"
+    merged_ids = [module.id for module in ModuleRecognizer().recognize_modules(merged_content, 'md')]
+    single_ids = [module.id for module in ModuleRecognizer().recognize_modules(single_content, 'md')]
+    assert len(set(merged_ids)) == 2, merged_ids
+    assert single_ids == merged_ids[1:], (single_ids, merged_ids)
+    print("\n文档标识回归检查通过")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模块生成调度器
+估算每个模块的生成耗时，并发生成时按"预计耗时最长优先"（LPT）分派，
+缩短整体完成时间（makespan），并记录预测与实际耗时的对比
+"""
+
+import heapq
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from module import Module
+
+
+@dataclass
+class ScheduledModule:
+    """调度条目 - 一个待生成的模块及其预计耗时"""
+    index: int                 # 模块在选中列表中的序号
+    module: Module             # 模块
+    priority: int = 0          # 优先级，数值越大越先分派（优先于预计耗时）
+    section_length: int = 0    # 章节长度（字符）
+    predicted_seconds: float = 0.0  # 预计耗时（秒）
+    actual_seconds: float = 0.0     # 实际耗时（秒），生成完成后填写
+
+
+@dataclass
+class ScheduleReport:
+    """调度报告 - 预测与实际的完成时间对比"""
+    workers: int                           # 并发数
+    predicted_makespan: float = 0.0        # 按预测耗时模拟得到的总耗时（秒）
+    actual_makespan: float = 0.0           # 实际总耗时（秒）
+    entries: List[ScheduledModule] = field(default_factory=list)  # 按分派顺序排列的条目
+
+    def summary(self) -> str:
+        """生成一行摘要文本"""
+        return (f"并发 {self.workers}，预计耗时 {self.predicted_makespan:.1f} 秒，"
+                f"实际耗时 {self.actual_makespan:.1f} 秒")
+
+    def to_dict(self) -> Dict:
+        """
+        转换为字典
+
+        Returns:
+            包含汇总信息和每个模块预测/实际耗时的字典
+        """
+        return {
+            'workers': self.workers,
+            'predicted_makespan': self.predicted_makespan,
+            'actual_makespan': self.actual_makespan,
+            'modules': [
+                {
+                    'index': entry.index,
+                    'name': entry.module.name,
+                    'type': entry.module.type,
+                    'priority': entry.priority,
+                    'section_length': entry.section_length,
+                    'predicted_seconds': entry.predicted_seconds,
+                    'actual_seconds': entry.actual_seconds
+                }
+                for entry in self.entries
+            ]
+        }
+
+
+class LatencyHistory:
+    """按模块类型记录的历史生成耗时（指数移动平均）"""
+
+    # 没有历史数据时的估算：固定开销 + 每千字符耗时（秒）
+    DEFAULT_BASE_SECONDS = 1.0
+    DEFAULT_SECONDS_PER_KCHAR = 0.5
+
+    def __init__(self, smoothing: float = 0.3):
+        """
+        初始化历史记录
+
+        Args:
+            smoothing: 指数移动平均的平滑系数，越大越偏向最近的样本
+        """
+        self.smoothing = smoothing
+        # 模块类型 -> {'seconds': 平均耗时, 'length': 平均章节长度}
+        self._stats = {}
+        # 多个会话可能同时生成
+        self._lock = threading.Lock()
+
+    def record(self, module_type: str, section_length: int, seconds: float):
+        """
+        记录一次生成耗时
+
+        Args:
+            module_type: 模块类型
+            section_length: 章节长度（字符）
+            seconds: 实际耗时（秒）
+        """
+        with self._lock:
+            stats = self._stats.get(module_type)
+            if stats is None:
+                self._stats[module_type] = {'seconds': seconds, 'length': float(section_length)}
+                return
+            stats['seconds'] += self.smoothing * (seconds - stats['seconds'])
+            stats['length'] += self.smoothing * (section_length - stats['length'])
+
+    def estimate(self, module_type: str, section_length: int) -> float:
+        """
+        估算生成耗时
+
+        有历史数据时，一半视为固定开销、一半与章节长度成正比；没有历史数据时使用默认估算
+
+        Args:
+            module_type: 模块类型
+            section_length: 章节长度（字符）
+
+        Returns:
+            预计耗时（秒）
+        """
+        with self._lock:
+            stats = self._stats.get(module_type)
+            if stats is None:
+                return self.DEFAULT_BASE_SECONDS + self.DEFAULT_SECONDS_PER_KCHAR * section_length / 1000
+            seconds, length = stats['seconds'], stats['length']
+
+        if length <= 0:
+            return seconds
+        return seconds * (0.5 + 0.5 * section_length / length)
+
+
+class ModuleScheduler:
+    """模块生成调度器"""
+
+    def __init__(self, history: Optional[LatencyHistory] = None):
+        """
+        初始化调度器
+
+        Args:
+            history: 历史耗时记录，默认使用进程级共享记录
+        """
+        self.history = history or get_latency_history()
+
+    def plan(self, modules: List[Module], section_lengths: List[int], workers: int,
+             priorities: Optional[Dict[str, int]] = None) -> ScheduleReport:
+        """
+        制定分派顺序并预测总耗时
+
+        单线程时保持文档顺序（顺序不影响总耗时）；并发时按优先级、预计耗时从大到小排序
+
+        Args:
+            modules: 模块列表
+            section_lengths: 每个模块的章节长度，与modules一一对应
+            workers: 并发数
+            priorities: 可选的模块优先级（模块ID -> 优先级）
+
+        Returns:
+            ScheduleReport，entries为分派顺序
+        """
+        priorities = priorities or {}
+        entries = [
+            ScheduledModule(
+                index=idx,
+                module=module,
+                priority=priorities.get(module.id, 0),
+                section_length=length,
+                predicted_seconds=self.history.estimate(module.type, length)
+            )
+            for idx, (module, length) in enumerate(zip(modules, section_lengths))
+        ]
+
+        if workers > 1:
+            entries.sort(key=lambda entry: (-entry.priority, -entry.predicted_seconds, entry.index))
+
+        return ScheduleReport(
+            workers=workers,
+            predicted_makespan=self._simulate_makespan(entries, workers),
+            entries=entries
+        )
+
+    def record(self, entry: ScheduledModule):
+        """记录模块的实际耗时，用于后续估算"""
+        self.history.record(entry.module.type, entry.section_length, entry.actual_seconds)
+
+    @staticmethod
+    def _simulate_makespan(entries: List[ScheduledModule], workers: int) -> float:
+        """
+        按分派顺序模拟：每个条目交给最早空闲的线程
+
+        Args:
+            entries: 按分派顺序排列的条目
+            workers: 并发数
+
+        Returns:
+            预测的总耗时（秒）
+        """
+        finish_times = [0.0] * max(1, workers)
+        for entry in entries:
+            earliest = heapq.heappop(finish_times)
+            heapq.heappush(finish_times, earliest + entry.predicted_seconds)
+        return max(finish_times)
+
+
+# 进程级共享的历史耗时
+_latency_history = None
+
+
+def get_latency_history() -> LatencyHistory:
+    """获取进程级共享的历史耗时记录"""
+    global _latency_history
+    if _latency_history is None:
+        _latency_history = LatencyHistory()
+    return _latency_history
@@ -6,14 +6,17 @@
 """
 
 import streamlit as st
-from typing import List
-from module import Module
+from typing import Dict, List, Set
+from module import Module, collect_subtree_ids, make_module_id
 from session_state_utils import SessionStateManager
 
 
 class ModuleSelector:
     """模块选择器类"""
     
+    # 每页显示的条目数（树模式按顶级模块计，搜索模式按匹配模块计）
+    PAGE_SIZE = 20
+    
     def __init__(self):
         """初始化选择器"""
         self._init_session_state()
@@ -63,39 +66,26 @@ class ModuleSelector:
             # 获取当前建议选项状态
             categories = SessionStateManager.get_suggested_categories()
             
-            # 使用两列布局优化模块显示
-            col1, col2 = st.columns(2)
+            module_map = {module.id: module for module in modules}
             
-            for idx, module in enumerate(filtered_modules):
-                # 为每个模块创建唯一的key
-                checkbox_key = f"module_checkbox_{module.id}"
-                
-                # 检查模块是否被选中
-                is_selected = module.id in selected_ids
-                
-                # 交替放置在两列中
-                target_col = col1 if idx % 2 == 0 else col2
-                
-                with target_col:
-                    # 构建显示文本
-                    label_text = f"**{module.name}**"
-                    help_text = module.description if module.description else None
-                    
-                    # 使用checkbox
-                    checked = st.checkbox(
-                        label=label_text,
-                        value=is_selected,
-                        key=checkbox_key,
-                        help=help_text
-                    )
-                    
-                    # 实时更新选中状态
-                    if checked and module.id not in selected_ids:
-                        selected_ids.add(module.id)
-                        SessionStateManager.set_selected_module_ids(selected_ids)
-                    elif not checked and module.id in selected_ids:
-                        selected_ids.discard(module.id)
-                        SessionStateManager.set_selected_module_ids(selected_ids)
+            # 批量操作作用于全部模块，不受分页和搜索影响
+            col_all, col_none = st.columns(2)
+            with col_all:
+                st.button("☑️ 全选", key="module_select_all", use_container_width=True,
+                          on_click=self._on_select_all, args=(True,))
+            with col_none:
+                st.button("⬜ 全不选", key="module_select_none", use_container_width=True,
+                          on_click=self._on_select_all, args=(False,))
+            
+            if search_keyword:
+                # 搜索时平铺显示匹配的模块
+                for module in self._render_pagination(filtered_modules):
+                    self._render_module_row(module, module_map, selected_ids, depth=0, expandable=False)
+            else:
+                # 按标题层级渲染模块树，只有展开的节点才渲染子模块控件
+                st.caption("💡 勾选父模块会同时选中其所有子模块，点击 ▸ 展开子模块")
+                roots = [module for module in modules if module.parent_id not in module_map]
+                self._render_module_tree(self._render_pagination(roots), module_map, selected_ids)
             
             # 添加自定义模块功能
             st.divider()
@@ -172,6 +162,154 @@ class ModuleSelector:
     
 
     
+    def _render_pagination(self, items: List[Module]) -> List[Module]:
+        """
+        渲染分页控件并返回当前页的条目
+        
+        只有当前页的模块会创建复选框，其余页面不产生任何控件
+        
+        Args:
+            items: 需要分页的模块列表
+            
+        Returns:
+            当前页的模块列表
+        """
+        total_pages = max(1, (len(items) + self.PAGE_SIZE - 1) // self.PAGE_SIZE)
+        if total_pages == 1:
+            return items
+        
+        # 搜索或重新识别后总页数可能变少，先把页码收回有效范围
+        page_key = SessionStateManager.KEY_MODULE_PAGE
+        if st.session_state.get(page_key, 1) > total_pages:
+            st.session_state[page_key] = 1
+        
+        page = st.number_input(
+            f"页码（共 {total_pages} 页，{len(items)} 项）",
+            min_value=1,
+            max_value=total_pages,
+            step=1,
+            key=page_key
+        )
+        
+        start = (int(page) - 1) * self.PAGE_SIZE
+        return items[start:start + self.PAGE_SIZE]
+    
+    def _on_select_all(self, selected: bool):
+        """
+        全选/全不选回调
+        
+        Args:
+            selected: True为全选，False为全不选
+        """
+        if selected:
+            SessionStateManager.select_all_modules()
+        else:
+            SessionStateManager.deselect_all_modules()
+        
+        # 清除所有复选框的旧状态，下次渲染按selected_ids显示
+        for module in SessionStateManager.get_modules():
+            st.session_state.pop(f"module_checkbox_{module.id}", None)
+    
+    def _render_module_tree(self, roots: List[Module], module_map: Dict[str, Module], selected_ids: Set[str]) -> None:
+        """
+        渲染模块树
+        
+        折叠节点的子树不创建任何控件，大文档只渲染顶级模块和用户展开的部分
+        
+        Args:
+            roots: 顶级模块列表
+            module_map: 模块ID到Module的映射
+            selected_ids: 当前选中的模块ID集合
+        """
+        expanded_ids = SessionStateManager.get_expanded_module_ids()
+        stack = [(module, 0) for module in reversed(roots)]
+        
+        while stack:
+            module, depth = stack.pop()
+            self._render_module_row(module, module_map, selected_ids, depth, expandable=True)
+            
+            if module.child_ids and module.id in expanded_ids:
+                children = [module_map[child_id] for child_id in module.child_ids if child_id in module_map]
+                stack.extend((child, depth + 1) for child in reversed(children))
+    
+    def _render_module_row(self, module: Module, module_map: Dict[str, Module], selected_ids: Set[str],
+                           depth: int, expandable: bool) -> None:
+        """
+        渲染单个模块行（展开按钮 + 复选框）
+        
+        Args:
+            module: 模块
+            module_map: 模块ID到Module的映射
+            selected_ids: 当前选中的模块ID集合
+            depth: 树中的深度（用于缩进）
+            expandable: 是否显示展开/折叠按钮
+        """
+        has_children = expandable and bool(module.child_ids)
+        spacer_col, toggle_col, box_col = st.columns([0.01 + 0.6 * depth, 0.6, 12])
+        
+        with toggle_col:
+            if has_children:
+                is_expanded = module.id in SessionStateManager.get_expanded_module_ids()
+                st.button(
+                    "▾" if is_expanded else "▸",
+                    key=f"module_expand_{module.id}",
+                    on_click=self._on_expand_toggle,
+                    args=(module.id,),
+                    help="折叠子模块" if is_expanded else "展开子模块"
+                )
+        
+        with box_col:
+            label_text = f"**{module.name}**"
+            if has_children:
+                subtree_ids = collect_subtree_ids(module.id, module_map)
+                selected_count = sum(1 for module_id in subtree_ids if module_id in selected_ids)
+                label_text += f"（{selected_count}/{len(subtree_ids)}）"
+            
+            st.checkbox(
+                label=label_text,
+                value=module.id in selected_ids,
+                key=f"module_checkbox_{module.id}",
+                on_change=self._on_module_toggle,
+                args=(module.id,),
+                help=module.description if module.description else None
+            )
+    
+    def _on_module_toggle(self, module_id: str):
+        """
+        模块复选框切换回调，选中/取消父模块时同步整个子树
+        
+        Args:
+            module_id: 模块ID
+        """
+        checked = st.session_state.get(f"module_checkbox_{module_id}", False)
+        module_map = {module.id: module for module in SessionStateManager.get_modules()}
+        subtree_ids = collect_subtree_ids(module_id, module_map)
+        
+        selected_ids = SessionStateManager.get_selected_module_ids()
+        if checked:
+            selected_ids.update(subtree_ids)
+        else:
+            selected_ids.difference_update(subtree_ids)
+        SessionStateManager.set_selected_module_ids(selected_ids)
+        
+        # 子模块复选框的旧状态会覆盖value参数，清除后下次渲染按selected_ids显示
+        for child_id in subtree_ids[1:]:
+            st.session_state.pop(f"module_checkbox_{child_id}", None)
+    
+    def _on_expand_toggle(self, module_id: str):
+        """
+        展开/折叠按钮回调
+        
+        Args:
+            module_id: 模块ID
+        """
+        expanded_ids = SessionStateManager.get_expanded_module_ids()
+        if module_id in expanded_ids:
+            expanded_ids.discard(module_id)
+        else:
+            expanded_ids.add(module_id)
+        SessionStateManager.set_expanded_module_ids(expanded_ids)
+    
     def _render_search_box(self) -> str:
         """
         渲染搜索框
@@ -239,16 +377,14 @@ class ModuleSelector:
                 st.warning(f"⚠️ 模块 '{module_name}' 已存在")
                 return
         
-        # 创建自定义模块
-        import uuid
+        # 创建自定义模块（ID由名称决定，重新添加同名模块得到相同ID）
         custom_module = Module(
-            id=f"custom_{uuid.uuid4().hex[:8]}",
+            id=f"custom_{make_module_id('custom', [module_name])}",
             name=module_name,
             description="用户自定义模块",
             type="自定义",
             level=2,
-            selected=True,  # 默认选中
-            is_custom=True
+            selected=True  # 默认选中
         )
         
         # 添加到模块列表
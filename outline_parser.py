@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文档大纲解析器
+一次线性扫描得到Markdown标题树（层级、标题、父节点、起止偏移、章节哈希）
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Union
+
+
+# 标题行或代码块围栏（代码块内的 # 不是标题）
+_STR_LINE_PATTERN = re.compile(r'^[ \t]*(?:(```|~~~)|(#{1,6})[ \t]+(.+?)[ \t]*\r?$)', re.MULTILINE)
+_BYTES_LINE_PATTERN = re.compile(rb'^[ \t]*(?:(```|~~~)|(#{1,6})[ \t]+(.+?)[ \t]*\r?$)', re.MULTILINE)
+
+
+@dataclass
+class OutlineNode:
+    """大纲节点 - 一个标题及其章节范围"""
+    node_id: int               # 节点序号（按文档顺序从0开始）
+    level: int                 # 标题层级（1-6）
+    title: str                 # 标题文本
+    parent: Optional[int]      # 父节点序号，顶级节点为None
+    start: int                 # 标题行的起始偏移
+    end: int                   # 章节结束偏移（不含），即下一个同级或更高级标题的位置
+    section_hash: str = ''     # 章节内容（含子章节）的哈希，用于判断章节是否变化
+    children: List[int] = field(default_factory=list)  # 子节点序号
+
+    def to_dict(self) -> Dict:
+        """
+        转换为字典
+
+        Returns:
+            包含所有字段的字典
+        """
+        return {
+            'node_id': self.node_id,
+            'level': self.level,
+            'title': self.title,
+            'parent': self.parent,
+            'start': self.start,
+            'end': self.end,
+            'section_hash': self.section_hash,
+            'children': list(self.children)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'OutlineNode':
+        """
+        从字典创建OutlineNode实例
+
+        Args:
+            data: 包含节点数据的字典
+
+        Returns:
+            OutlineNode实例
+        """
+        return cls(
+            node_id=data['node_id'],
+            level=data['level'],
+            title=data['title'],
+            parent=data.get('parent'),
+            start=data['start'],
+            end=data['end'],
+            section_hash=data.get('section_hash', ''),
+            children=list(data.get('children', []))
+        )
+
+
+class Outline:
+    """文档大纲 - 标题树及其索引"""
+
+    def __init__(self, nodes: List[OutlineNode]):
+        """
+        初始化大纲
+
+        Args:
+            nodes: 按文档顺序排列的节点列表
+        """
+        self.nodes = nodes
+        # 标题 -> 第一个同名节点，同名章节通过 path 区分
+        self._by_title = {}
+        for node in nodes:
+            self._by_title.setdefault(node.title, node)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def get(self, node_id: int) -> OutlineNode:
+        """按序号获取节点"""
+        return self.nodes[node_id]
+
+    def find(self, title: str) -> Optional[OutlineNode]:
+        """按标题查找节点（同名时返回第一个）"""
+        return self._by_title.get(title)
+
+    def roots(self) -> List[OutlineNode]:
+        """获取顶级节点"""
+        return [node for node in self.nodes if node.parent is None]
+
+    def children(self, node: OutlineNode) -> List[OutlineNode]:
+        """获取子节点"""
+        return [self.nodes[child_id] for child_id in node.children]
+
+    def path(self, node: OutlineNode) -> List[str]:
+        """
+        获取从顶级节点到该节点的标题路径
+
+        Args:
+            node: 大纲节点
+
+        Returns:
+            标题列表
+        """
+        titles = []
+        current = node
+        while current is not None:
+            titles.append(current.title)
+            current = self.nodes[current.parent] if current.parent is not None else None
+        return list(reversed(titles))
+
+    def section_text(self, content: str, node: OutlineNode) -> str:
+        """
+        获取节点对应的章节文本（含子章节）
+
+        Args:
+            content: 解析大纲时使用的文档内容
+            node: 大纲节点
+
+        Returns:
+            章节文本
+        """
+        return content[node.start:node.end]
+
+    def to_list(self) -> List[Dict]:
+        """转换为字典列表（用于存入Session State）"""
+        return [node.to_dict() for node in self.nodes]
+
+    @classmethod
+    def from_list(cls, data: List[Dict]) -> 'Outline':
+        """从字典列表恢复大纲"""
+        return cls([OutlineNode.from_dict(item) for item in data])
+
+
+def parse_outline(content: Union[str, bytes]) -> Outline:
+    """
+    解析文档大纲
+
+    只扫描一遍文档：用栈维护当前打开的章节，遇到同级或更高级标题时关闭栈顶章节。
+    偏移量的单位与输入一致：str按字符，bytes（或mmap）按字节
+
+    Args:
+        content: 文档内容，可以是str、bytes或mmap
+
+    Returns:
+        Outline
+    """
+    is_text = isinstance(content, str)
+    pattern = _STR_LINE_PATTERN if is_text else _BYTES_LINE_PATTERN
+    total_length = len(content)
+
+    nodes = []
+    open_stack = []
+    in_code_block = False
+
+    def close(node: OutlineNode, end: int):
+        node.end = end
+        section = content[node.start:end]
+        node.section_hash = hashlib.sha256(
+            section.encode('utf-8') if is_text else section
+        ).hexdigest()[:16]
+
+    for match in pattern.finditer(content):
+        if match.group(1):
+            in_code_block = not in_code_block
+            continue
+        if in_code_block:
+            continue
+
+        level = len(match.group(2))
+        title = match.group(3) if is_text else match.group(3).decode('utf-8', errors='ignore')
+
+        # 关闭所有同级或更低级的章节
+        while open_stack and open_stack[-1].level >= level:
+            close(open_stack.pop(), match.start())
+
+        parent = open_stack[-1] if open_stack else None
+        node = OutlineNode(
+            node_id=len(nodes),
+            level=level,
+            title=title.strip(),
+            parent=parent.node_id if parent else None,
+            start=match.start(),
+            end=total_length
+        )
+        if parent:
+            parent.children.append(node.node_id)
+
+        nodes.append(node)
+        open_stack.append(node)
+
+    # 文档结束时关闭剩余章节
+    while open_stack:
+        close(open_stack.pop(), total_length)
+
+    return Outline(nodes)
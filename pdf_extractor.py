@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF文本提取器
+按页码区间并行提取PDF文本，支持页数限制、提前停止和逐页耗时统计
+"""
+
+import io
+import multiprocessing
+import os
+import tempfile
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
+
+
+@dataclass
+class PDFExtractionResult:
+    """PDF提取结果"""
+    text: str                          # 提取出的文本
+    page_count: int                    # PDF总页数
+    pages_extracted: int               # 实际提取的页数
+    page_timings: List[float] = field(default_factory=list)  # 逐页提取耗时（秒），按页码顺序
+    stopped_early: bool = False        # 是否因达到字符上限提前停止
+
+    @property
+    def total_seconds(self) -> float:
+        """所有页面提取耗时之和（秒）"""
+        return sum(self.page_timings)
+
+    @property
+    def slowest_page(self) -> Optional[int]:
+        """耗时最长的页码（从1开始）"""
+        if not self.page_timings:
+            return None
+        return self.page_timings.index(max(self.page_timings)) + 1
+
+
+def _open_pdf(source: Union[str, bytes]):
+    """打开PDF，source可以是文件路径或二进制内容"""
+    import pdfplumber
+    if isinstance(source, (bytes, bytearray)):
+        return pdfplumber.open(io.BytesIO(source))
+    return pdfplumber.open(source)
+
+
+def _count_pages(source: Union[str, bytes]) -> int:
+    """
+    读取PDF总页数
+
+    打开PDF需要解析文档结构，异常或超大的文件可能很慢或占用大量内存，因此同样在工作进程中执行
+
+    Args:
+        source: PDF文件路径或二进制内容
+
+    Returns:
+        总页数
+    """
+    with _open_pdf(source) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_page_range(source: Union[str, bytes], start: int, end: int) -> List[Tuple[str, float]]:
+    """
+    提取 [start, end) 区间内每一页的文本
+
+    该函数运行在工作进程中，因此只接收可序列化的参数
+
+    Args:
+        source: PDF文件路径或二进制内容
+        start: 起始页索引（从0开始）
+        end: 结束页索引（不含）
+
+    Returns:
+        (页面文本, 耗时秒数) 列表
+    """
+    pages = []
+    with _open_pdf(source) as pdf:
+        for page_index in range(start, end):
+            started_at = time.perf_counter()
+            page = pdf.pages[page_index]
+            page_text = page.extract_text() or ''
+            # 释放页面对象缓存，避免大文档内存持续增长
+            page.close()
+            pages.append((page_text, time.perf_counter() - started_at))
+    return pages
+
+
+class PDFExtractor:
+    """PDF文本提取器 - 按页码区间并行提取"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        pages_per_chunk: int = 8,
+        min_pages_for_parallel: int = 16,
+        timeout: float = 120,
+        memory_limit_mb: int = 2048,
+        in_process: bool = False
+    ):
+        """
+        初始化提取器
+
+        Args:
+            max_workers: 最大工作进程数，默认使用CPU核数
+            pages_per_chunk: 每个任务处理的页数
+            min_pages_for_parallel: 页数少于该值时不再分区间，整个文档在一个工作进程中提取
+            timeout: 整个文档的提取超时时间（秒）
+            memory_limit_mb: 单个工作进程的内存上限（MB）
+            in_process: 在当前进程中顺序提取，用于已经运行在工作进程中的调用（工作进程不能再创建子进程）
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_chunk = max(1, pages_per_chunk)
+        self.min_pages_for_parallel = min_pages_for_parallel
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.in_process = in_process
+
+    def extract(
+        self,
+        source: Union[str, bytes],
+        page_limit: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ) -> PDFExtractionResult:
+        """
+        提取PDF文本
+
+        Args:
+            source: PDF文件路径或二进制内容
+            page_limit: 最多提取的页数，为None时提取全部页面
+            max_chars: 累计字符数达到该值后停止提取，为None时不限制
+
+        Returns:
+            PDFExtractionResult
+        """
+        if self.in_process:
+            pages = self._extract_sequential(source, page_limit)
+        else:
+            # 读取页数和提取页面都在工作进程中进行，受超时和内存上限约束
+            pages = self._extract_in_pool(source, page_limit)
+
+        # 按页码顺序拼接，一次join避免字符串反复拷贝
+        text_parts = []
+        page_timings = []
+        char_count = 0
+        stopped_early = False
+
+        try:
+            # 生成器先返回页数，之后逐页返回文本
+            page_count, total_pages = next(pages)
+            for page_text, seconds in pages:
+                page_timings.append(seconds)
+                if page_text:
+                    text_parts.append(page_text)
+                    text_parts.append('\n')
+                    char_count += len(page_text) + 1
+                if max_chars and char_count >= max_chars:
+                    stopped_early = len(page_timings) < total_pages
+                    break
+        finally:
+            # 提前停止时关闭生成器，释放进程池和临时文件
+            pages.close()
+
+        result = PDFExtractionResult(
+            text=''.join(text_parts),
+            page_count=page_count,
+            pages_extracted=len(page_timings),
+            page_timings=page_timings,
+            stopped_early=stopped_early
+        )
+
+        if result.page_timings:
+            print(f"PDF提取完成：{result.pages_extracted}/{page_count} 页，"
+                  f"累计耗时 {result.total_seconds:.2f}s，"
+                  f"最慢第 {result.slowest_page} 页 {max(result.page_timings):.2f}s")
+        return result
+
+    def _extract_sequential(self, source: Union[str, bytes], page_limit: Optional[int]):
+        """
+        在当前进程中逐页提取
+
+        Yields:
+            先返回 (总页数, 需要提取的页数)，之后逐页返回 (页面文本, 耗时秒数)
+        """
+        with _open_pdf(source) as pdf:
+            page_count = len(pdf.pages)
+            total_pages = min(page_count, page_limit) if page_limit else page_count
+            yield page_count, total_pages
+
+            for page_index in range(total_pages):
+                started_at = time.perf_counter()
+                page = pdf.pages[page_index]
+                page_text = page.extract_text() or ''
+                page.close()
+                yield page_text, time.perf_counter() - started_at
+
+    def _extract_in_pool(self, source: Union[str, bytes], page_limit: Optional[int]):
+        """
+        在进程池中读取页数并按页码区间并行提取，按页码顺序返回
+
+        页数少于 min_pages_for_parallel 时整个文档作为一个区间，在读取页数的工作进程中提取；
+        读取页数和提取页面分别计算超时
+
+        Args:
+            source: PDF文件路径或二进制内容
+            page_limit: 最多提取的页数
+
+        Yields:
+            先返回 (总页数, 需要提取的页数)，之后逐页返回 (页面文本, 耗时秒数)
+        """
+        from document_parser import WorkerPool
+
+        # 二进制内容先落盘，工作进程按路径打开，避免每个任务都序列化整个PDF
+        tmp_path = None
+        if isinstance(source, (bytes, bytearray)):
+            fd, tmp_path = tempfile.mkstemp(suffix='.pdf')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(source)
+            source = tmp_path
+
+        try:
+            # 每次提取使用自己的进程池，提前停止或超时时结束进程池只影响本次提取；
+            # 先用一个工作进程读取页数，小文档继续在这个进程中提取，大文档再按区间并行
+            with ExitStack() as stack:
+                pool = stack.enter_context(WorkerPool(1, self.memory_limit_mb))
+                try:
+                    page_count = pool.get(pool.submit(_count_pages, (source,)), self.timeout)
+                except multiprocessing.TimeoutError:
+                    raise TimeoutError(f"PDF读取页数超时（超过{self.timeout:g}秒）")
+
+                total_pages = min(page_count, page_limit) if page_limit else page_count
+                yield page_count, total_pages
+
+                pages_per_chunk = max(1, total_pages)
+                if total_pages >= self.min_pages_for_parallel and self.max_workers > 1:
+                    pages_per_chunk = self.pages_per_chunk
+                    chunk_count = (total_pages + pages_per_chunk - 1) // pages_per_chunk
+                    pool = stack.enter_context(WorkerPool(min(self.max_workers, chunk_count), self.memory_limit_mb))
+
+                task_indexes = [
+                    pool.submit(_extract_page_range, (source, start, min(start + pages_per_chunk, total_pages)))
+                    for start in range(0, total_pages, pages_per_chunk)
+                ]
+
+                for task_index in task_indexes:
+                    try:
+                        # 整个文档的提取共用一个超时，从第一个区间开始提取时计算
+                        pages = pool.get(task_index, self.timeout, start_index=task_indexes[0])
+                    except multiprocessing.TimeoutError:
+                        raise TimeoutError(f"PDF提取超时（超过{self.timeout:g}秒）")
+
+                    yield from pages
+        finally:
+            if tmp_path:
+                os.remove(tmp_path)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模块识别结果缓存
+按（文档内容哈希、文件类型、识别模式、AI提供商、模型）缓存识别出的模块，
+重复识别同一份文档时直接返回，AI模式下也不会重复调用接口
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from module import Module
+
+
+class RecognitionCache:
+    """模块识别结果缓存 - 进程内LRU"""
+
+    def __init__(self, max_entries: int = 64):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最多保留的识别结果数
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Streamlit的多个会话运行在同一进程的不同线程中
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content: str, file_type: str, mode: str,
+                 provider: Optional[str] = None, model: Optional[str] = None, version: int = 0) -> str:
+        """
+        生成缓存键
+
+        Args:
+            content: 文档内容
+            file_type: 文件类型
+            mode: 识别模式（如 rule、ai、hybrid）
+            provider: AI提供商，规则模式为None
+            model: AI模型，规则模式为None
+            version: 识别逻辑版本号，识别规则变化时递增使旧结果失效
+
+        Returns:
+            缓存键字符串
+        """
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return f"v{version}|{content_hash}|{file_type}|{mode}|{provider or '-'}|{model or '-'}"
+
+    def get(self, key: str) -> Optional[List[Module]]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            模块列表（每次返回新的Module实例），未命中时返回None
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            modules_dict = self._entries[key]
+
+        return [Module.from_dict(data) for data in modules_dict]
+
+    def put(self, key: str, modules: List[Module]):
+        """
+        写入缓存，超出容量时淘汰最久未使用的条目
+
+        Args:
+            key: 缓存键
+            modules: 模块列表
+        """
+        modules_dict = [module.to_dict() for module in modules]
+
+        with self._lock:
+            self._entries[key] = modules_dict
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """获取缓存状态"""
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries}
+
+
+# 进程级共享缓存
+_recognition_cache = None
+
+
+def get_recognition_cache() -> RecognitionCache:
+    """获取进程级共享的识别结果缓存"""
+    global _recognition_cache
+    if _recognition_cache is None:
+        _recognition_cache = RecognitionCache()
+    return _recognition_cache
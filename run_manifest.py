@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+生成记录清单
+output/manifest.json 记录每个文档最近一次完成的生成（记录ID、用例数、模块列表），
+每次生成完成时更新。新会话恢复数据只需读取这个小文件，用例在需要时再从用例存储加载
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+
+MANIFEST_VERSION = 1
+
+
+class RunManifest:
+    """生成记录清单"""
+
+    def __init__(self, path: Optional[str] = None, max_documents: int = 200):
+        """
+        初始化清单
+
+        Args:
+            path: 清单文件路径，默认使用环境变量 RUN_MANIFEST_FILE 或 output/manifest.json
+            max_documents: 最多保留的文档数，超出时丢弃最早的记录
+        """
+        self.path = path or os.getenv('RUN_MANIFEST_FILE') or os.path.join('output', 'manifest.json')
+        self.max_documents = max_documents
+        # Streamlit的多个会话运行在同一进程的不同线程中
+        self._lock = threading.Lock()
+
+    def record_run(self, run: Dict, module_counts: Dict[str, int]):
+        """
+        记录一次完成的生成
+
+        Args:
+            run: 生成记录（CaseStore.get_run 的返回值）
+            module_counts: 页面/模块 -> 用例数
+        """
+        entry = {
+            'run_id': run['run_id'],
+            'document_name': run['document_name'],
+            'case_type': run['case_type'],
+            'csv_path': run['csv_path'],
+            'case_count': run['case_count'],
+            'modules': [{'name': name, 'case_count': count} for name, count in module_counts.items()],
+            'updated_at': run.get('updated_at') or time.time()
+        }
+
+        with self._lock:
+            data = self._read()
+            documents = data['documents']
+            documents.pop(entry['document_name'], None)
+            documents[entry['document_name']] = entry
+            # 按写入顺序保存，最早的文档在前
+            while len(documents) > self.max_documents:
+                documents.pop(next(iter(documents)))
+            data['latest'] = entry['document_name']
+            self._write(data)
+
+    def latest(self, max_age_seconds: Optional[float] = None,
+               document_name: Optional[str] = None) -> Optional[Dict]:
+        """
+        获取最近一次完成的生成
+
+        Args:
+            max_age_seconds: 只返回这段时间内完成的记录，为None时不限制
+            document_name: 指定文档，为None时返回所有文档中最近的一次
+
+        Returns:
+            清单条目，没有时返回None
+        """
+        with self._lock:
+            data = self._read()
+
+        entry = data['documents'].get(document_name or data.get('latest') or '')
+        if not entry:
+            return None
+        if max_age_seconds is not None and time.time() - entry['updated_at'] > max_age_seconds:
+            return None
+        return entry
+
+    def _read(self) -> Dict:
+        """读取清单文件，不存在或损坏时返回空清单"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                return data
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"❌ 错误: 无法读取生成记录清单 {self.path}: {e}")
+        return {'version': MANIFEST_VERSION, 'latest': None, 'documents': {}}
+
+    def _write(self, data: Dict):
+        """先写临时文件再原子替换，读取方不会看到写了一半的清单"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.manifest-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+# 进程级共享清单
+_run_manifest = None
+
+
+def get_run_manifest() -> RunManifest:
+    """获取进程级共享的生成记录清单"""
+    global _run_manifest
+    if _run_manifest is None:
+        _run_manifest = RunManifest()
+    return _run_manifest
@@ -5,9 +5,13 @@ Session State工具类
 封装Streamlit Session State的初始化和管理逻辑
 """
 
+import uuid
 import streamlit as st
-from typing import List, Dict, Set, Any
+from typing import List, Dict, Set, Any, Optional, Union
 from module import Module
+from document_store import DocumentHandle, DocumentStore
+from export_cache import ExportCache
+from case_store import get_case_store
 
 
 class SessionStateManager:
@@ -17,14 +21,26 @@ class SessionStateManager:
     KEY_UPLOADED_CONTENT = 'uploaded_content'
     KEY_UPLOADED_FILENAME = 'uploaded_filename'
     KEY_FILE_TYPE = 'file_type'
+    KEY_UPLOADED_FILES_KEY = 'uploaded_files_key'
+    KEY_DOCUMENT_HANDLE = 'document_handle'
+    KEY_SECTION_COUNT = 'section_count'
     KEY_MODULES_RECOGNIZED = 'modules_recognized'
     KEY_MODULES = 'modules'
     KEY_MODULE_COUNT = 'module_count'
+    KEY_RECOGNITION_SOURCE = 'recognition_source'
     KEY_SELECTED_MODULE_IDS = 'selected_module_ids'
+    KEY_EXPANDED_MODULE_IDS = 'expanded_module_ids'
+    KEY_MODULE_PAGE = 'module_page'
     KEY_SELECT_ALL = 'select_all'
     KEY_SUGGESTED_CATEGORIES = 'suggested_categories'
     KEY_GENERATED_FILE = 'generated_file'
+    KEY_RUN_ID = 'run_id'
     KEY_ALL_CASES = 'all_cases'
+    KEY_CASE_COUNT = 'case_count'
+    KEY_CASES_FINGERPRINT = 'cases_fingerprint'
+    KEY_VERIFICATION_VERSION = 'verification_status_version'
+    KEY_VERIFICATION_PAGE = 'verification_page'
+    KEY_VERIFICATION_PAGE_SIZE = 'verification_page_size'
     KEY_DATA_CLEARED = 'data_cleared'
     KEY_AI_API_KEY = 'ai_api_key'
     KEY_AI_PROVIDER = 'ai_provider'
@@ -59,6 +75,9 @@ class SessionStateManager:
         if SessionStateManager.KEY_SELECTED_MODULE_IDS not in st.session_state:
             st.session_state[SessionStateManager.KEY_SELECTED_MODULE_IDS] = set()
         
+        if SessionStateManager.KEY_EXPANDED_MODULE_IDS not in st.session_state:
+            st.session_state[SessionStateManager.KEY_EXPANDED_MODULE_IDS] = set()
+        
         if SessionStateManager.KEY_SELECT_ALL not in st.session_state:
             st.session_state[SessionStateManager.KEY_SELECT_ALL] = True
         
@@ -96,9 +115,63 @@ class SessionStateManager:
         st.session_state[SessionStateManager.KEY_UPLOADED_FILENAME] = filename
         st.session_state[SessionStateManager.KEY_FILE_TYPE] = file_type
     
+    @staticmethod
+    def set_uploaded_handle(handle: DocumentHandle, section_count: int):
+        """
+        设置上传的文档句柄（文档内容保存在磁盘上）
+        
+        Args:
+            handle: 文档句柄
+            section_count: 章节标题数
+        """
+        st.session_state[SessionStateManager.KEY_DOCUMENT_HANDLE] = handle.to_dict()
+        st.session_state[SessionStateManager.KEY_SECTION_COUNT] = section_count
+        # 不再在会话中保存完整内容
+        st.session_state[SessionStateManager.KEY_UPLOADED_CONTENT] = None
+    
+    @staticmethod
+    def get_document_handle() -> Optional[DocumentHandle]:
+        """获取上传的文档句柄"""
+        handle_dict = st.session_state.get(SessionStateManager.KEY_DOCUMENT_HANDLE)
+        return DocumentHandle.from_dict(handle_dict) if handle_dict else None
+    
+    @staticmethod
+    def get_section_count() -> int:
+        """获取文档的章节标题数"""
+        return st.session_state.get(SessionStateManager.KEY_SECTION_COUNT) or 0
+    
+    @staticmethod
+    def has_uploaded_document() -> bool:
+        """检查是否有可用的已上传文档"""
+        handle = SessionStateManager.get_document_handle()
+        if handle:
+            return DocumentStore().exists(handle)
+        return bool(st.session_state.get(SessionStateManager.KEY_UPLOADED_CONTENT))
+    
+    @staticmethod
+    def get_document_source() -> Union[DocumentHandle, str, None]:
+        """
+        获取用于生成用例的文档来源
+        
+        有文档句柄时返回句柄，由调用方按模块章节读取；否则返回会话中保存的内容（兼容旧数据）
+        """
+        handle = SessionStateManager.get_document_handle()
+        if handle:
+            return handle if DocumentStore().exists(handle) else None
+        return st.session_state.get(SessionStateManager.KEY_UPLOADED_CONTENT)
+    
     @staticmethod
     def get_uploaded_content() -> str:
-        """获取上传的文档内容"""
+        """
+        读取完整的上传文档
+        
+        有文档句柄时每次调用都会从磁盘读取整个文档，只在确实需要全文时使用（如模块识别）；
+        按模块读取章节请使用 get_document_source；没有句柄时返回会话中保存的内容（兼容旧数据）
+        """
+        handle = SessionStateManager.get_document_handle()
+        if handle:
+            store = DocumentStore()
+            return store.read_text(handle) if store.exists(handle) else None
         return st.session_state.get(SessionStateManager.KEY_UPLOADED_CONTENT)
     
     @staticmethod
@@ -155,6 +228,75 @@ class SessionStateManager:
         """获取选中的模块ID集合"""
         return st.session_state.get(SessionStateManager.KEY_SELECTED_MODULE_IDS, set())
     
+    @staticmethod
+    def set_expanded_module_ids(module_ids: Set[str]):
+        """
+        设置模块树中已展开的模块ID集合
+        
+        Args:
+            module_ids: 模块ID集合
+        """
+        st.session_state[SessionStateManager.KEY_EXPANDED_MODULE_IDS] = module_ids
+    
+    @staticmethod
+    def get_expanded_module_ids() -> Set[str]:
+        """获取模块树中已展开的模块ID集合"""
+        return st.session_state.get(SessionStateManager.KEY_EXPANDED_MODULE_IDS, set())
+    
+    @staticmethod
+    def get_cases_fingerprint() -> str:
+        """
+        获取当前用例列表的指纹
+
+        有生成记录时，记录完成后用例不再变化，使用记录ID和用例数作为指纹，不需要加载用例；
+        否则指纹与计算时的用例列表对象一起保存，用例列表被替换后才重新计算
+
+        Returns:
+            指纹字符串
+        """
+        run_id = st.session_state.get(SessionStateManager.KEY_RUN_ID)
+        if run_id:
+            return f"run:{run_id}:{SessionStateManager.get_case_count()}"
+
+        cases = st.session_state.get(SessionStateManager.KEY_ALL_CASES) or []
+        cached = st.session_state.get(SessionStateManager.KEY_CASES_FINGERPRINT)
+        if cached and cached[0] is cases:
+            return cached[1]
+
+        fingerprint = ExportCache.make_fingerprint(cases)
+        st.session_state[SessionStateManager.KEY_CASES_FINGERPRINT] = (cases, fingerprint)
+        return fingerprint
+    
+    @staticmethod
+    def bump_verification_version():
+        """检验状态变化后更新版本号，使包含检验状态的导出缓存失效"""
+        # 导出缓存由所有会话共享，使用随机值而不是递增计数，不同会话的版本号不会相同
+        st.session_state[SessionStateManager.KEY_VERIFICATION_VERSION] = uuid.uuid4().hex
+    
+    @staticmethod
+    def get_verification_fingerprint(cases: Optional[List[Dict]] = None) -> str:
+        """
+        获取用例及其检验状态的指纹，用作检验结果导出的缓存键
+
+        有生成记录时使用用例指纹和检验状态版本号，不需要遍历用例；
+        否则按cases及当前检验状态逐条计算
+
+        Args:
+            cases: 导出的用例列表（导出范围由缓存的导出类型区分，如模块名），为None时使用全部用例
+
+        Returns:
+            指纹字符串
+        """
+        if st.session_state.get(SessionStateManager.KEY_RUN_ID):
+            if SessionStateManager.KEY_VERIFICATION_VERSION not in st.session_state:
+                SessionStateManager.bump_verification_version()
+            version = st.session_state[SessionStateManager.KEY_VERIFICATION_VERSION]
+            return f"{SessionStateManager.get_cases_fingerprint()}:status:{version}"
+
+        if cases is None:
+            cases = SessionStateManager.get_all_cases()
+        return ExportCache.make_fingerprint(cases, st.session_state.get('verification_status', {}))
+    
     @staticmethod
     def toggle_module_selection(module_id: str):
         """
@@ -232,8 +374,27 @@ class SessionStateManager:
     
     @staticmethod
     def get_all_cases() -> List[Dict]:
-        """获取所有生成的用例"""
-        return st.session_state.get(SessionStateManager.KEY_ALL_CASES, [])
+        """
+        获取所有生成的用例
+
+        从清单恢复的会话只记录生成记录ID，第一次调用时才从用例存储加载用例
+
+        Returns:
+            用例列表
+        """
+        if SessionStateManager.KEY_ALL_CASES not in st.session_state:
+            run_id = st.session_state.get(SessionStateManager.KEY_RUN_ID)
+            if not run_id:
+                return []
+            st.session_state[SessionStateManager.KEY_ALL_CASES] = get_case_store().load_cases(run_id)
+        return st.session_state[SessionStateManager.KEY_ALL_CASES]
+    
+    @staticmethod
+    def get_case_count() -> int:
+        """获取用例总数（用例尚未加载时使用清单中记录的数量）"""
+        if SessionStateManager.KEY_ALL_CASES in st.session_state:
+            return len(st.session_state[SessionStateManager.KEY_ALL_CASES])
+        return st.session_state.get(SessionStateManager.KEY_CASE_COUNT, 0)
     
     @staticmethod
     def clear_all_data():
@@ -242,12 +403,23 @@ class SessionStateManager:
             SessionStateManager.KEY_UPLOADED_CONTENT,
             SessionStateManager.KEY_UPLOADED_FILENAME,
             SessionStateManager.KEY_FILE_TYPE,
+            SessionStateManager.KEY_UPLOADED_FILES_KEY,
+            SessionStateManager.KEY_DOCUMENT_HANDLE,
+            SessionStateManager.KEY_SECTION_COUNT,
             SessionStateManager.KEY_MODULES_RECOGNIZED,
             SessionStateManager.KEY_MODULES,
             SessionStateManager.KEY_MODULE_COUNT,
+            SessionStateManager.KEY_RECOGNITION_SOURCE,
             SessionStateManager.KEY_SELECTED_MODULE_IDS,
+            SessionStateManager.KEY_EXPANDED_MODULE_IDS,
+            SessionStateManager.KEY_MODULE_PAGE,
             SessionStateManager.KEY_GENERATED_FILE,
-            SessionStateManager.KEY_ALL_CASES
+            SessionStateManager.KEY_RUN_ID,
+            SessionStateManager.KEY_ALL_CASES,
+            SessionStateManager.KEY_CASE_COUNT,
+            SessionStateManager.KEY_CASES_FINGERPRINT,
+            SessionStateManager.KEY_VERIFICATION_VERSION,
+            SessionStateManager.KEY_VERIFICATION_PAGE
         ]
         
         for key in keys_to_clear:
@@ -271,9 +443,17 @@ class SessionStateManager:
             SessionStateManager.KEY_MODULES_RECOGNIZED,
             SessionStateManager.KEY_MODULES,
             SessionStateManager.KEY_MODULE_COUNT,
+            SessionStateManager.KEY_RECOGNITION_SOURCE,
             SessionStateManager.KEY_SELECTED_MODULE_IDS,
+            SessionStateManager.KEY_EXPANDED_MODULE_IDS,
+            SessionStateManager.KEY_MODULE_PAGE,
             SessionStateManager.KEY_GENERATED_FILE,
-            SessionStateManager.KEY_ALL_CASES
+            SessionStateManager.KEY_RUN_ID,
+            SessionStateManager.KEY_ALL_CASES,
+            SessionStateManager.KEY_CASE_COUNT,
+            SessionStateManager.KEY_CASES_FINGERPRINT,
+            SessionStateManager.KEY_VERIFICATION_VERSION,
+            SessionStateManager.KEY_VERIFICATION_PAGE
         ]
         
         for key in keys_to_clear:
@@ -9,11 +9,21 @@ import os
 from pathlib import Path
 import pandas as pd
 import json
+import hashlib
 from ai_generator import AIGenerator
 from module_recognizer import ModuleRecognizer
+from recognition_cache import get_recognition_cache
 from module_selector import ModuleSelector
 from test_case_coordinator import TestCaseCoordinator
+from streamlit_progress import StreamlitProgressReporter
+from case_writer import StreamingCaseWriter, CATEGORIES_KEY, read_cases
+from export_cache import get_export_cache, build_verification_csv
+from case_store import get_case_store
+from run_manifest import get_run_manifest
 from session_state_utils import SessionStateManager
+from document_parser import DocumentParser, SUPPORTED_EXTENSIONS
+from document_cache import get_document_cache
+from document_store import DocumentHandle, DocumentStore
 
 # 配置页面
 st.set_page_config(
@@ -22,20 +32,31 @@ st.set_page_config(
     layout="wide"
 )
 
-# 初始化：检查是否有最近生成的文件
+# 在线检验的状态选项和表格key前缀
+VERIFICATION_STATUS_OPTIONS = ['待检验', '通过', '不通过']
+VERIFICATION_EDITOR_PREFIX = 'verification_editor:'
+
+# 在线检验每页显示的用例数
+VERIFICATION_PAGE_SIZES = [10, 20, 50, 100]
+VERIFICATION_PAGE_SIZE = int(os.getenv('VERIFICATION_PAGE_SIZE', '20'))
+if VERIFICATION_PAGE_SIZE not in VERIFICATION_PAGE_SIZES:
+    VERIFICATION_PAGE_SIZES = sorted(VERIFICATION_PAGE_SIZES + [VERIFICATION_PAGE_SIZE])
+
+# 初始化：检查是否有最近生成的结果
 def load_latest_result():
-    """加载最近生成的结果"""
-    output_dir = Path('output')
-    if output_dir.exists():
-        csv_files = list(output_dir.glob('*.csv'))
-        if csv_files:
-            # 按修改时间排序，获取最新的
-            latest_file = max(csv_files, key=lambda x: x.stat().st_mtime)
-            # 检查文件是否在最近1小时内生成
-            import time
-            if time.time() - latest_file.stat().st_mtime < 3600:  # 1小时
-                return str(latest_file)
-    return None
+    """
+    加载最近1小时内完成的生成记录
+
+    读取生成记录清单；清单中没有时（如清单文件丢失）查询用例存储并补写清单
+    """
+    manifest = get_run_manifest()
+    entry = manifest.latest(max_age_seconds=3600)
+    if entry is None:
+        run = get_case_store().latest_run(max_age_seconds=3600)
+        if run:
+            manifest.record_run(run, get_case_store().module_counts(run['run_id']))
+            entry = manifest.latest(document_name=run['document_name'])
+    return entry
 
 # 数据迁移：检查并修复旧格式的模块数据
 if 'modules' in st.session_state:
@@ -50,17 +71,13 @@ if 'modules' in st.session_state:
 
 # 页面加载时尝试恢复数据（除非用户主动清除）
 if 'generated_file' not in st.session_state and 'data_cleared' not in st.session_state:
-    latest_file = load_latest_result()
-    if latest_file:
-        st.session_state['generated_file'] = latest_file
-        # 读取CSV文件恢复数据
-        import csv
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            st.session_state['all_cases'] = list(reader)
-        # 统计模块数量
-        modules = set(case.get('页面/模块', '') for case in st.session_state['all_cases'])
-        st.session_state['module_count'] = len(modules)
+    # 只恢复生成记录的概要，用例在首次使用时从用例存储加载
+    latest_entry = load_latest_result()
+    if latest_entry:
+        st.session_state['run_id'] = latest_entry['run_id']
+        st.session_state['generated_file'] = latest_entry['csv_path']
+        st.session_state['case_count'] = latest_entry['case_count']
+        st.session_state['module_count'] = len(latest_entry['modules'])
 
 # 标题
 st.title("🎨 UI走查用例生成助手")
@@ -78,10 +95,13 @@ if 'generated_file' in st.session_state or 'modules_recognized' in st.session_st
         if st.button("🗑️ 清除数据", use_container_width=True):
             # 清除所有session state
             keys_to_clear = [
-                'generated_file', 'all_cases', 'module_count',
-                'uploaded_content', 'uploaded_filename', 'file_type',
-                'modules', 'modules_recognized', 'selected_module_ids',
-                'suggested_categories', 'select_all'
+                'generated_file', 'run_id', 'all_cases', 'case_count', 'cases_fingerprint', 'verification_status',
+                'verification_status_version', 'verification_page',
+                'module_count', 'recognition_source',
+                'uploaded_content', 'uploaded_filename', 'file_type', 'uploaded_files_key',
+                'document_handle', 'section_count',
+                'modules', 'modules_recognized', 'selected_module_ids', 'expanded_module_ids',
+                'module_page', 'suggested_categories', 'select_all'
             ]
             for key in keys_to_clear:
                 if key in st.session_state:
@@ -134,6 +154,13 @@ with st.sidebar:
             st.session_state['ai_api_key'] = api_key
             st.session_state['ai_provider'] = ai_provider
             st.success("✅ API Key已配置")
+        
+        recognition_mode_label = st.radio(
+            "模块识别方式",
+            options=["混合识别", "全文AI识别"],
+            help="混合识别：标题结构清晰的部分按规则识别，只把结构不清晰的部分交给AI，更快且更省Token；全文AI识别：整篇文档交给AI识别"
+        )
+        st.session_state['recognition_mode'] = 'hybrid' if recognition_mode_label == "混合识别" else 'full'
 
 # 主界面
 tab1, tab2, tab3 = st.tabs(["📤 上传文档", "📊 生成结果", "✅ 在线检验"])
@@ -184,51 +211,15 @@ with tab1:
         """)
     
     # 检查是否有已上传的文档（数据恢复）
-    has_uploaded_content = 'uploaded_content' in st.session_state and st.session_state.get('uploaded_content')
+    has_uploaded_content = SessionStateManager.has_uploaded_document()
     
     uploaded_files = st.file_uploader(
         "选择需求文档（最多3个文件）",
-        type=['md', 'txt', 'docx', 'pdf'],
+        type=SUPPORTED_EXTENSIONS,
         accept_multiple_files=True,
         help="支持格式：Markdown (.md)、文本文件 (.txt)、Word文档 (.docx)、PDF文档 (.pdf)。最多可同时上传3个文档，系统会自动合并处理。"
     )
     
-    # 定义文件读取函数
-    def read_file_content(uploaded_file):
-        """读取单个文件的内容"""
-        file_extension = uploaded_file.name.split('.')[-1].lower()
-        
-        try:
-            if file_extension == 'docx':
-                # 读取Word文档
-                from docx import Document
-                import io
-                doc = Document(io.BytesIO(uploaded_file.read()))
-                content = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
-            elif file_extension == 'pdf':
-                # 读取PDF文档（只提取文本，忽略图片）
-                import pdfplumber
-                import io
-                pdf_bytes = io.BytesIO(uploaded_file.read())
-                content = ''
-                with pdfplumber.open(pdf_bytes) as pdf:
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            content += page_text + '\n'
-                
-                if not content.strip():
-                    return None, "PDF文件中未找到可提取的文本内容"
-            elif file_extension in ['md', 'txt']:
-                # 读取文本文件
-                content = uploaded_file.read().decode('utf-8')
-            else:
-                return None, f"不支持的文件格式: {file_extension}"
-            
-            return content, None
-        except Exception as e:
-            return None, f"文件读取失败: {str(e)}"
-    
     # 如果有新上传的文件，处理它们
     if uploaded_files:
         # 检查文件数量限制
@@ -237,67 +228,84 @@ with tab1:
             st.warning("💡 提示：请重新选择，最多选择3个文档")
             st.stop()
         
-        all_content = ''
-        file_names = []
-        has_error = False
+        # 上传控件在每次交互后都会返回同一批文件，文件未变化时直接复用已合并的内容
+        upload_key = [getattr(f, 'file_id', None) or f"{f.name}:{f.size}" for f in uploaded_files]
         
         # 显示上传的文件列表
         st.info(f"📁 已选择 {len(uploaded_files)} 个文件")
         
-        # 处理每个文件
-        for i, uploaded_file in enumerate(uploaded_files, 1):
-            file_names.append(uploaded_file.name)
-            
-            # 读取文件内容
-            content, error = read_file_content(uploaded_file)
-            
-            if error:
-                st.error(f"❌ {uploaded_file.name}: {error}")
-                has_error = True
-                continue
-            
-            # 添加文档分隔标记
-            if i > 1:
-                all_content += '\n\n' + '='*80 + '\n\n'
-            
-            all_content += f'# 文档 {i}: {uploaded_file.name}\n\n'
-            all_content += content
-            
-            st.success(f"✅ 已读取: {uploaded_file.name}")
-        
-        # 如果有错误，停止处理
-        if has_error:
-            st.warning("💡 提示：请修复错误的文件后重新上传")
-            st.stop()
-        
-        # 检查合并后的内容
-        if not all_content.strip():
-            st.error("❌ 所有文件都没有可提取的内容")
-            st.stop()
-        
-        # 存储到 session state
-        st.session_state['uploaded_content'] = all_content
-        st.session_state['uploaded_filename'] = f"{len(file_names)}个文档"
-        st.session_state['uploaded_filenames'] = file_names
-        st.session_state['file_type'] = 'multiple'
+        if st.session_state.get('uploaded_files_key') == upload_key and has_uploaded_content:
+            for name in st.session_state.get('uploaded_filenames', []):
+                st.success(f"✅ 已读取: {name}")
+        else:
+            file_names = [uploaded_file.name for uploaded_file in uploaded_files]
+            merged_parts = []
+            has_error = False
+            
+            # 上传文件先落盘，解析进程直接从磁盘读取，不在进程间传递文件内容
+            store = DocumentStore()
+            spooled_paths = [store.spool_upload(uploaded_file, uploaded_file.name) for uploaded_file in uploaded_files]
+            
+            # 并行解析所有文件（docx/pdf解析是CPU密集型，放到进程池中执行）
+            # 解析结果按文件内容哈希缓存，同一文件只解析一次
+            try:
+                with st.spinner("📖 正在解析文档..."):
+                    parser = DocumentParser(cache=get_document_cache())
+                    parse_results = parser.parse_files(list(zip(file_names, spooled_paths)))
+            finally:
+                store.remove_spooled(spooled_paths)
+            
+            # 按上传顺序合并结果
+            for i, (name, (content, error)) in enumerate(zip(file_names, parse_results), 1):
+                if error:
+                    st.error(f"❌ {name}: {error}")
+                    has_error = True
+                    continue
+                
+                # 添加文档分隔标记
+                if i > 1:
+                    merged_parts.append('\n\n' + '='*80 + '\n\n')
+                
+                merged_parts.append(f'# 文档 {i}: {name}\n\n')
+                merged_parts.append(content)
+                
+                st.success(f"✅ 已读取: {name}")
+            
+            # 如果有错误，停止处理
+            if has_error:
+                st.warning("💡 提示：请修复错误的文件后重新上传")
+                st.stop()
+            
+            # 检查合并后的内容
+            if not any(part.strip() for part in merged_parts):
+                st.error("❌ 所有文件都没有可提取的内容")
+                st.stop()
+            
+            # 合并后的文档保存到磁盘，session state 只保存句柄和章节标题数
+            handle = store.save_merged(merged_parts, file_names)
+            del merged_parts, parse_results
+            SessionStateManager.set_uploaded_handle(handle, store.count_sections(handle))
+            st.session_state['uploaded_filename'] = f"{len(file_names)}个文档"
+            st.session_state['uploaded_filenames'] = file_names
+            st.session_state['file_type'] = 'multiple'
+            st.session_state['uploaded_files_key'] = upload_key
         
         st.divider()
         
         # 显示合并后的预览
         st.subheader("📄 文档内容预览")
-        preview_length = min(1000, len(all_content))
-        preview_text = all_content[:preview_length]
-        if len(all_content) > preview_length:
+        handle = SessionStateManager.get_document_handle()
+        preview_text = DocumentStore().read_preview(handle, 1000)
+        if handle.byte_size > len(preview_text.encode('utf-8')):
             preview_text += "\n\n... (内容过长，仅显示前1000字符)"
         
         st.text_area("合并后的文档内容", preview_text, height=300, key="merged_preview")
+        st.caption(f"📑 共 {SessionStateManager.get_section_count()} 个章节标题，文档大小 {handle.byte_size / 1024:.1f} KB")
     
     # 如果没有新上传但有已保存的内容，显示它
     elif has_uploaded_content:
-        content = st.session_state['uploaded_content']
         filename = st.session_state.get('uploaded_filename', '未知文件')
         file_names = st.session_state.get('uploaded_filenames', [])
-        file_extension = st.session_state.get('file_type', 'txt')
         
         st.info(f"📄 已加载文档: {filename}")
         
@@ -308,9 +316,15 @@ with tab1:
                     st.text(f"{i}. {name}")
         
         # 显示预览
-        preview_length = min(1000, len(content))
-        preview_text = content[:preview_length]
-        if len(content) > preview_length:
+        handle = SessionStateManager.get_document_handle()
+        if handle:
+            preview_text = DocumentStore().read_preview(handle, 1000)
+            is_truncated = handle.byte_size > len(preview_text.encode('utf-8'))
+        else:
+            content = SessionStateManager.get_uploaded_content()
+            preview_text = content[:1000]
+            is_truncated = len(content) > 1000
+        if is_truncated:
             preview_text += "\n\n... (内容过长，仅显示前1000字符)"
         
         st.text_area("文档预览", preview_text, height=200)
@@ -323,7 +337,7 @@ with tab1:
         if not st.session_state.get('modules_recognized', False):
             if st.button("🔍 模块/页面识别", type="primary", use_container_width=True, 
                         help="点击识别文档中的所有模块和页面，支持AI智能识别和规则识别"):
-                content = st.session_state.get('uploaded_content', '')
+                content = SessionStateManager.get_uploaded_content() or ''
                 file_extension = st.session_state.get('file_type', 'txt')
                 
                 # 检查文档内容是否为空
@@ -344,10 +358,14 @@ with tab1:
                                 api_key=st.session_state.get('ai_api_key'),
                                 case_type=case_type
                             )
-                            recognizer = ModuleRecognizer(ai_generator=generator)
+                            recognizer = ModuleRecognizer(
+                                ai_generator=generator,
+                                cache=get_recognition_cache(),
+                                mode=st.session_state.get('recognition_mode', 'hybrid')
+                            )
                         else:
                             st.info("💡 使用规则识别模式（基于文档标题结构）")
-                            recognizer = ModuleRecognizer()
+                            recognizer = ModuleRecognizer(cache=get_recognition_cache())
                         
                         # 识别模块
                         modules = recognizer.recognize_modules(content, file_extension)
@@ -363,6 +381,7 @@ with tab1:
                         st.session_state['modules'] = modules_dict
                         st.session_state['modules_recognized'] = True
                         st.session_state['module_count'] = len(modules)
+                        st.session_state['recognition_source'] = recognizer.last_source
                         
                         # 默认选中所有模块
                         st.session_state['selected_module_ids'] = {module.id for module in modules}
@@ -382,7 +401,7 @@ with tab1:
             if st.button("🔄 重新识别", use_container_width=True,
                         help="清除当前识别结果，重新识别文档中的模块"):
                 # 清除识别相关的状态
-                keys_to_clear = ['modules', 'modules_recognized', 'module_count', 'selected_module_ids', 'suggested_categories']
+                keys_to_clear = ['modules', 'modules_recognized', 'module_count', 'recognition_source', 'selected_module_ids', 'expanded_module_ids', 'module_page', 'suggested_categories']
                 for key in keys_to_clear:
                     if key in st.session_state:
                         del st.session_state[key]
@@ -393,6 +412,17 @@ with tab1:
             st.divider()
             st.subheader("📋 模块选择")
             
+            # 显示识别结果来源
+            source_labels = {
+                'cache': '⚡ 识别结果来自缓存（未重新识别，未调用AI接口）',
+                'ai': '🤖 识别结果来自AI智能识别',
+                'hybrid': '🧩 识别结果来自混合识别（结构清晰的章节按规则识别，其余部分由AI识别）',
+                'rule': '📐 识别结果来自规则识别'
+            }
+            recognition_source = st.session_state.get('recognition_source')
+            if recognition_source in source_labels:
+                st.caption(source_labels[recognition_source])
+            
             # 实例化模块选择器
             selector = ModuleSelector()
             
@@ -446,22 +476,13 @@ with tab1:
                             st.info(f"💡 使用模板生成模式（{case_type}）")
                             generator = AIGenerator(case_type=case_type)
                         
-                        coordinator = TestCaseCoordinator(ai_generator=generator)
-                        
-                        # 生成用例
-                        content = st.session_state.get('uploaded_content', '')
-                        all_cases = coordinator.generate_cases_for_selected(
-                            content=content,
-                            selected_modules=selected_modules,
-                            selected_categories=selected_categories
+                        # AI模式下并发生成多个模块（按预计耗时最长优先分派）；模板生成很快，无需并发
+                        coordinator = TestCaseCoordinator(
+                            ai_generator=generator,
+                            progress_callback=StreamlitProgressReporter(),
+                            max_workers=4 if use_ai_gen else 1
                         )
                         
-                        # 验证生成结果
-                        if not all_cases:
-                            st.error("❌ 生成失败：未能生成任何用例")
-                            st.warning("💡 建议：检查文档内容或尝试使用AI生成模式")
-                            st.stop()
-                        
                         # 根据用例类型确定编号前缀和文件名
                         case_type = st.session_state.get('case_type', '标准UI走查')
                         if case_type == '竞品对标走查':
@@ -471,34 +492,108 @@ with tab1:
                             prefix = 'UI-TC'
                             type_label = 'UI走查用例'
                         
-                        # 添加用例编号
-                        for i, case in enumerate(all_cases, 1):
-                            case['用例编号'] = f'{prefix}{i:03d}'
-                            case['是否通过'] = '待测试'
-                            case['截图/备注'] = ''
-                        
                         # 保存到CSV
-                        import csv
                         from datetime import datetime
                         
                         output_dir = Path('output')
                         output_dir.mkdir(exist_ok=True)
                         
-                        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                         filename = st.session_state.get('uploaded_filename', 'document').replace('.md', '').replace('.txt', '').replace('.docx', '')
-                        csv_file = output_dir / f"{filename}-{type_label}-{timestamp}.csv"
+                        name_prefix = f"{filename}-{type_label}-"
                         
                         headers = ['用例编号', '页面/模块', '检查点', '设计原则', '检查项', 
                                   '优先级', '预期结果/设计标准', '是否通过', '截图/备注']
                         
-                        with open(csv_file, 'w', encoding='utf-8', newline='') as f:
-                            writer = csv.DictWriter(f, fieldnames=headers)
-                            writer.writeheader()
-                            writer.writerows(all_cases)
+                        # 同一文档、同样的模块选择和生成方式才能续写上次中断的文件
+                        # 文档在磁盘上时只按模块读取章节，文档标识即内容哈希，不需要读取全文
+                        document = SessionStateManager.get_document_source() or ''
+                        if isinstance(document, DocumentHandle):
+                            content_hash = document.doc_id
+                        else:
+                            content_hash = hashlib.sha256(document.encode('utf-8')).hexdigest()
+                        fingerprint = hashlib.sha256(json.dumps({
+                            'content': content_hash,
+                            'case_type': case_type,
+                            'modules': [module.id for module in selected_modules],
+                            'categories': selected_categories,
+                            'provider': generator.provider if generator.client else None
+                        }, ensure_ascii=False).encode('utf-8')).hexdigest()
+                        
+                        resumable_file = StreamingCaseWriter.find_resumable(output_dir, name_prefix, fingerprint)
+                        if resumable_file:
+                            csv_file = Path(resumable_file)
+                        else:
+                            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                            csv_file = output_dir / f"{name_prefix}{timestamp}.csv"
+                        
+                        case_writer = StreamingCaseWriter(csv_file, headers, prefix, fingerprint=fingerprint)
+                        case_writer.open(resume=True)
+                        
+                        # 用例同时写入用例存储，生成记录ID与CSV文件名对应
+                        case_store = get_case_store()
+                        run_id = csv_file.stem
+                        case_store.start_run(run_id, filename, case_type, fingerprint=fingerprint, csv_path=str(csv_file))
+                        
+                        pending_modules = [module for module in selected_modules if not case_writer.is_completed(module.id)]
+                        pending_categories = [] if case_writer.is_completed(CATEGORIES_KEY) else selected_categories
+                        if case_writer.resumed:
+                            st.info(f"♻️ 检测到上次未完成的生成，已跳过 {len(selected_modules) - len(pending_modules)} 个已完成模块，继续生成剩余部分")
+                        
+                        # 生成用例：每个模块完成后立即编号并追加到 .partial 文件
+                        all_cases = []
+                        try:
+                            for result in coordinator.iter_cases_for_selected(
+                                content=document,
+                                selected_modules=pending_modules,
+                                selected_categories=pending_categories
+                            ):
+                                for case in result.cases:
+                                    case['是否通过'] = '待测试'
+                                    case['截图/备注'] = ''
+                                module_key = result.module.id if result.module else CATEGORIES_KEY
+                                case_writer.write_module(module_key, result.cases)
+                                case_store.add_module_cases(run_id, module_key, result.cases)
+                                all_cases.extend(result.cases)
+                            
+                            # 生成过程中断时保留 .partial 文件，下次点击生成会继续
+                            if case_writer.row_count == 0:
+                                case_writer.discard()
+                                case_store.delete_run(run_id)
+                            else:
+                                case_writer.finalize()
+                        finally:
+                            case_writer.close()
+                        
+                        # 续写时用例需要包含之前已写入的部分，以CSV为准重新写入用例存储，
+                        # 按日志中的模块标识分组，与正常生成时的模块划分一致
+                        if case_writer.resumed and csv_file.exists():
+                            all_cases = read_cases(csv_file)
+                            case_store.replace_cases(run_id, case_writer.group_cases(all_cases))
+                        if all_cases:
+                            case_store.finish_run(run_id)
+                            get_run_manifest().record_run(case_store.get_run(run_id), case_store.module_counts(run_id))
+                            # 归档到历史库（可选依赖pyarrow），归档失败不影响本次生成结果
+                            try:
+                                from case_archive import get_case_archive
+                                get_case_archive().archive_run(run_id)
+                            except ImportError:
+                                print("⚠️ 未安装pyarrow，跳过用例归档")
+                            except Exception as e:
+                                print(f"⚠️ 用例归档失败: {e}")
+                                st.warning(f"⚠️ 用例归档失败，可稍后在“在线检验”中重新归档: {e}")
+                        
+                        # 验证生成结果
+                        if not all_cases:
+                            st.error("❌ 生成失败：未能生成任何用例")
+                            st.warning("💡 建议：检查文档内容或尝试使用AI生成模式")
+                            st.stop()
                         
-                        # 保存到session
+                        # 保存到session，新的用例使用新的检验状态
                         st.session_state['generated_file'] = str(csv_file)
+                        st.session_state['run_id'] = run_id
                         st.session_state['all_cases'] = all_cases
+                        st.session_state['case_count'] = len(all_cases)
+                        st.session_state.pop('verification_status', None)
                         
                         st.success(f"✅ 生成完成！共生成 {len(all_cases)} 个用例，涉及 {len(selected_modules)} 个模块")
                         st.info(f"📋 用例类型: {case_type}")
@@ -519,7 +614,7 @@ with tab2:
         # 显示统计
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("用例总数", len(st.session_state.get('all_cases', [])))
+            st.metric("用例总数", SessionStateManager.get_case_count())
         with col2:
             st.metric("模块数量", st.session_state.get('module_count', 0))
         with col3:
@@ -531,7 +626,8 @@ with tab2:
         st.subheader("📥 下载CSV文件")
         
         generated_file = st.session_state.get('generated_file')
-        if generated_file and os.path.exists(generated_file):
+        run_id = st.session_state.get('run_id')
+        if generated_file and (run_id or os.path.exists(generated_file)):
             # 提取默认文件名（不含扩展名）
             default_name = os.path.basename(generated_file).replace('.csv', '')
             
@@ -546,8 +642,16 @@ with tab2:
             # 显示下载路径提示
             st.caption("💡 文件将下载到浏览器的默认下载目录（通常是 ~/Downloads/ 或 ~/下载/）")
             
-            with open(generated_file, 'r', encoding='utf-8') as f:
-                csv_data = f.read()
+            # 用例不变时直接使用缓存，不在每次重新运行时读取文件；有生成记录时从用例存储导出
+            def read_generated_file():
+                if run_id:
+                    return get_case_store().export_csv(run_id)
+                with open(generated_file, 'r', encoding='utf-8') as f:
+                    return f.read()
+            
+            csv_data = get_export_cache().get_or_build(
+                f"csv:{generated_file}", SessionStateManager.get_cases_fingerprint(), read_generated_file
+            )
             
             st.download_button(
                 label="📥 下载CSV文件",
@@ -564,206 +668,42 @@ with tab2:
         st.subheader("📊 格式转换")
         st.info("💡 将CSV文件转换为Excel多Sheet格式，按模块分Sheet，支持自动统计")
         
-        if st.button("🔄 转换为Excel格式", type="primary", use_container_width=True):
+        # 用例未变化时复用已转换的Excel，页面重新运行后下载按钮仍然保留
+        filename = st.session_state.get('uploaded_filename', 'document').replace('.md', '').replace('.txt', '').replace('.docx', '')
+        excel_kind = f"xlsx:{filename}"
+        cases_fingerprint = SessionStateManager.get_cases_fingerprint()
+        excel_export = get_export_cache().get(excel_kind, cases_fingerprint)
+        
+        if st.button("🔄 转换为Excel格式", type="primary", use_container_width=True) or excel_export:
             with st.spinner("正在转换为Excel格式..."):
                 try:
-                    import openpyxl
-                    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-                    from datetime import datetime
-                    
-                    # 按模块分组用例
-                    cases_by_module = {}
-                    for case in st.session_state['all_cases']:
-                        module = case.get('页面/模块', '未分类')
-                        if module not in cases_by_module:
-                            cases_by_module[module] = []
-                        cases_by_module[module].append(case)
-                    
-                    # 创建Excel工作簿
-                    wb = openpyxl.Workbook()
-                    wb.remove(wb.active)
-                    
-                    # 定义样式
-                    header_font = Font(name='微软雅黑', size=11, bold=True, color='FFFFFF')
-                    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-                    header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                    
-                    data_font = Font(name='微软雅黑', size=10)
-                    data_alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
-                    center_alignment = Alignment(horizontal='center', vertical='center')
-                    
-                    border = Border(
-                        left=Side(style='thin', color='D0D0D0'),
-                        right=Side(style='thin', color='D0D0D0'),
-                        top=Side(style='thin', color='D0D0D0'),
-                        bottom=Side(style='thin', color='D0D0D0')
-                    )
-                    
-                    # 优先级样式
-                    priority_styles = {
-                        '高': {'fill': PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid'),
-                               'font': Font(name='微软雅黑', size=10, color='9C0006')},
-                        '中': {'fill': PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid'),
-                               'font': Font(name='微软雅黑', size=10, color='9C6500')},
-                        '低': {'fill': PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid'),
-                               'font': Font(name='微软雅黑', size=10, color='006100')}
-                    }
-                    
-                    # 创建用例汇总Sheet
-                    summary_ws = wb.create_sheet('用例汇总', 0)
-                    summary_headers = ['序号', '模块名称', '用例数量', '高优先级', '中优先级', '低优先级', '完成数量', '完成率', '备注']
-                    summary_ws.append(summary_headers)
-                    
-                    # 应用汇总表头样式
-                    for col_num, header in enumerate(summary_headers, 1):
-                        cell = summary_ws.cell(1, col_num)
-                        cell.font = header_font
-                        cell.fill = header_fill
-                        cell.alignment = header_alignment
-                        cell.border = border
-                    
-                    # 设置汇总Sheet列宽
-                    summary_ws.column_dimensions['A'].width = 8
-                    summary_ws.column_dimensions['B'].width = 25
-                    summary_ws.column_dimensions['C'].width = 12
-                    summary_ws.column_dimensions['D'].width = 12
-                    summary_ws.column_dimensions['E'].width = 12
-                    summary_ws.column_dimensions['F'].width = 12
-                    summary_ws.column_dimensions['G'].width = 12
-                    summary_ws.column_dimensions['H'].width = 12
-                    summary_ws.column_dimensions['I'].width = 30
-                    
-                    # 定义清理Sheet名称的函数
-                    def clean_sheet_name(name):
-                        """清理Excel Sheet名称，移除非法字符并限制长度"""
-                        # Excel不允许的字符: / \ ? * [ ] :
-                        # 将 / 和 \ 替换为 -，其他非法字符删除
-                        cleaned = name.replace('/', '-').replace('\\', '-').replace('?', '').replace('*', '').replace('[', '').replace(']', '').replace(':', '-')
-                        # 移除前后空格
-                        cleaned = cleaned.strip()
-                        # 如果名称为空，使用默认名称
-                        if not cleaned:
-                            cleaned = 'Sheet'
-                        # 限制长度为31字符
-                        if len(cleaned) > 31:
-                            cleaned = cleaned[:31]
-                        return cleaned
-                    
-                    # 填充汇总数据
-                    row_num = 2
-                    for module_name, cases in cases_by_module.items():
-                        total = len(cases)
-                        high = sum(1 for c in cases if c.get('优先级') == '高')
-                        medium = sum(1 for c in cases if c.get('优先级') == '中')
-                        low = sum(1 for c in cases if c.get('优先级') == '低')
-                        
-                        # 使用清理函数获取安全的Sheet名称
-                        safe_sheet_name = clean_sheet_name(module_name)
-                        
-                        # 添加公式计算完成数量和完成率
-                        complete_formula = f"=COUNTIF('{safe_sheet_name}'!H:H,\"是\")+COUNTIF('{safe_sheet_name}'!H:H,\"否\")"
-                        rate_formula = f"=IF(C{row_num}=0,\"0%\",TEXT(G{row_num}/C{row_num},\"0%\"))"
-                        
-                        summary_ws.append([row_num - 1, module_name, total, high, medium, low, complete_formula, rate_formula, ''])
-                        
-                        # 应用数据行样式
-                        for col_num in range(1, 10):
-                            cell = summary_ws.cell(row_num, col_num)
-                            cell.font = data_font
-                            cell.alignment = center_alignment if col_num <= 8 else data_alignment
-                            cell.border = border
-                            if row_num % 2 == 0:
-                                cell.fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
-                        
-                        row_num += 1
-                    
-                    # 冻结汇总Sheet首行
-                    summary_ws.freeze_panes = 'A2'
-                    
-                    # 为每个模块创建Sheet
-                    headers = ['用例编号', '页面/模块', '检查点', '设计原则', '检查项', '优先级', '预期结果/设计标准', '是否通过', '截图/备注']
-                    col_widths = [12, 18, 20, 20, 35, 8, 40, 12, 25]
-                    
-                    for module_name, cases in cases_by_module.items():
-                        # 创建Sheet（使用清理后的名称）
-                        sheet_name = clean_sheet_name(module_name)
-                        ws = wb.create_sheet(sheet_name)
-                        
-                        # 写入表头
-                        ws.append(headers)
+                    if excel_export is None:
+                        from excel_exporter import ExcelExporter
+                        from datetime import datetime
                         
-                        # 应用表头样式
-                        for col_num, header in enumerate(headers, 1):
-                            cell = ws.cell(1, col_num)
-                            cell.font = header_font
-                            cell.fill = header_fill
-                            cell.alignment = header_alignment
-                            cell.border = border
+                        # 保存Excel文件
+                        output_dir = Path('output')
+                        output_dir.mkdir(exist_ok=True)
                         
-                        # 设置列宽
-                        for col_num, width in enumerate(col_widths, 1):
-                            ws.column_dimensions[openpyxl.utils.get_column_letter(col_num)].width = width
+                        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                        excel_file = output_dir / f"{filename}-UI走查用例-{timestamp}.xlsx"
                         
-                        # 写入数据
-                        for row_num, case in enumerate(cases, 2):
-                            row_data = [
-                                case.get('用例编号', ''),
-                                case.get('页面/模块', ''),
-                                case.get('检查点', ''),
-                                case.get('设计原则', ''),
-                                case.get('检查项', ''),
-                                case.get('优先级', ''),
-                                case.get('预期结果/设计标准', ''),
-                                '待测试',  # 默认值
-                                case.get('截图/备注', '')
-                            ]
-                            ws.append(row_data)
-                            
-                            # 应用数据行样式
-                            for col_num in range(1, 10):
-                                cell = ws.cell(row_num, col_num)
-                                cell.font = data_font
-                                cell.alignment = center_alignment if col_num in [6, 8] else data_alignment
-                                cell.border = border
-                                
-                                # 奇偶行交替背景色
-                                if row_num % 2 == 0:
-                                    cell.fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
-                                
-                                # 优先级单元格特殊样式
-                                if col_num == 6:  # 优先级列
-                                    priority = case.get('优先级', '')
-                                    if priority in priority_styles:
-                                        cell.fill = priority_styles[priority]['fill']
-                                        cell.font = priority_styles[priority]['font']
-                            
-                            # 为"是否通过"列添加数据验证（下拉选择）
-                            from openpyxl.worksheet.datavalidation import DataValidation
-                            dv = DataValidation(type="list", formula1='"待测试,是,否"', allow_blank=False)
-                            dv.add(f'H{row_num}')
-                            ws.add_data_validation(dv)
+                        run_id = st.session_state.get('run_id')
+                        export_cases = get_case_store().iter_cases(run_id) if run_id else SessionStateManager.get_all_cases()
+                        sheet_count = ExcelExporter().export(export_cases, excel_file)
                         
-                        # 冻结首行首列
-                        ws.freeze_panes = 'B2'
-                    
-                    # 保存Excel文件
-                    output_dir = Path('output')
-                    output_dir.mkdir(exist_ok=True)
-                    
-                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    filename = st.session_state.get('uploaded_filename', 'document').replace('.md', '').replace('.txt', '').replace('.docx', '')
-                    excel_file = output_dir / f"{filename}-UI走查用例-{timestamp}.xlsx"
+                        # 读取Excel文件用于下载
+                        with open(excel_file, 'rb') as f:
+                            excel_export = {'file_name': excel_file.name, 'data': f.read(), 'sheet_count': sheet_count}
+                        get_export_cache().put(excel_kind, cases_fingerprint, excel_export)
                     
-                    wb.save(excel_file)
-                    
-                    # 读取Excel文件用于下载
-                    with open(excel_file, 'rb') as f:
-                        excel_data = f.read()
+                    excel_data = excel_export['data']
+                    sheet_count = excel_export['sheet_count']
                     
                     st.success(f"✅ 转换成功！Excel文件已生成")
                     
                     # 文件名自定义
-                    default_excel_name = excel_file.name.replace('.xlsx', '')
+                    default_excel_name = excel_export['file_name'].replace('.xlsx', '')
                     custom_excel_filename = st.text_input(
                         "自定义Excel文件名",
                         value=default_excel_name,
@@ -782,7 +722,7 @@ with tab2:
                         help="点击下载Excel文件到浏览器默认下载目录"
                     )
                     
-                    st.info(f"📊 Excel文件包含 {len(cases_by_module)} 个Sheet（1个汇总 + {len(cases_by_module)} 个模块）")
+                    st.info(f"📊 Excel文件包含 {sheet_count} 个Sheet（1个汇总 + {sheet_count} 个模块）")
                     
                 except ImportError:
                     st.error("❌ 缺少openpyxl库，请安装：pip install openpyxl")
@@ -995,7 +935,7 @@ with tab2:
 with tab3:
     st.header("在线检验")
     
-    if 'all_cases' not in st.session_state or not st.session_state['all_cases']:
+    if not SessionStateManager.get_case_count():
         st.info("👈 请先在左侧上传文档并生成用例")
         st.markdown("""
         ### 📋 在线检验功能说明
@@ -1016,26 +956,41 @@ with tab3:
         5. 导出检验结果
         """)
     else:
-        # 初始化检验状态
+        # 初始化检验状态（有生成记录时从用例存储恢复），未记录的用例视为待检验
+        verification_run_id = st.session_state.get('run_id')
         if 'verification_status' not in st.session_state:
-            st.session_state['verification_status'] = {}
-            for case in st.session_state['all_cases']:
-                case_id = case.get('用例编号', '')
-                if case_id:
-                    st.session_state['verification_status'][case_id] = '待检验'
+            st.session_state['verification_status'] = (
+                get_case_store().get_verification_status(verification_run_id) if verification_run_id else {}
+            )
+            SessionStateManager.bump_verification_version()
         
-        # 按模块分组用例
-        cases_by_module = {}
-        for case in st.session_state['all_cases']:
-            module = case.get('页面/模块', '未分类')
-            if module not in cases_by_module:
-                cases_by_module[module] = []
-            cases_by_module[module].append(case)
+        def update_verification_status(updates):
+            """更新检验状态并写入用例存储"""
+            st.session_state['verification_status'].update(updates)
+            SessionStateManager.bump_verification_version()
+            # 清除表格中未保存的编辑，使其按新的检验状态重新显示
+            for key in [key for key in st.session_state if str(key).startswith(VERIFICATION_EDITOR_PREFIX)]:
+                st.session_state.pop(key, None)
+            if verification_run_id:
+                get_case_store().set_verification_status(verification_run_id, updates)
+        
+        # 按模块分组用例：有生成记录时只查询模块用例数，选中模块的用例再单独加载
+        if verification_run_id:
+            module_case_counts = get_case_store().module_counts(verification_run_id)
+            cases_by_module = None
+        else:
+            cases_by_module = {}
+            for case in SessionStateManager.get_all_cases():
+                module = case.get('页面/模块', '未分类')
+                if module not in cases_by_module:
+                    cases_by_module[module] = []
+                cases_by_module[module].append(case)
+            module_case_counts = {module: len(cases) for module, cases in cases_by_module.items()}
         
-        modules = list(cases_by_module.keys())
+        modules = list(module_case_counts.keys())
         
         # 计算整体统计
-        total_cases = len(st.session_state['all_cases'])
+        total_cases = sum(module_case_counts.values())
         status_counts = {'待检验': 0, '通过': 0, '不通过': 0}
         for status in st.session_state['verification_status'].values():
             status_counts[status] = status_counts.get(status, 0) + 1
@@ -1063,6 +1018,10 @@ with tab3:
         
         st.divider()
         
+        def reset_verification_page():
+            """切换模块、修改搜索词或每页条数后回到第一页"""
+            st.session_state[SessionStateManager.KEY_VERIFICATION_PAGE] = 1
+        
         # 模块切换标签
         if len(modules) > 1:
             st.subheader("🔄 选择模块")
@@ -1070,13 +1029,18 @@ with tab3:
                 "选择要检验的模块",
                 modules,
                 horizontal=True,
-                label_visibility="collapsed"
+                label_visibility="collapsed",
+                key="verification_module",
+                on_change=reset_verification_page
             )
         else:
             selected_module = modules[0] if modules else None
         
         if selected_module:
-            module_cases = cases_by_module[selected_module]
+            if cases_by_module is None:
+                module_cases = get_case_store().load_cases(verification_run_id, module_name=selected_module)
+            else:
+                module_cases = cases_by_module[selected_module]
             
             # 模块统计
             module_status_counts = {'待检验': 0, '通过': 0, '不通过': 0}
@@ -1105,38 +1069,27 @@ with tab3:
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 if st.button("✅ 全部标记为通过", use_container_width=True):
-                    for case in module_cases:
-                        case_id = case.get('用例编号', '')
-                        if case_id:
-                            st.session_state['verification_status'][case_id] = '通过'
+                    update_verification_status({
+                        case.get('用例编号', ''): '通过' for case in module_cases if case.get('用例编号', '')
+                    })
                     st.rerun()
             with col2:
                 if st.button("🔄 全部重置为待检验", use_container_width=True):
-                    for case in module_cases:
-                        case_id = case.get('用例编号', '')
-                        if case_id:
-                            st.session_state['verification_status'][case_id] = '待检验'
+                    update_verification_status({
+                        case.get('用例编号', ''): '待检验' for case in module_cases if case.get('用例编号', '')
+                    })
                     st.rerun()
             with col3:
                 # 导出当前模块
                 if st.button("📥 导出当前模块", use_container_width=True):
-                    import csv
                     from datetime import datetime
-                    from io import StringIO
-                    
-                    output = StringIO()
-                    headers = ['用例编号', '页面/模块', '检查点', '设计原则', '检查项', 
-                              '优先级', '预期结果/设计标准', '检验状态']
-                    writer = csv.DictWriter(output, fieldnames=headers)
-                    writer.writeheader()
-                    
-                    for case in module_cases:
-                        case_id = case.get('用例编号', '')
-                        case_copy = case.copy()
-                        case_copy['检验状态'] = st.session_state['verification_status'].get(case_id, '待检验')
-                        writer.writerow(case_copy)
                     
-                    csv_data = output.getvalue()
+                    verification_status = st.session_state['verification_status']
+                    csv_data = get_export_cache().get_or_build(
+                        f"module_csv:{selected_module}",
+                        SessionStateManager.get_verification_fingerprint(module_cases),
+                        lambda: build_verification_csv(module_cases, verification_status)
+                    )
                     st.download_button(
                         label="⬇️ 下载CSV",
                         data=csv_data,
@@ -1145,7 +1098,8 @@ with tab3:
                     )
             with col4:
                 # 搜索框
-                search_keyword = st.text_input("🔍 搜索用例", placeholder="输入关键词...", label_visibility="collapsed")
+                search_keyword = st.text_input("🔍 搜索用例", placeholder="输入关键词...", label_visibility="collapsed",
+                                               key="verification_search", on_change=reset_verification_page)
             
             st.divider()
             
@@ -1164,72 +1118,105 @@ with tab3:
             if not filtered_cases:
                 st.warning("🔍 没有找到匹配的用例")
             else:
-                # 紧凑但完整显示的布局
-                for idx, case in enumerate(filtered_cases, 1):
-                    case_id = case.get('用例编号', '')
-                    current_status = st.session_state['verification_status'].get(case_id, '待检验')
-                    
-                    # 根据状态设置颜色
-                    if current_status == '通过':
-                        status_color = "🟢"
-                    elif current_status == '不通过':
-                        status_color = "🔴"
-                    else:
-                        status_color = "⚪"
-                    
-                    priority = case.get('优先级', '中')
-                    priority_badge = "🔴" if priority == '高' else "🟡" if priority == '中' else "🟢"
-                    
-                    # 紧凑的两行布局
-                    col1, col2 = st.columns([5, 1])
-                    
-                    with col1:
-                        # 第一行：用例编号、检查点、设计原则
-                        st.markdown(f"{status_color} {priority_badge} **{case_id}** {case.get('检查点', '')} · {case.get('设计原则', '')}")
-                        # 第二行：检查项和预期结果（使用小字体）
-                        st.caption(f"**检查项**: {case.get('检查项', '')} | **预期结果**: {case.get('预期结果/设计标准', '')}")
-                    
-                    with col2:
-                        new_status = st.selectbox(
-                            "状态",
-                            ['待检验', '通过', '不通过'],
-                            index=['待检验', '通过', '不通过'].index(current_status),
-                            key=f"status_{case_id}",
-                            label_visibility="collapsed"
+                # 分页：只为当前页的用例创建控件，每次交互的开销取决于每页条数而不是模块用例数
+                page_size_key = SessionStateManager.KEY_VERIFICATION_PAGE_SIZE
+                page_key = SessionStateManager.KEY_VERIFICATION_PAGE
+                if page_size_key not in st.session_state:
+                    st.session_state[page_size_key] = VERIFICATION_PAGE_SIZE
+                
+                page_col1, page_col2 = st.columns([1, 3])
+                with page_col1:
+                    page_size = st.selectbox("每页条数", VERIFICATION_PAGE_SIZES, key=page_size_key,
+                                             on_change=reset_verification_page)
+                
+                total_pages = max(1, (len(filtered_cases) + page_size - 1) // page_size)
+                # 用例数变化后总页数可能变少，先把页码收回有效范围
+                if st.session_state.get(page_key, 1) > total_pages:
+                    st.session_state[page_key] = 1
+                with page_col2:
+                    page = st.number_input(
+                        f"页码（共 {total_pages} 页，{len(filtered_cases)} 项）",
+                        min_value=1,
+                        max_value=total_pages,
+                        step=1,
+                        key=page_key
+                    )
+                
+                page_start = (int(page) - 1) * page_size
+                page_cases = filtered_cases[page_start:page_start + page_size]
+                
+                # 当前页的用例放在一个可编辑表格中，只有检验状态列可以修改；
+                # 表格放在表单里，修改多行后点击保存一次性提交（一次重新运行）
+                verification_status = st.session_state['verification_status']
+                page_df = pd.DataFrame([
+                    {
+                        '检验状态': verification_status.get(case.get('用例编号', ''), '待检验'),
+                        '用例编号': case.get('用例编号', ''),
+                        '优先级': case.get('优先级', ''),
+                        '检查点': case.get('检查点', ''),
+                        '设计原则': case.get('设计原则', ''),
+                        '检查项': case.get('检查项', ''),
+                        '预期结果/设计标准': case.get('预期结果/设计标准', '')
+                    }
+                    for case in page_cases
+                ])
+                
+                # 表格的编辑按行号记录，每个模块/搜索/分页组合使用单独的key，避免编辑落到其他页的用例上
+                editor_key = f"{VERIFICATION_EDITOR_PREFIX}{selected_module}:{search_keyword}:{page_size}:{int(page)}"
+                with st.form("verification_form"):
+                    edited_df = st.data_editor(
+                        page_df,
+                        key=editor_key,
+                        hide_index=True,
+                        use_container_width=True,
+                        disabled=[column for column in page_df.columns if column != '检验状态'],
+                        column_config={
+                            '检验状态': st.column_config.SelectboxColumn(
+                                '检验状态',
+                                options=VERIFICATION_STATUS_OPTIONS,
+                                required=True,
+                                width='small'
+                            ),
+                            '用例编号': st.column_config.TextColumn('用例编号', width='small'),
+                            '优先级': st.column_config.TextColumn('优先级', width='small'),
+                            '检查项': st.column_config.TextColumn('检查项', width='large'),
+                            '预期结果/设计标准': st.column_config.TextColumn('预期结果/设计标准', width='large')
+                        }
+                    )
+                    saved = st.form_submit_button("💾 保存检验结果", type="primary")
+                
+                st.caption("💡 修改检验状态后点击保存，切换页面或模块前未保存的修改会丢失")
+                
+                if saved:
+                    updates = {
+                        case_id: new_status
+                        for case_id, old_status, new_status in zip(
+                            page_df['用例编号'], page_df['检验状态'], edited_df['检验状态']
                         )
-                        
-                        if new_status != current_status:
-                            st.session_state['verification_status'][case_id] = new_status
-                            st.rerun()
-                    
-                    # 用细线分隔
-                    if idx < len(filtered_cases):
-                        st.markdown("---")
+                        if new_status != old_status
+                    }
+                    if updates:
+                        update_verification_status(updates)
+                        st.rerun()
+                    else:
+                        st.info("检验状态没有变化")
         
         # 导出全部结果
         st.divider()
         st.subheader("📥 导出检验结果")
         
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
             if st.button("📥 导出全部检验结果", type="primary", use_container_width=True):
-                import csv
                 from datetime import datetime
-                from io import StringIO
-                
-                output = StringIO()
-                headers = ['用例编号', '页面/模块', '检查点', '设计原则', '检查项', 
-                          '优先级', '预期结果/设计标准', '检验状态']
-                writer = csv.DictWriter(output, fieldnames=headers)
-                writer.writeheader()
                 
-                for case in st.session_state['all_cases']:
-                    case_id = case.get('用例编号', '')
-                    case_copy = case.copy()
-                    case_copy['检验状态'] = st.session_state['verification_status'].get(case_id, '待检验')
-                    writer.writerow(case_copy)
-                
-                csv_data = output.getvalue()
+                # 有生成记录时指纹不需要用例，只有缓存未命中时才加载全部用例
+                verification_status = st.session_state['verification_status']
+                csv_data = get_export_cache().get_or_build(
+                    "verification_csv",
+                    SessionStateManager.get_verification_fingerprint(),
+                    lambda: build_verification_csv(SessionStateManager.get_all_cases(), verification_status)
+                )
                 st.download_button(
                     label="⬇️ 下载完整检验结果CSV",
                     data=csv_data,
@@ -1241,14 +1228,70 @@ with tab3:
         with col2:
             if st.button("🔄 重置所有检验状态", use_container_width=True):
                 if st.session_state.get('confirm_reset', False):
-                    for case_id in st.session_state['verification_status'].keys():
-                        st.session_state['verification_status'][case_id] = '待检验'
+                    update_verification_status({case_id: '待检验' for case_id in st.session_state['verification_status']})
                     st.session_state['confirm_reset'] = False
                     st.success("✅ 已重置所有检验状态")
                     st.rerun()
                 else:
                     st.session_state['confirm_reset'] = True
                     st.warning("⚠️ 再次点击确认重置")
+        
+        with col3:
+            # 归档当前检验状态，供历史统计分析
+            if verification_run_id and st.button("📦 归档到历史库", use_container_width=True,
+                                                 help="写入按月份分区的Parquet归档，用于统计优先级分布、通过率等"):
+                try:
+                    from case_archive import get_case_archive
+                    archive_path = get_case_archive().archive_run(verification_run_id)
+                    st.success(f"✅ 已归档: {archive_path}")
+                except ImportError:
+                    st.error("❌ 缺少pyarrow库，请安装：pip install pyarrow")
+                except Exception as e:
+                    print(f"❌ 错误: 用例归档失败: {e}")
+                    st.error(f"❌ 归档失败: {e}")
+        
+        # 导入离线填写的检验结果
+        st.divider()
+        st.subheader("📤 导入检验结果")
+        st.caption("上传导出的Excel（填写“是否通过”列）或CSV（“检验状态”或“是否通过”列），按用例编号批量更新检验状态")
+        
+        import_summary = st.session_state.pop('verification_import_summary', None)
+        if import_summary:
+            st.success(f"✅ 导入完成：{import_summary['text']}")
+            if import_summary['transitions']:
+                st.dataframe(pd.DataFrame(import_summary['transitions']), hide_index=True)
+            if import_summary['invalid']:
+                st.warning(f"⚠️ 以下用例的状态无法识别（可用值：是/否/待测试 或 通过/不通过/待检验）：{import_summary['invalid']}")
+        
+        import_file = st.file_uploader("选择检验结果文件", type=['xlsx', 'csv'], key="verification_import_file")
+        overwrite_pending = st.checkbox("“待测试”的用例也覆盖当前状态", value=False,
+                                        help="默认只导入已填写“是/否”的结果，避免未填写的行把在线检验的结果重置")
+        if import_file and st.button("📤 导入", use_container_width=True):
+            from verification_importer import import_verification
+            
+            if verification_run_id:
+                known_ids = get_case_store().case_numbers(verification_run_id)
+            else:
+                known_ids = {case.get('用例编号', '') for case in SessionStateManager.get_all_cases()}
+            
+            try:
+                import_result = import_verification(
+                    import_file, import_file.name, st.session_state['verification_status'],
+                    known_ids, overwrite_pending=overwrite_pending
+                )
+            except ImportError:
+                st.error("❌ 缺少openpyxl库，请安装：pip install openpyxl")
+            except Exception as e:
+                st.error(f"❌ 导入失败: {str(e)}")
+            else:
+                # 一次写入全部变化，再重新运行刷新统计
+                update_verification_status(import_result.updates)
+                st.session_state['verification_import_summary'] = {
+                    'text': import_result.summary(),
+                    'transitions': import_result.transition_rows(),
+                    'invalid': '、'.join(f"{case_id}（{value}）" for case_id, value in import_result.invalid_rows[:20])
+                }
+                st.rerun()
 
 # 页脚
 st.divider()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streamlit进度适配器
+把协调器的生成事件显示为Streamlit进度条和状态文本
+"""
+
+import streamlit as st
+from test_case_coordinator import (
+    GenerationEvent,
+    EVENT_MODULE_STARTED,
+    EVENT_MODULE_FINISHED,
+    EVENT_FALLBACK_USED,
+    EVENT_CATEGORIES_STARTED,
+    EVENT_COMPLETED
+)
+
+
+class StreamlitProgressReporter:
+    """Streamlit进度显示 - 作为TestCaseCoordinator的progress_callback使用"""
+
+    def __init__(self):
+        """创建进度条和状态文本占位"""
+        self.progress_bar = st.progress(0)
+        self.status_text = st.empty()
+
+    def __call__(self, event: GenerationEvent):
+        """
+        处理生成事件
+
+        Args:
+            event: 生成事件
+        """
+        if event.kind == EVENT_MODULE_STARTED:
+            self.status_text.text(f"正在生成 {event.module.name} 的用例... ({event.index + 1}/{event.total})")
+        elif event.kind == EVENT_MODULE_FINISHED:
+            # 完成事件按模块顺序产出，并发生成时也能单调推进进度条
+            self.progress_bar.progress((event.index + 1) / event.total)
+            self.status_text.text(f"已完成 {event.module.name} ({event.index + 1}/{event.total})")
+        elif event.kind == EVENT_FALLBACK_USED:
+            st.warning(f"⚠️ {event.message}")
+        elif event.kind == EVENT_CATEGORIES_STARTED:
+            self.status_text.text("正在为建议选项生成用例...")
+        elif event.kind == EVENT_COMPLETED:
+            self.progress_bar.progress(1.0)
+            self.status_text.text(
+                f"✅ 生成完成！成功: {event.success_count}，失败: {event.fail_count}（{event.message}）"
+            )
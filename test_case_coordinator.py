@@ -3,29 +3,90 @@
 """
 用例生成协调器
 协调模块选择和用例生成流程
+
+协调器不依赖任何UI框架，生成进度通过事件回调/事件迭代器上报，
+Streamlit界面的进度显示见 streamlit_progress.StreamlitProgressReporter
 """
 
-from typing import List, Dict
-import streamlit as st
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Union
 from module import Module
+from document_store import DocumentHandle, DocumentStore
 from ai_generator import AIGenerator
+from case_templates import CASE_TEMPLATES, render_cases
+from module_scheduler import ModuleScheduler, ScheduledModule
+
+
+# 生成事件类型
+EVENT_MODULE_STARTED = 'module_started'        # 开始生成某个模块（并发时为分派到线程池）
+EVENT_CASE_EMITTED = 'case_emitted'            # 产出一条用例
+EVENT_FALLBACK_USED = 'fallback_used'          # 模块生成失败，改用模板用例
+EVENT_MODULE_FINISHED = 'module_finished'      # 模块生成完成
+EVENT_CATEGORIES_STARTED = 'categories_started'    # 开始生成建议选项用例
+EVENT_CATEGORIES_FINISHED = 'categories_finished'  # 建议选项用例生成完成
+EVENT_COMPLETED = 'completed'                  # 全部完成
+
+
+@dataclass
+class GenerationEvent:
+    """生成事件 - 用于上报用例生成进度"""
+    kind: str                          # 事件类型（EVENT_*）
+    index: int = 0                     # 当前模块序号（从0开始）
+    total: int = 0                     # 模块总数
+    module: Optional[Module] = None    # 当前模块，建议选项和完成事件为None
+    case: Optional[Dict] = None        # 产出的用例（case_emitted）
+    cases: List[Dict] = field(default_factory=list)  # 本模块的全部用例（module_finished / categories_finished）
+    used_fallback: bool = False        # 是否使用了模板用例
+    message: str = ''                  # 说明信息（如失败原因）
+    elapsed: float = 0.0               # 耗时（秒）：模块事件为该模块耗时，完成事件为总耗时
+    success_count: int = 0             # 完成事件：AI/生成器成功的模块数
+    fail_count: int = 0                # 完成事件：使用模板兜底的模块数
+
+
+@dataclass
+class ModuleResult:
+    """单个模块的生成结果 - 由 iter_cases_for_selected 逐个产出"""
+    index: int                         # 模块序号（从0开始），建议选项结果为模块总数
+    module: Optional[Module]           # 模块，建议选项结果为None
+    cases: List[Dict]                  # 该模块的用例
+    used_fallback: bool = False        # 是否使用了模板用例
+    elapsed: float = 0.0               # 生成耗时（秒）
+    message: str = ''                  # 说明信息（如失败原因）
 
 
 class TestCaseCoordinator:
     """用例生成协调器"""
     
-    def __init__(self, ai_generator: AIGenerator):
+    def __init__(self, ai_generator: AIGenerator,
+                 progress_callback: Optional[Callable[[GenerationEvent], None]] = None,
+                 max_workers: int = 1,
+                 scheduler: Optional[ModuleScheduler] = None,
+                 module_priorities: Optional[Dict[str, int]] = None):
         """
         初始化协调器
         
         Args:
             ai_generator: AI生成器实例
+            progress_callback: 可选的进度回调，每个生成事件调用一次
+            max_workers: 同时生成的模块数，大于1时按预计耗时最长优先分派
+            scheduler: 模块调度器，默认使用共享历史耗时的调度器
+            module_priorities: 可选的模块优先级（模块ID -> 优先级），数值越大越先分派
         """
         self.ai_generator = ai_generator
+        self.progress_callback = progress_callback
+        self.max_workers = max(1, max_workers)
+        self.scheduler = scheduler or ModuleScheduler()
+        self.module_priorities = module_priorities or {}
+        # 最近一次生成的调度报告（预测与实际耗时）
+        self.last_schedule_report = None
     
     def generate_cases_for_selected(
         self,
-        content: str,
+        content: Union[str, DocumentHandle],
         selected_modules: List[Module],
         selected_categories: List[str]
     ) -> List[Dict]:
@@ -33,76 +94,320 @@ class TestCaseCoordinator:
         为选中的模块生成用例
         
         Args:
-            content: 需求文档内容
+            content: 需求文档内容，或磁盘上文档的句柄（只读取选中模块的章节）
             selected_modules: 选中的模块列表
             selected_categories: 选中的建议选项列表
             
         Returns:
             用例列表
         """
-        if not selected_modules:
-            st.warning("⚠️ 请至少选择一个模块")
-            return []
-        
         all_cases = []
+        for result in self.iter_cases_for_selected(content, selected_modules, selected_categories):
+            all_cases.extend(result.cases)
+        
+        return all_cases
+    
+    def iter_cases_for_selected(
+        self,
+        content: Union[str, DocumentHandle],
+        selected_modules: List[Module],
+        selected_categories: List[str]
+    ) -> Iterator[ModuleResult]:
+        """
+        逐个模块生成用例，每个模块完成后立即产出其结果
+        
+        调用方可以边生成边写入文件或刷新界面，不需要等全部模块完成，
+        也不需要在内存中保留全部用例
+        
+        Args:
+            content: 需求文档内容，或磁盘上文档的句柄（只读取选中模块的章节）
+            selected_modules: 选中的模块列表
+            selected_categories: 选中的建议选项列表
+            
+        Yields:
+            ModuleResult，按模块顺序产出，建议选项用例（如有）最后产出
+        """
+        # 续写时模块可能都已完成、只剩建议选项用例，此时仍需生成建议选项
+        if not selected_modules and not selected_categories:
+            print("警告：未选择任何模块")
+            return
+        
+        for event in self.iter_events(content, selected_modules, selected_categories):
+            if self.progress_callback:
+                self.progress_callback(event)
+            
+            if event.kind == EVENT_MODULE_FINISHED:
+                yield ModuleResult(
+                    index=event.index,
+                    module=event.module,
+                    cases=event.cases,
+                    used_fallback=event.used_fallback,
+                    elapsed=event.elapsed,
+                    message=event.message
+                )
+            elif event.kind == EVENT_CATEGORIES_FINISHED:
+                yield ModuleResult(index=event.index, module=None, cases=event.cases, elapsed=event.elapsed)
+    
+    async def aiter_cases_for_selected(
+        self,
+        content: Union[str, DocumentHandle],
+        selected_modules: List[Module],
+        selected_categories: List[str]
+    ) -> AsyncIterator[ModuleResult]:
+        """
+        iter_cases_for_selected 的异步版本
+        
+        生成器调用是阻塞的（AI接口请求），每一步都放到线程池中执行，不阻塞事件循环
+        
+        Args:
+            content: 需求文档内容，或磁盘上文档的句柄（只读取选中模块的章节）
+            selected_modules: 选中的模块列表
+            selected_categories: 选中的建议选项列表
+            
+        Yields:
+            ModuleResult
+        """
+        loop = asyncio.get_running_loop()
+        results = self.iter_cases_for_selected(content, selected_modules, selected_categories)
+        finished = object()
+        
+        while True:
+            result = await loop.run_in_executor(None, next, results, finished)
+            if result is finished:
+                break
+            yield result
+    
+    def iter_events(
+        self,
+        content: Union[str, DocumentHandle],
+        selected_modules: List[Module],
+        selected_categories: List[str]
+    ) -> Iterator[GenerationEvent]:
+        """
+        生成用例，并产出生成事件
+        
+        模块完成相关的事件（fallback_used / case_emitted / module_finished）始终按模块顺序产出；
+        并发生成时先完成的模块会等待排在前面的模块
+        
+        Args:
+            content: 需求文档内容，或磁盘上文档的句柄（只读取选中模块的章节）
+            selected_modules: 选中的模块列表
+            selected_categories: 选中的建议选项列表
+            
+        Yields:
+            GenerationEvent
+        """
+        total = len(selected_modules)
         success_count = 0
         fail_count = 0
+        started_at = time.perf_counter()
         
-        # 创建进度条
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+        sections = self._get_module_sections(content, selected_modules)
+        workers = min(self.max_workers, max(1, total))
+        report = self.scheduler.plan(
+            selected_modules, [len(section) for section in sections], workers, self.module_priorities
+        )
+        self.last_schedule_report = report
         
-        total = len(selected_modules)
+        if workers == 1:
+            outcomes = self._run_sequential(report.entries, sections, selected_categories, total)
+        else:
+            outcomes = self._run_concurrent(report.entries, sections, selected_categories, total, workers)
         
-        for idx, module in enumerate(selected_modules):
-            # 更新进度
-            progress = (idx + 1) / total
-            progress_bar.progress(progress)
-            status_text.text(f"正在生成 {module.name} 的用例... ({idx + 1}/{total})")
+        for item in outcomes:
+            if isinstance(item, GenerationEvent):
+                yield item
+                continue
             
-            try:
-                # 将Module对象转换为字典格式
-                module_dict = {
-                    'name': module.name,
-                    'description': module.description,
-                    'type': module.type
-                }
-                
-                # 调用AI生成器生成用例，传递建议选项
-                cases = self.ai_generator.generate_test_cases(
-                    content,
-                    module_dict,
-                    categories=selected_categories
-                )
-                
-                if cases:
-                    all_cases.extend(cases)
-                    success_count += 1
-                else:
-                    # 如果AI返回空，使用模板生成
-                    template_cases = self.ai_generator._template_cases(module.name, selected_categories)
-                    all_cases.extend(template_cases)
-                    fail_count += 1
-                    st.warning(f"⚠️ {module.name} 生成失败，使用模板生成")
-                    
-            except Exception as e:
-                # 捕获异常，使用模板生成
+            entry, cases, used_fallback, message = item
+            # AI失败后使用模板用例的耗时接近0，不计入耗时历史，以免拉低估算
+            if not used_fallback:
+                self.scheduler.record(entry)
+            module, idx = entry.module, entry.index
+            
+            if used_fallback:
                 fail_count += 1
-                st.warning(f"⚠️ {module.name} 生成失败: {str(e)}，使用模板生成")
-                template_cases = self.ai_generator._template_cases(module.name, selected_categories)
-                all_cases.extend(template_cases)
+                yield GenerationEvent(
+                    kind=EVENT_FALLBACK_USED, index=idx, total=total, module=module,
+                    used_fallback=True, message=message
+                )
+            else:
+                success_count += 1
+            
+            for case in cases:
+                yield GenerationEvent(kind=EVENT_CASE_EMITTED, index=idx, total=total, module=module, case=case)
+            
+            yield GenerationEvent(
+                kind=EVENT_MODULE_FINISHED, index=idx, total=total, module=module,
+                cases=cases, used_fallback=used_fallback, message=message, elapsed=entry.actual_seconds
+            )
+        
+        report.actual_makespan = time.perf_counter() - started_at
+        print(f"用例生成调度: {report.summary()}")
         
         # 为建议选项生成独立模块的用例
         if selected_categories:
-            status_text.text(f"正在为建议选项生成用例...")
+            yield GenerationEvent(kind=EVENT_CATEGORIES_STARTED, index=total, total=total)
+            categories_started_at = time.perf_counter()
             category_cases = self._generate_category_modules(selected_categories)
-            all_cases.extend(category_cases)
+            yield GenerationEvent(
+                kind=EVENT_CATEGORIES_FINISHED, index=total, total=total, cases=category_cases,
+                elapsed=time.perf_counter() - categories_started_at
+            )
+        
+        yield GenerationEvent(
+            kind=EVENT_COMPLETED, index=total, total=total,
+            elapsed=time.perf_counter() - started_at,
+            success_count=success_count, fail_count=fail_count,
+            message=report.summary()
+        )
+    
+    def _run_sequential(self, entries: List[ScheduledModule], sections: List[str],
+                        categories: List[str], total: int):
+        """
+        按顺序逐个生成
         
-        # 完成进度
-        progress_bar.progress(1.0)
-        status_text.text(f"✅ 生成完成！成功: {success_count}，失败: {fail_count}")
+        Yields:
+            开始事件（GenerationEvent），或 (条目, 用例列表, 是否兜底, 说明) 元组
+        """
+        for entry in entries:
+            yield GenerationEvent(kind=EVENT_MODULE_STARTED, index=entry.index, total=total, module=entry.module)
+            yield (entry,) + self._timed_generate(entry, sections[entry.index], categories)
+    
+    def _run_concurrent(self, entries: List[ScheduledModule], sections: List[str],
+                        categories: List[str], total: int, workers: int):
+        """
+        在线程池中并发生成，按entries顺序（预计耗时最长优先）分派，按模块顺序产出结果
         
-        return all_cases
+        Yields:
+            开始事件（GenerationEvent），或 (条目, 用例列表, 是否兜底, 说明) 元组
+        """
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='case-gen')
+        try:
+            pending = {}
+            for entry in entries:
+                future = executor.submit(self._timed_generate, entry, sections[entry.index], categories)
+                pending[future] = entry
+                yield GenerationEvent(kind=EVENT_MODULE_STARTED, index=entry.index, total=total, module=entry.module)
+            
+            # 已完成但排在前面的模块尚未完成的结果
+            finished = {}
+            next_index = 0
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entry = pending.pop(future)
+                    finished[entry.index] = (entry,) + future.result()
+                
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+        finally:
+            # 调用方提前停止迭代时，取消尚未开始的模块
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _timed_generate(self, entry: ScheduledModule, section: str, categories: List[str]):
+        """
+        生成单个模块并记录实际耗时
+        
+        Returns:
+            (用例列表, 是否使用了模板兜底, 失败说明)
+        """
+        module_started_at = time.perf_counter()
+        result = self._generate_module_cases(section, entry.module, categories)
+        entry.actual_seconds = time.perf_counter() - module_started_at
+        return result
+    
+    def _generate_module_cases(self, section: str, module: Module, categories: List[str]):
+        """
+        为单个模块生成用例，失败或返回空时使用模板用例兜底
+        
+        不产生任何UI输出，可以在工作线程中调用
+        
+        Args:
+            section: 模块对应的章节文本（见_get_module_section）
+            module: 模块
+            categories: 选中的建议选项列表
+            
+        Returns:
+            (用例列表, 是否使用了模板兜底, 失败说明)
+        """
+        # 将Module对象转换为字典格式
+        module_dict = {
+            'name': module.name,
+            'description': module.description,
+            'type': module.type
+        }
+        
+        try:
+            # 调用AI生成器生成用例，传递建议选项
+            # 只传入该模块对应的章节，而不是整篇文档的开头
+            cases = self.ai_generator.generate_test_cases(
+                section,
+                module_dict,
+                categories=categories
+            )
+            if cases:
+                return cases, False, ''
+            message = f"{module.name} 生成失败，使用模板生成"
+        except Exception as e:
+            message = f"{module.name} 生成失败: {str(e)}，使用模板生成"
+        
+        return self.ai_generator._template_cases(module.name, categories), True, message
+    
+    def _get_module_sections(self, content: Union[str, DocumentHandle], modules: List[Module]) -> List[str]:
+        """
+        获取各模块对应的章节文本
+        
+        文档在磁盘上时按模块的字符偏移只读取对应章节；模块没有章节范围或偏移不匹配时才读取全文，
+        全文只读取一次，由这些模块共用
+        
+        Args:
+            content: 需求文档内容，或磁盘上文档的句柄
+            modules: 模块列表
+            
+        Returns:
+            与模块顺序一致的章节文本列表
+        """
+        if not isinstance(content, DocumentHandle):
+            return [self._get_module_section(content, module) for module in modules]
+        
+        store = DocumentStore()
+        full_text = None
+        sections = []
+        for module in modules:
+            if module.end > module.start:
+                section = store.read_section(content, module.start, module.end)
+                section_hash = hashlib.sha256(section.encode('utf-8')).hexdigest()[:16]
+                if not module.section_hash or section_hash == module.section_hash:
+                    sections.append(section)
+                    continue
+            if full_text is None:
+                full_text = store.read_text(content)
+            sections.append(full_text)
+        return sections
+    
+    def _get_module_section(self, content: str, module: Module) -> str:
+        """
+        获取模块对应的章节文本
+        
+        Args:
+            content: 需求文档内容
+            module: 模块（规则识别的模块带有章节偏移）
+            
+        Returns:
+            章节文本；模块没有章节范围或偏移与当前文档不匹配时返回整篇文档
+        """
+        if module.end <= module.start:
+            return content
+        
+        section = content[module.start:module.end]
+        if module.section_hash:
+            section_hash = hashlib.sha256(section.encode('utf-8')).hexdigest()[:16]
+            if section_hash != module.section_hash:
+                return content
+        
+        return section
     
     def _generate_category_modules(self, categories: List[str]) -> List[Dict]:
         """
@@ -112,337 +417,13 @@ class TestCaseCoordinator:
             categories: 建议选项列表
             
         Returns:
-            建议选项模块的用例列表
+            建议选项模块的用例列表（模板内容见 case_templates.json）
         """
         category_cases = []
         
-        # 定义每个建议选项的用例
-        category_templates = {
-            '全局页面': [
-                {
-                    '页面/模块': '全局页面',
-                    '检查点': '页面头部',
-                    '设计原则': '视觉一致性原则',
-                    '检查项': '检查页面头部Logo、导航菜单、用户信息等全局元素的样式和布局',
-                    '优先级': '高',
-                    '预期结果/设计标准': '头部高度64px，Logo尺寸120x32px，导航菜单字号14px，颜色#262626'
-                },
-                {
-                    '页面/模块': '全局页面',
-                    '检查点': '页面底部',
-                    '设计原则': '视觉一致性原则',
-                    '检查项': '检查页面底部版权信息、链接、联系方式等全局元素',
-                    '优先级': '中',
-                    '预期结果/设计标准': '底部高度48px，文字颜色#999999，字号12px，链接有hover效果'
-                },
-                {
-                    '页面/模块': '全局页面',
-                    '检查点': '侧边导航栏',
-                    '设计原则': '视觉一致性原则',
-                    '检查项': '检查侧边导航栏的菜单项、展开/收起状态、选中状态',
-                    '优先级': '高',
-                    '预期结果/设计标准': '菜单项高度40px，选中状态有背景色，展开/收起有动画效果'
-                },
-                {
-                    '页面/模块': '全局页面',
-                    '检查点': '面包屑导航',
-                    '设计原则': '布局与响应式原则',
-                    '检查项': '检查面包屑导航的层级显示、点击跳转功能',
-                    '优先级': '中',
-                    '预期结果/设计标准': '层级用"/"分隔，当前页不可点击，历史页可点击跳转'
-                },
-                {
-                    '页面/模块': '全局页面',
-                    '检查点': '全局提示组件',
-                    '设计原则': '交互与反馈原则',
-                    '检查项': '检查Toast、Message、Notification等全局提示组件的样式和行为',
-                    '优先级': '高',
-                    '预期结果/设计标准': 'Toast自动消失时间3秒，位置居中顶部，有淡入淡出动画'
-                },
-                {
-                    '页面/模块': '全局页面',
-                    '检查点': '全局加载状态',
-                    '设计原则': '交互与反馈原则',
-                    '检查项': '检查页面级Loading、骨架屏的显示效果',
-                    '优先级': '高',
-                    '预期结果/设计标准': 'Loading有旋转动画，骨架屏与实际内容布局一致'
-                },
-                {
-                    '页面/模块': '全局页面',
-                    '检查点': '响应式布局',
-                    '设计原则': '布局与响应式原则',
-                    '检查项': '检查在不同屏幕尺寸下全局组件的表现',
-                    '优先级': '中',
-                    '预期结果/设计标准': '移动端导航收起为汉堡菜单，平板和PC端正常显示'
-                }
-            ],
-            '场景流程': [
-                {
-                    '页面/模块': '场景流程',
-                    '检查点': '完整操作流程',
-                    '设计原则': '场景法',
-                    '检查项': '检查从进入页面到完成目标的完整用户操作路径',
-                    '优先级': '高',
-                    '预期结果/设计标准': '流程步骤清晰，每步有明确的操作指引和反馈，无断点'
-                },
-                {
-                    '页面/模块': '场景流程',
-                    '检查点': '多步骤表单',
-                    '设计原则': '场景法',
-                    '检查项': '检查多步骤表单的步骤指示器、上一步/下一步按钮、数据保存',
-                    '优先级': '高',
-                    '预期结果/设计标准': '步骤指示器显示当前步骤，已完成步骤可点击返回，数据自动保存'
-                },
-                {
-                    '页面/模块': '场景流程',
-                    '检查点': '向导式流程',
-                    '设计原则': '场景法',
-                    '检查项': '检查向导式流程的引导提示、进度展示、步骤跳转',
-                    '优先级': '中',
-                    '预期结果/设计标准': '每步有引导文案，进度条显示完成百分比，可跳过非必填步骤'
-                },
-                {
-                    '页面/模块': '场景流程',
-                    '检查点': '数据提交流程',
-                    '设计原则': '场景法',
-                    '检查项': '检查填写→预览→确认→提交→反馈的完整流程',
-                    '优先级': '高',
-                    '预期结果/设计标准': '预览页显示所有填写内容，确认后提交，提交成功有明确反馈'
-                },
-                {
-                    '页面/模块': '场景流程',
-                    '检查点': '审批流程',
-                    '设计原则': '场景法',
-                    '检查项': '检查提交→审核→通过/驳回→通知的审批流程',
-                    '优先级': '中',
-                    '预期结果/设计标准': '状态流转清晰，审批意见可填写，审批结果有通知'
-                },
-                {
-                    '页面/模块': '场景流程',
-                    '检查点': '搜索筛选流程',
-                    '设计原则': '场景法',
-                    '检查项': '检查输入条件→搜索→结果展示→详情查看的流程',
-                    '优先级': '中',
-                    '预期结果/设计标准': '搜索条件可保存，结果可排序筛选，详情可返回列表'
-                },
-                {
-                    '页面/模块': '场景流程',
-                    '检查点': '状态流转',
-                    '设计原则': '场景法',
-                    '检查项': '检查数据状态的流转过程（如草稿→待审核→已发布）',
-                    '优先级': '高',
-                    '预期结果/设计标准': '状态变化有明确的视觉标识，状态流转符合业务逻辑，不可逆状态有二次确认'
-                }
-            ],
-            '异常场景': [
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '必填项验证',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查表单必填项未填写时的提示',
-                    '优先级': '高',
-                    '预期结果/设计标准': '必填项未填提示"该字段不能为空"，提示位置在字段下方，红色文字'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '格式验证',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查邮箱、手机号、身份证等格式验证',
-                    '优先级': '高',
-                    '预期结果/设计标准': '格式错误提示具体要求，如"请输入正确的邮箱格式"'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '长度限制',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查输入内容超出长度限制时的处理',
-                    '优先级': '中',
-                    '预期结果/设计标准': '超出长度时无法继续输入，或显示"已超出X个字符"提示'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '特殊字符处理',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查输入特殊字符时的验证和提示',
-                    '优先级': '中',
-                    '预期结果/设计标准': '不允许的特殊字符提示"不能包含特殊字符"，允许的字符正常输入'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '网络超时',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查网络请求超时时的处理',
-                    '优先级': '高',
-                    '预期结果/设计标准': '超时后显示"网络请求超时，请重试"，提供重试按钮'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '网络断开',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查网络断开时的处理',
-                    '优先级': '高',
-                    '预期结果/设计标准': '显示"网络连接失败"提示，提供重新连接按钮'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '服务器错误',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查服务器返回500、502等错误时的处理',
-                    '优先级': '高',
-                    '预期结果/设计标准': '显示友好的错误页面，提示"服务器繁忙，请稍后再试"'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '权限不足',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查无权限访问时的处理',
-                    '优先级': '高',
-                    '预期结果/设计标准': '跳转到403页面，提示"您没有权限访问该页面"'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '登录过期',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查登录过期或Token失效时的处理',
-                    '优先级': '高',
-                    '预期结果/设计标准': '自动跳转到登录页，提示"登录已过期，请重新登录"'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '空数据状态',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查列表、表格等无数据时的显示',
-                    '优先级': '中',
-                    '预期结果/设计标准': '显示空状态图标和文案"暂无数据"，提供创建或刷新按钮'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '数据加载失败',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查数据加载失败时的处理',
-                    '优先级': '高',
-                    '预期结果/设计标准': '显示"数据加载失败"提示，提供重新加载按钮'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '并发操作冲突',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查多人同时编辑同一数据时的处理',
-                    '优先级': '中',
-                    '预期结果/设计标准': '提示"数据已被他人修改"，提供刷新或强制保存选项'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '重复提交',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查防止重复提交的机制',
-                    '优先级': '高',
-                    '预期结果/设计标准': '提交后按钮禁用，显示Loading，防止重复点击'
-                },
-                {
-                    '页面/模块': '异常场景',
-                    '检查点': '极限数据量',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查大数据量（如10000+条记录）时的表现',
-                    '优先级': '中',
-                    '预期结果/设计标准': '使用分页或虚拟滚动，页面不卡顿，加载时间<3秒'
-                }
-            ],
-            '上下游验证': [
-                {
-                    '页面/模块': '上下游验证',
-                    '检查点': '页面间参数传递',
-                    '设计原则': '场景法',
-                    '检查项': '检查从A页面跳转到B页面时参数是否正确传递',
-                    '优先级': '高',
-                    '预期结果/设计标准': '参数完整传递，B页面正确接收并使用参数'
-                },
-                {
-                    '页面/模块': '上下游验证',
-                    '检查点': '数据回显',
-                    '设计原则': '场景法',
-                    '检查项': '检查编辑页面是否正确回显原有数据',
-                    '优先级': '高',
-                    '预期结果/设计标准': '所有字段数据准确回显，包括下拉框、单选框、复选框的选中状态'
-                },
-                {
-                    '页面/模块': '上下游验证',
-                    '检查点': '数据同步',
-                    '设计原则': '场景法',
-                    '检查项': '检查在A页面操作后，B页面的数据是否同步更新',
-                    '优先级': '高',
-                    '预期结果/设计标准': '操作后相关页面数据实时更新，无需手动刷新'
-                },
-                {
-                    '页面/模块': '上下游验证',
-                    '检查点': '列表与详情一致性',
-                    '设计原则': '场景法',
-                    '检查项': '检查列表页和详情页显示的数据是否一致',
-                    '优先级': '高',
-                    '预期结果/设计标准': '列表页和详情页数据完全一致，包括状态、时间等字段'
-                },
-                {
-                    '页面/模块': '上下游验证',
-                    '检查点': '编辑前后一致性',
-                    '设计原则': '场景法',
-                    '检查项': '检查编辑保存后，数据是否按预期更新',
-                    '优先级': '高',
-                    '预期结果/设计标准': '编辑的字段正确更新，未编辑的字段保持不变'
-                },
-                {
-                    '页面/模块': '上下游验证',
-                    '检查点': '缓存处理',
-                    '设计原则': '场景法',
-                    '检查项': '检查数据缓存、缓存更新、缓存失效的处理',
-                    '优先级': '中',
-                    '预期结果/设计标准': '数据更新后缓存及时刷新，缓存失效时重新请求'
-                },
-                {
-                    '页面/模块': '上下游验证',
-                    '检查点': '消息通知',
-                    '设计原则': '交互与反馈原则',
-                    '检查项': '检查操作后的消息推送、通知展示',
-                    '优先级': '中',
-                    '预期结果/设计标准': '操作成功后有消息通知，通知内容准确，可点击查看详情'
-                },
-                {
-                    '页面/模块': '上下游验证',
-                    '检查点': '关联数据更新',
-                    '设计原则': '场景法',
-                    '检查项': '检查主数据变更后，关联数据是否正确更新',
-                    '优先级': '高',
-                    '预期结果/设计标准': '主数据变更后，所有关联数据同步更新，无遗漏'
-                },
-                {
-                    '页面/模块': '上下游验证',
-                    '检查点': '接口请求参数',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查前端发送的接口请求参数是否正确',
-                    '优先级': '中',
-                    '预期结果/设计标准': '请求参数完整、格式正确、必填参数不为空'
-                },
-                {
-                    '页面/模块': '上下游验证',
-                    '检查点': '接口响应处理',
-                    '设计原则': '异常与负向流程验证',
-                    '检查项': '检查前端对接口响应数据的处理',
-                    '优先级': '高',
-                    '预期结果/设计标准': '响应数据正确解析，错误码正确处理，异常情况有友好提示'
-                },
-                {
-                    '页面/模块': '上下游验证',
-                    '检查点': '跨页面影响',
-                    '设计原则': '场景法',
-                    '检查项': '检查在A页面操作后，对其他相关页面的影响',
-                    '优先级': '中',
-                    '预期结果/设计标准': '操作影响范围明确，相关页面数据正确更新，无副作用'
-                }
-            ]
-        }
-        
         for category in categories:
-            if category in category_templates:
-                category_cases.extend(category_templates[category])
+            templates = CASE_TEMPLATES.category_modules.get(category)
+            if templates:
+                category_cases.extend(render_cases(templates, category))
         
         return category_cases
-
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+检验结果导入
+读取离线填写的Excel（导出的多Sheet工作簿）或CSV（生成的用例文件、导出的检验结果），
+按 用例编号 批量更新检验状态，并汇总状态变化
+"""
+
+import csv
+import io
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+
+# 文件中的状态值 -> 检验状态（导出的Excel/CSV使用 是/否/待测试，检验结果CSV使用 通过/不通过/待检验）
+STATUS_ALIASES = {
+    '是': '通过',
+    '通过': '通过',
+    '否': '不通过',
+    '不通过': '不通过',
+    '待测试': '待检验',
+    '待检验': '待检验',
+}
+PENDING_STATUS = '待检验'
+
+# 状态列（按优先级查找）
+STATUS_COLUMNS = ['检验状态', '是否通过']
+ID_COLUMN = '用例编号'
+
+_MISSING_COLUMNS_MESSAGE = f"文件中没有找到 {ID_COLUMN} 和 {'/'.join(STATUS_COLUMNS)} 列"
+
+
+@dataclass
+class ImportResult:
+    """导入结果"""
+    updates: Dict[str, str] = field(default_factory=dict)        # 需要写入的状态（用例编号 -> 检验状态）
+    transitions: Counter = field(default_factory=Counter)        # 状态变化统计（(原状态, 新状态) -> 数量）
+    total_rows: int = 0                                          # 读取的用例行数
+    unchanged: int = 0                                           # 状态未变化的行数
+    skipped_pending: int = 0                                     # 待测试/空白、未覆盖现有状态的行数
+    unknown_ids: List[str] = field(default_factory=list)         # 当前用例中不存在的用例编号
+    invalid_rows: List[Tuple[str, str]] = field(default_factory=list)  # 无法识别的状态值（用例编号, 值）
+
+    def summary(self) -> str:
+        """生成一行摘要文本"""
+        parts = [f"读取 {self.total_rows} 行", f"更新 {len(self.updates)} 个", f"未变化 {self.unchanged} 个"]
+        if self.skipped_pending:
+            parts.append(f"跳过待测试 {self.skipped_pending} 个")
+        if self.unknown_ids:
+            parts.append(f"未知用例 {len(self.unknown_ids)} 个")
+        if self.invalid_rows:
+            parts.append(f"无法识别的状态 {len(self.invalid_rows)} 个")
+        return "，".join(parts)
+
+    def transition_rows(self) -> List[Dict]:
+        """
+        状态变化明细
+
+        Returns:
+            [{'原状态': ..., '新状态': ..., '数量': ...}]，按数量从多到少
+        """
+        return [
+            {'原状态': old, '新状态': new, '数量': count}
+            for (old, new), count in self.transitions.most_common()
+        ]
+
+
+def read_status_rows(file_obj: BinaryIO, filename: str) -> Iterator[Tuple[str, str]]:
+    """
+    逐行读取文件中的用例编号和状态值
+
+    Args:
+        file_obj: 文件对象（二进制）
+        filename: 文件名，按扩展名判断格式（.xlsx 或 .csv）
+
+    Yields:
+        (用例编号, 状态值)
+
+    Raises:
+        ValueError: 文件中没有同时包含 用例编号 和 检验状态/是否通过 列的表格
+    """
+    if filename.lower().endswith('.xlsx'):
+        yield from _read_xlsx_rows(file_obj)
+    else:
+        yield from _read_csv_rows(file_obj)
+
+
+def _find_columns(header) -> Optional[Tuple[int, int]]:
+    """在表头中查找用例编号列和状态列，找不到时返回None"""
+    names = [str(value).strip() if value is not None else '' for value in header]
+    if ID_COLUMN not in names:
+        return None
+    for status_column in STATUS_COLUMNS:
+        if status_column in names:
+            return names.index(ID_COLUMN), names.index(status_column)
+    return None
+
+
+def _read_xlsx_rows(file_obj: BinaryIO) -> Iterator[Tuple[str, str]]:
+    """流式读取工作簿中所有包含用例编号和状态列的Sheet（用例汇总等其他Sheet自动跳过）"""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_obj, read_only=True, data_only=True)
+    found_columns = False
+    try:
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(values_only=True)
+            columns = _find_columns(next(rows, ()))
+            if columns is None:
+                continue
+            found_columns = True
+            id_idx, status_idx = columns
+            for row in rows:
+                if len(row) <= max(id_idx, status_idx) or row[id_idx] is None:
+                    continue
+                status = row[status_idx]
+                yield str(row[id_idx]).strip(), '' if status is None else str(status).strip()
+    finally:
+        wb.close()
+
+    if not found_columns:
+        raise ValueError(_MISSING_COLUMNS_MESSAGE)
+
+
+def _read_csv_rows(file_obj: BinaryIO) -> Iterator[Tuple[str, str]]:
+    """读取CSV（UTF-8，兼容Excel另存的带BOM文件）"""
+    reader = csv.reader(io.TextIOWrapper(file_obj, encoding='utf-8-sig', newline=''))
+    columns = _find_columns(next(reader, []))
+    if columns is None:
+        raise ValueError(_MISSING_COLUMNS_MESSAGE)
+    id_idx, status_idx = columns
+    for row in reader:
+        if len(row) <= max(id_idx, status_idx) or not row[id_idx].strip():
+            continue
+        yield row[id_idx].strip(), row[status_idx].strip()
+
+
+def import_verification(file_obj: BinaryIO, filename: str, current_status: Dict[str, str],
+                        known_ids: Set[str], overwrite_pending: bool = False) -> ImportResult:
+    """
+    读取文件并计算需要更新的检验状态（不修改current_status）
+
+    Args:
+        file_obj: 文件对象（二进制）
+        filename: 文件名
+        current_status: 当前检验状态（用例编号 -> 状态），未记录的用例视为待检验
+        known_ids: 当前生成记录的全部用例编号
+        overwrite_pending: 文件中为待测试的用例是否也覆盖现有状态（默认只导入已填写的结果）
+
+    Returns:
+        ImportResult
+
+    Raises:
+        ValueError: 文件中没有同时包含 用例编号 和 检验状态/是否通过 列的表格
+    """
+    result = ImportResult()
+
+    for case_id, value in read_status_rows(file_obj, filename):
+        result.total_rows += 1
+
+        if case_id not in known_ids:
+            result.unknown_ids.append(case_id)
+            continue
+
+        new_status = STATUS_ALIASES.get(value)
+        if new_status is None:
+            if value:
+                result.invalid_rows.append((case_id, value))
+            else:
+                result.skipped_pending += 1
+            continue
+        if new_status == PENDING_STATUS and not overwrite_pending:
+            result.skipped_pending += 1
+            continue
+
+        # 同一用例出现多次时以最后一行为准
+        if new_status == current_status.get(case_id, PENDING_STATUS):
+            result.updates.pop(case_id, None)
+            result.unchanged += 1
+        else:
+            result.updates[case_id] = new_status
+
+    result.transitions = Counter(
+        (current_status.get(case_id, PENDING_STATUS), new_status) for case_id, new_status in result.updates.items()
+    )
+    return result